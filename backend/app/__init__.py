@@ -1,5 +1,6 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
@@ -8,6 +9,7 @@ load_dotenv()
 
 # --- Initialize Extensions ---
 db = SQLAlchemy()
+migrate = Migrate()
 
 # --- Application Factory ---
 def create_app():
@@ -21,10 +23,64 @@ def create_app():
     # AI Configuration
     app.config['GEMINI_API_KEY'] = os.getenv("GEMINI_API_KEY")
     # app.config['OPENAI_API_KEY'] = os.getenv("OPENAI_API_KEY")  # Preserved OpenAI config (commented)
+    app.config['AI_BACKEND'] = os.getenv("AI_BACKEND", "gemini")  # 'gemini' or 'stub' (offline tests/benchmarks)
+    app.config['AI_STUB_LATENCY'] = float(os.getenv("AI_STUB_LATENCY", 0))
+    app.config['AI_BREAKER_FAILURE_THRESHOLD'] = int(os.getenv("AI_BREAKER_FAILURE_THRESHOLD", 5))
+    app.config['AI_BREAKER_RECOVERY_TIMEOUT'] = float(os.getenv("AI_BREAKER_RECOVERY_TIMEOUT", 30))  # seconds
+
+    # Per-user AI call budgets by subscription plan (calls per minute, 0 = unlimited, and burst); over budget, users get the rule-based fallback
+    app.config['AI_RATE_LIMIT_FREE'] = float(os.getenv("AI_RATE_LIMIT_FREE", 2))
+    app.config['AI_RATE_BURST_FREE'] = float(os.getenv("AI_RATE_BURST_FREE", 5))
+    app.config['AI_RATE_LIMIT_PAID'] = float(os.getenv("AI_RATE_LIMIT_PAID", 20))
+    app.config['AI_RATE_BURST_PAID'] = float(os.getenv("AI_RATE_BURST_PAID", 20))
+
+    # Third-party SDKs are imported on first use; list providers here ('all', or e.g. "gemini,pil") to import them at startup
+    app.config['PROVIDER_WARMUP'] = os.getenv("PROVIDER_WARMUP", "")
+
+    # Background recommendation jobs
+    app.config['RECOMMENDATION_WORKERS'] = int(os.getenv("RECOMMENDATION_WORKERS", 2))  # 0 runs jobs inline
+    app.config['RECOMMENDATION_QUEUE_SIZE'] = int(os.getenv("RECOMMENDATION_QUEUE_SIZE", 100))
+    app.config['RECOMMENDATION_MAX_ATTEMPTS'] = int(os.getenv("RECOMMENDATION_MAX_ATTEMPTS", 3))
+    app.config['RECOMMENDATION_BATCH_SIZE'] = int(os.getenv("RECOMMENDATION_BATCH_SIZE", 5))  # logs per batched prompt (1 disables batching)
+    app.config['SYMPTOM_BATCH_MAX_ITEMS'] = int(os.getenv("SYMPTOM_BATCH_MAX_ITEMS", 100))  # logs per POST /api/symptoms/batch
+
+    # Recommendation cache (size 0 disables it)
+    app.config['RECOMMENDATION_CACHE_SIZE'] = int(os.getenv("RECOMMENDATION_CACHE_SIZE", 1024))
+    app.config['RECOMMENDATION_CACHE_TTL'] = int(os.getenv("RECOMMENDATION_CACHE_TTL", 3600))  # seconds
     
     # JWT Configuration
     app.config['JWT_SECRET'] = os.getenv("JWT_SECRET", "supersecret")
+    app.config['AUTH_CACHE_SIZE'] = int(os.getenv("AUTH_CACHE_SIZE", 10000))  # 0 disables the cache
+    app.config['AUTH_CACHE_TTL'] = int(os.getenv("AUTH_CACHE_TTL", 30))  # seconds; decoded tokens only, never past their exp
+    app.config['METRICS_TOKEN'] = os.getenv("METRICS_TOKEN")  # bearer token for /api/metrics (unset: endpoint disabled)
+
+    # Password hashing (runs in a bounded process pool per server process; 0 workers hashes inline)
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv("PASSWORD_HASH_WORKERS", 1))  # per web worker; Gunicorn runs WEB_CONCURRENCY of them
+    app.config['PASSWORD_HASH_MAX_QUEUE'] = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))  # seconds
+    
+    # HTTP caching: Cache-Control sent with ETag-validated reads, per endpoint ("private, no-cache" = always revalidate)
+    app.config['CACHE_CONTROL'] = {
+        'symptoms.get_user_symptom_logs': os.getenv("CACHE_CONTROL_SYMPTOM_LOGS", "private, no-cache"),
+        'symptoms.get_recent_symptom_logs': os.getenv("CACHE_CONTROL_RECENT_LOGS", "private, no-cache"),
+        'symptoms.get_symptom_analytics': os.getenv("CACHE_CONTROL_ANALYTICS", "private, no-cache"),
+        'symptoms.get_symptom_log_by_id': os.getenv("CACHE_CONTROL_SYMPTOM_LOG", "private, no-cache"),
+        'recommendations.get_recommendation': os.getenv("CACHE_CONTROL_RECOMMENDATION", "private, no-cache"),
+    }
+    
+    # Response encoding: JSON key sorting (costs CPU on large pages) and compression of bodies >= COMPRESS_MIN_SIZE bytes
+    app.config['RESPONSE_JSON_SORT_KEYS'] = os.getenv("RESPONSE_JSON_SORT_KEYS", "false").lower() == "true"
+    app.config['COMPRESS_ENABLED'] = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    app.config['COMPRESS_GZIP_LEVEL'] = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
     
+    # Media storage: 'cloudinary', or 'local' (files under MEDIA_LOCAL_ROOT, served at MEDIA_LOCAL_URL; tests, air-gapped deployments)
+    app.config['MEDIA_STORAGE'] = os.getenv("MEDIA_STORAGE", "cloudinary")
+    app.config['MEDIA_LOCAL_ROOT'] = os.getenv("MEDIA_LOCAL_ROOT")  # default: <instance folder>/media
+    app.config['MEDIA_LOCAL_URL'] = os.getenv("MEDIA_LOCAL_URL", "/media")
+
     # Cloudinary Configuration
     app.config['CLOUDINARY_CLOUD_NAME'] = os.getenv("CLOUDINARY_CLOUD_NAME")
     app.config['CLOUDINARY_API_KEY'] = os.getenv("CLOUDINARY_API_KEY")
@@ -33,18 +89,65 @@ def create_app():
     # File upload configuration
     app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
 
+    # Profile pictures are cropped and resized locally into square JPEG variants (in a bounded process pool; 0 workers processes inline)
+    app.config['PROFILE_PICTURE_SIZES'] = os.getenv("PROFILE_PICTURE_SIZES", "300,64")  # px; the largest is profile_picture_url
+    app.config['PROFILE_PICTURE_QUALITY'] = int(os.getenv("PROFILE_PICTURE_QUALITY", 85))  # JPEG quality, 1-95
+    app.config['IMAGE_PROCESSING_WORKERS'] = int(os.getenv("IMAGE_PROCESSING_WORKERS", 2))
+    app.config['IMAGE_PROCESSING_MAX_QUEUE'] = int(os.getenv("IMAGE_PROCESSING_MAX_QUEUE", 16))
+    app.config['IMAGE_PROCESSING_TIMEOUT'] = float(os.getenv("IMAGE_PROCESSING_TIMEOUT", 15))  # seconds
+
+    # Background profile picture uploads and deletions of replaced images (0 workers runs them inline)
+    app.config['MEDIA_WORKERS'] = int(os.getenv("MEDIA_WORKERS", 2))
+    app.config['MEDIA_QUEUE_SIZE'] = int(os.getenv("MEDIA_QUEUE_SIZE", 16))  # uploads waiting in memory
+    app.config['MEDIA_UPLOAD_TIMEOUT'] = int(os.getenv("MEDIA_UPLOAD_TIMEOUT", 300))  # seconds before an unfinished upload is failed
+    app.config['MEDIA_DELETE_MAX_ATTEMPTS'] = int(os.getenv("MEDIA_DELETE_MAX_ATTEMPTS", 10))
+    app.config['MEDIA_DELETE_BACKOFF'] = float(os.getenv("MEDIA_DELETE_BACKOFF", 30))  # seconds, doubled after each failure
+    app.config['MEDIA_DELETE_MAX_BACKOFF'] = float(os.getenv("MEDIA_DELETE_MAX_BACKOFF", 6 * 3600))  # seconds
+
     # --- Initialize extensions ---
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.json.sort_keys = app.config['RESPONSE_JSON_SORT_KEYS']
+    app.json.compact = True
+
     db.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
+
+    from app.utils.providers import providers
+    from app.utils.ai_backends import init_ai_backend
+    from app.utils.ai_rate_limit import ai_rate_limiter
+    from app.utils.recommendation_queue import recommendation_queue
+    from app.utils.recommendation_cache import recommendation_cache
+    from app.utils.auth_cache import auth_cache
+    from app.utils.password_hashing import password_hasher
+    from app.utils.image_processing import image_processor
+    from app.utils.media_storage import init_media_storage
+    from app.utils.media_pipeline import media_pipeline
+    from app.utils import data_version  # registers the data version write hook
+    from app.utils.compression import response_compressor
+    providers.init_app(app)
+    init_ai_backend(app)
+    ai_rate_limiter.init_app(app)
+    recommendation_queue.init_app(app)
+    recommendation_cache.init_app(app)
+    auth_cache.init_app(app)
+    password_hasher.init_app(app)
+    image_processor.init_app(app)
+    init_media_storage(app)
+    media_pipeline.init_app(app)
+    response_compressor.init_app(app)
 
     # --- Register blueprints ---
     from app.routes.auth import auth_bp
     from app.routes.symptoms import symptoms_bp
     from app.routes.recommendations import recommendations_bp
     from app.routes.profile import profile_bp
+    from app.routes.metrics import metrics_bp
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(symptoms_bp, url_prefix="/api/symptoms")
     app.register_blueprint(recommendations_bp, url_prefix="/api/recommendations")
     app.register_blueprint(profile_bp, url_prefix="/api/profile")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
     
     # --- Global Error Handlers ---
     @app.errorhandler(400)
@@ -81,9 +184,11 @@ def create_app():
         }
         return response, code
 
-    # --- Create database tables if not exist ---
-    with app.app_context():
-        from app.models import user, symptom_log, ai_recommendation
-        db.create_all()
+    # --- Register models (the schema is managed by migrations: `flask db upgrade`) ---
+    from app.models import user, symptom_log, ai_recommendation, recommendation_job, symptom_daily_rollup, symptom, profile_picture_upload, media_deletion, media_object, ai_rate_bucket
+
+    # --- Register CLI commands ---
+    from app.cli import register_cli
+    register_cli(app)
 
     return app
\ No newline at end of file
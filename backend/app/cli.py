@@ -0,0 +1,91 @@
+# app/cli.py
+import time
+import click
+from flask.cli import AppGroup
+from app import db
+
+rollups_cli = AppGroup('rollups', help='Maintain the symptom daily rollup table.')
+
+@rollups_cli.command('rebuild')
+@click.option('--user-id', type=int, help='Only rebuild this user (default: every user with logs).')
+@click.option('--batch-size', default=100, show_default=True, help='Users per transaction.')
+def rebuild_rollups_command(user_id, batch_size):
+    """Rebuild daily rollups from the raw symptom logs (backfill)."""
+    from app.models.symptom_log import SymptomLog
+    from app.utils.symptom_rollups import rebuild_rollups
+
+    if user_id:
+        user_ids = [user_id]
+    else:
+        user_ids = [uid for (uid,) in db.session.query(SymptomLog.user_id).distinct().order_by(SymptomLog.user_id)]
+
+    started = time.perf_counter()
+    rows = 0
+    for i, uid in enumerate(user_ids, start=1):
+        rows += rebuild_rollups(uid)
+        if i % batch_size == 0 or i == len(user_ids):
+            db.session.commit()
+            click.echo(f"Rebuilt {i}/{len(user_ids)} users, {rows} rollup rows")
+
+    click.echo(f"Done in {time.perf_counter() - started:.1f}s")
+
+recommendations_cli = AppGroup('recommendations', help='Maintain AI recommendations.')
+
+@recommendations_cli.command('backfill')
+@click.option('--workers', default=4, show_default=True, help='Concurrent model calls.')
+@click.option('--rate', default=1.0, show_default=True, help='Prompts per second across all workers.')
+@click.option('--burst', type=int, help='Prompts allowed back to back before --rate applies (default: --workers).')
+@click.option('--batch-size', type=int, help='Logs per prompt (default: RECOMMENDATION_BATCH_SIZE).')
+@click.option('--include-fallback', is_flag=True, help='Also regenerate rule-based fallback recommendations.')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), help='Checkpoint file (default: instance/recommendation_backfill.json).')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint and start from the first log.')
+@click.option('--user-id', type=int, help='Only backfill this user.')
+@click.option('--limit', type=int, help='Stop after this many logs (the checkpoint is kept for the next run).')
+@click.option('--chunk-size', default=500, show_default=True, help='Candidate logs read per query.')
+def backfill_recommendations_command(workers, rate, burst, batch_size, include_fallback, checkpoint,
+                                     restart, user_id, limit, chunk_size):
+    """Generate recommendations for logs that have none (resumable, rate limited)."""
+    from flask import current_app
+    from app.utils.recommendation_backfill import RecommendationBackfill
+
+    app = current_app._get_current_object()
+    backfill = RecommendationBackfill(
+        app,
+        workers=workers,
+        rate=rate,
+        burst=burst,
+        batch_size=batch_size or app.config.get('RECOMMENDATION_BATCH_SIZE', 5),
+        include_fallback=include_fallback,
+        checkpoint_path=checkpoint,
+        chunk_size=chunk_size,
+        echo=click.echo
+    )
+    backfill.run(user_id=user_id, limit=limit, restart=restart)
+
+media_cli = AppGroup('media', help='Maintain stored profile pictures.')
+
+@media_cli.command('reconcile')
+@click.option('--min-age', default=24.0, show_default=True, help='Only consider images older than this many hours.')
+@click.option('--delete', is_flag=True, help='Schedule the orphaned images for deletion (default: only report them).')
+def reconcile_media_command(min_age, delete):
+    """Find stored profile pictures that no user references (run periodically, e.g. daily)."""
+    from datetime import datetime, timedelta
+    from app.utils.media_pipeline import find_orphaned_pictures, media_pipeline
+
+    orphans = find_orphaned_pictures(older_than=datetime.utcnow() - timedelta(hours=min_age))
+    for public_id in orphans:
+        click.echo(public_id)
+    click.echo(f"{len(orphans)} orphaned images")
+
+    if delete and orphans:
+        media_pipeline.schedule_deletions(orphans)
+        db.session.commit()
+        deleted = media_pipeline.process_deletions(limit=len(orphans))
+        click.echo(f"Deleted {deleted}, the rest is retried in the background")
+
+
+def register_cli(app):
+    """Register the custom `flask` CLI command groups."""
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(media_cli)
\ No newline at end of file
@@ -0,0 +1,10 @@
+# app/models/ai_rate_bucket.py
+from app import db
+
+class AIRateBucket(db.Model):
+    """A user's AI call token bucket, shared by all processes (see app/utils/ai_rate_limit.py)."""
+    __tablename__ = 'ai_rate_buckets'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    plan = db.Column(db.String(20), nullable=False)  # plan whose budget the bucket holds
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # Unix time the tokens were last counted at
\ No newline at end of file
@@ -9,4 +9,37 @@ class AIRecommendation(db.Model):
     diet = db.Column(db.Text)
     exercise = db.Column(db.Text)
     wellness = db.Column(db.Text)
-    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    markdown = db.Column(db.Text)  # rendered from the sections on every insert/update
+    source = db.Column(db.String(16), nullable=False, default='ai', server_default='ai')  # 'ai', 'cache' or 'fallback'
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def render_markdown(diet, exercise, wellness):
+        """Assemble the three sections into the markdown document served to clients."""
+        return f"""### 🥗 Diet
+{diet}
+
+### 🏃 Exercise
+{exercise}
+
+### 🧘 Wellness
+{wellness}"""
+
+    def to_dict(self):
+        """Convert recommendation object to dictionary for JSON serialization"""
+        return {
+            'diet': self.diet,
+            'exercise': self.exercise,
+            'wellness': self.wellness,
+            'markdown': self.markdown,
+            'source': self.source,
+            'generated_at': self.generated_at.isoformat() if self.generated_at else None
+        }
+
+
+@db.event.listens_for(AIRecommendation, 'before_insert')
+@db.event.listens_for(AIRecommendation, 'before_update')
+def _render_markdown(mapper, connection, recommendation):
+    recommendation.markdown = AIRecommendation.render_markdown(
+        recommendation.diet, recommendation.exercise, recommendation.wellness
+    )
\ No newline at end of file
@@ -0,0 +1,14 @@
+# app/models/media_deletion.py
+from app import db
+from datetime import datetime
+
+class MediaDeletion(db.Model):
+    """A stored image waiting to be deleted, retried with exponential backoff (see app/utils/media_pipeline.py)."""
+    __tablename__ = 'media_deletions'
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(200), unique=True, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, failed (gave up after max attempts)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
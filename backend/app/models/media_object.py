@@ -0,0 +1,34 @@
+# app/models/media_object.py
+import re
+from app import db
+from datetime import datetime
+
+# Storage keys of content-addressed objects end in "<digest>_<nonce>_<size>" ("<digest>_<size>" for older ones)
+DIGEST_KEY = re.compile(r'([0-9a-f]{64})(?:_[0-9a-f]+)?_\d+$')
+
+class MediaObject(db.Model):
+    """
+    A set of stored image variants, addressed by the hash of the image they were rendered from.
+
+    `refcount` is the number of users whose profile picture it is, plus uploads
+    still being applied; the stored images are deleted once it drops to zero (see
+    app/utils/media_pipeline.py). Each object stores its images under keys of its
+    own (with a random nonce), so a picture stored again after its previous object
+    was deleted never shares keys with images still waiting for deletion.
+    """
+    __tablename__ = 'media_objects'
+    id = db.Column(db.Integer, primary_key=True)
+    digest = db.Column(db.String(64), unique=True, nullable=False)  # sha256 of the source image and rendering settings
+    variants = db.Column(db.JSON, nullable=False)  # {"<size>": {"url", "public_id"}}, public_id being the storage key
+    refcount = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def public_ids(self):
+        """Return the storage keys of the object's variants."""
+        return [variant['public_id'] for variant in self.variants.values()]
+
+    @staticmethod
+    def digest_of_key(key):
+        """Return the digest a storage key belongs to, or None for keys that are not content-addressed."""
+        match = DIGEST_KEY.search(key)
+        return match.group(1) if match else None
\ No newline at end of file
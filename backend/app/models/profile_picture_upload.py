@@ -0,0 +1,23 @@
+# app/models/profile_picture_upload.py
+from app import db
+from datetime import datetime
+
+class ProfilePictureUpload(db.Model):
+    """An accepted profile picture upload, processed in the background (see app/utils/media_pipeline.py)."""
+    __tablename__ = 'profile_picture_uploads'
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex, returned to the client
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), default='pending', nullable=False, index=True)  # pending, processing, completed, superseded, failed
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        """Convert upload object to dictionary for JSON serialization"""
+        return {
+            'upload_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
\ No newline at end of file
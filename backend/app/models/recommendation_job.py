@@ -0,0 +1,32 @@
+# app/models/recommendation_job.py
+from app import db
+from datetime import datetime
+
+class RecommendationJob(db.Model):
+    __tablename__ = 'recommendation_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    log_id = db.Column(db.Integer, db.ForeignKey('symptom_logs.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    batch_id = db.Column(db.String(32), nullable=True, index=True)  # shared by the jobs of one batch upload, run together
+    status = db.Column(db.String(20), default='queued', nullable=False, index=True)  # queued, running, completed, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    used_fallback = db.Column(db.Boolean, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        """Convert job object to dictionary for JSON serialization"""
+        return {
+            'job_id': self.id,
+            'log_id': self.log_id,
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'used_fallback': self.used_fallback,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
\ No newline at end of file
@@ -0,0 +1,26 @@
+# app/models/symptom.py
+from app import db
+
+class Symptom(db.Model):
+    """Dictionary of normalized (lowercased, trimmed) symptom names."""
+    __tablename__ = 'symptoms'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), unique=True, nullable=False)
+
+
+class SymptomLogSymptom(db.Model):
+    """
+    Link between a symptom log and each symptom it mentions.
+    user_id and date are copied from the log so per-user aggregations are index-only.
+    """
+    __tablename__ = 'symptom_log_symptoms'
+    __table_args__ = (
+        db.Index('ix_symptom_log_symptoms_user_id_date', 'user_id', 'date'),
+        db.Index('ix_symptom_log_symptoms_user_id_symptom_id_date', 'user_id', 'symptom_id', 'date'),
+    )
+    log_id = db.Column(db.Integer, db.ForeignKey('symptom_logs.id', ondelete='CASCADE'), primary_key=True)
+    symptom_id = db.Column(db.Integer, db.ForeignKey('symptoms.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    date = db.Column(db.Date, nullable=True)
+
+    symptom = db.relationship('Symptom')
\ No newline at end of file
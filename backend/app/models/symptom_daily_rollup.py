@@ -0,0 +1,18 @@
+# app/models/symptom_daily_rollup.py
+from app import db
+
+class SymptomDailyRollup(db.Model):
+    """Per-user, per-day aggregates of symptom logs, maintained on every log write."""
+    __tablename__ = 'symptom_daily_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='uq_symptom_daily_rollups_user_id_date'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    log_count = db.Column(db.Integer, default=0, nullable=False)
+    pain_sum = db.Column(db.Integer, default=0, nullable=False)
+    pain_count = db.Column(db.Integer, default=0, nullable=False)  # logs with a pain level
+    pain_max = db.Column(db.Integer, nullable=True)
+    mood_counts = db.Column(db.JSON, default=dict, nullable=False)  # {"happy": 2, ...}
+    condition_counts = db.Column(db.JSON, default=dict, nullable=False)  # {"PCOS": 1, ...}
\ No newline at end of file
@@ -4,6 +4,10 @@ from datetime import datetime
 
 class SymptomLog(db.Model):
     __tablename__ = 'symptom_logs'
+    __table_args__ = (
+        # Covers every per-user listing: filter on user_id, range/sort on date, tie-break on id
+        db.Index('ix_symptom_logs_user_id_date_id', 'user_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     date = db.Column(db.Date, default=datetime.utcnow)
@@ -18,9 +18,14 @@ class User(db.Model):
     # Profile picture fields
     profile_picture_url = db.Column(db.String(500), nullable=True)  # Cloudinary URL
     profile_picture_public_id = db.Column(db.String(200), nullable=True)  # Cloudinary public_id for deletion
+    profile_picture_variants = db.Column(db.JSON, nullable=True)  # {"<size>": {"url", "public_id"}}, see app/utils/image_processing.py
+    profile_picture_media_id = db.Column(db.Integer, db.ForeignKey('media_objects.id'), nullable=True, index=True)  # shared, reference-counted variants
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Bumped on every write to the user's symptom logs or recommendations (see app/utils/data_version.py)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     symptom_logs = db.relationship('SymptomLog', backref='user', lazy=True)
 
     def to_dict(self):
@@ -34,5 +39,15 @@ class User(db.Model):
             'has_endometriosis': self.has_endometriosis,
             'subscription_plan': self.subscription_plan,
             'profile_picture_url': self.profile_picture_url,
+            'profile_picture_variants': {
+                size: variant['url'] for size, variant in self.profile_picture_variants.items()
+            } if self.profile_picture_variants else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+    def profile_picture_public_ids(self):
+        """Cloudinary public_ids of the current profile picture and all its variants"""
+        public_ids = [variant['public_id'] for variant in (self.profile_picture_variants or {}).values()]
+        if self.profile_picture_public_id and self.profile_picture_public_id not in public_ids:
+            public_ids.append(self.profile_picture_public_id)
+        return public_ids
\ No newline at end of file
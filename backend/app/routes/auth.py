@@ -1,11 +1,12 @@
 # --- Routes: Authentication ---
 # app/routes/auth.py
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.security import generate_password_hash, check_password_hash
 import jwt as pyjwt
 from datetime import datetime, timedelta
 from app import db
 from app.models.user import User
+from app.utils.password_hashing import password_hasher, PoolBusyError
+from app.utils.process_pool import pool_busy_response
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -25,8 +26,11 @@ def register():
     if User.query.filter_by(email=data['email']).first():
         return jsonify({"error": "Email already registered"}), 409
 
-    # Create new user
-    hashed_password = generate_password_hash(data['password'])
+    # Create new user (hashing runs in the bounded password pool)
+    try:
+        hashed_password = password_hasher.hash(data['password'])
+    except PoolBusyError:
+        return pool_busy_response()
     user = User(
         email=data['email'], 
         password_hash=hashed_password,
@@ -61,7 +65,19 @@ def login():
         return jsonify({"error": "Email and password required"}), 400
 
     user = User.query.filter_by(email=data['email']).first()
-    if user and check_password_hash(user.password_hash, data['password']):
+    try:
+        valid = user is not None and password_hasher.verify(user.password_hash, data['password'])
+        if valid and password_hasher.needs_rehash(user.password_hash):
+            # Transparently upgrade hashes made with an older method or cost
+            user.password_hash = password_hasher.hash(data['password'])
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+    except PoolBusyError:
+        return pool_busy_response()
+
+    if valid:
         token = pyjwt.encode({
             'user_id': user.id,
             'exp': datetime.utcnow() + timedelta(hours=24)
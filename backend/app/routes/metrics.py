@@ -0,0 +1,67 @@
+# --- Routes: Monitoring Metrics ---
+# app/routes/metrics.py
+from flask import Blueprint, jsonify
+from app.utils.auth_decorator import metrics_token_required
+from app.utils.ai_backends import get_ai_backend, get_ai_circuit_breaker
+from app.utils.ai_rate_limit import ai_rate_limiter
+from app.utils.auth_cache import auth_cache
+from app.utils.compression import response_compressor
+from app.utils.image_processing import image_processor
+from app.utils.media_pipeline import media_pipeline
+from app.utils.media_storage import get_media_storage
+from app.utils.json_provider import FastJSONProvider
+from app.utils.password_hashing import password_hasher
+from app.utils.providers import providers
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.recommendation_queue import recommendation_queue
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/', methods=['GET'])
+@metrics_token_required
+def get_metrics():
+    """
+    Returns process-level counters for monitoring.
+
+    Internal: requires `Authorization: Bearer <METRICS_TOKEN>`, and answers 404 while
+    METRICS_TOKEN is not set.
+
+    Returns:
+        JSON with the following structure:
+            {
+                "ai_backend": {"backend", "calls", "clients_created", "client_reuses", ...},
+                "ai_circuit_breaker": {"state", "consecutive_failures", "retry_in_seconds",
+                                       "successes", "failures", "short_circuits", "times_opened", ...},
+                "ai_rate_limits": {"plans": {"free": {"per_minute", "burst", "users", "granted", "throttled"}, "paid": {...}}},
+                "recommendation_cache": {"size", "max_size", "ttl_seconds", "hits",
+                                         "misses", "evictions", "expirations", "hit_rate"},
+                "recommendation_queue": {"workers", "queue_size", "queue_size_by_plan": {"paid", "free", "other"}, "max_queue_size"},
+                "auth_cache": {"tokens": {...}},  # same counters as recommendation_cache
+                "password_hashing": {"method", "pool": {"max_workers", "max_queue", "rejected", "timed_out"},
+                                     "operations": {"hash": {"count", "avg_ms", "p95_ms", "max_ms"}, "verify": {...}}},
+                "image_processing": {"sizes", "quality", "pool": {...}, "count", "avg_ms", "p95_ms", "max_ms", "bytes_in", "bytes_out"},
+                "media_pipeline": {"workers", "queue_size", "max_queue_size", "uploads_completed",
+                                   "uploads_failed", "dedup_hits", "deleted", "delete_failures"},
+                "media_storage": {"backend", "puts", "deletes", "bytes_stored"},
+                "providers": {"<name>": {"loaded", "load_ms"}},
+                "response_encoding": {"json": "orjson" | "json",
+                                      "compression": {"min_size", "brotli_available", "responses", "bytes_in", "bytes_out", "ratio"}}
+            }
+    """
+    return jsonify({
+        "ai_backend": get_ai_backend().stats(),
+        "ai_circuit_breaker": get_ai_circuit_breaker().stats(),
+        "ai_rate_limits": ai_rate_limiter.stats(),
+        "recommendation_cache": recommendation_cache.stats(),
+        "recommendation_queue": recommendation_queue.stats(),
+        "auth_cache": auth_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "image_processing": image_processor.stats(),
+        "media_pipeline": media_pipeline.stats(),
+        "media_storage": get_media_storage().stats(),
+        "providers": providers.stats(),
+        "response_encoding": {
+            "json": FastJSONProvider.backend(),
+            "compression": response_compressor.stats()
+        }
+    }), 200
\ No newline at end of file
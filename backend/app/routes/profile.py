@@ -1,17 +1,15 @@
 # --- Routes: Profile ---
 # app/routes/profile.py (Optional separate file for better organization)
-from flask import Blueprint, request, jsonify, g
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, jsonify, g, url_for
 from app import db
 from app.models.user import User
 from app.utils.auth_decorator import jwt_required
+from app.utils.password_hashing import password_hasher, PoolBusyError
 from uuid import uuid4
-from app.utils.cloudinary_utils import (
-    upload_profile_picture, 
-    delete_profile_picture, 
-    validate_image_file, 
-    validate_base64_image
-)
+from app.models.profile_picture_upload import ProfilePictureUpload
+from app.utils.process_pool import pool_busy_response
+from app.utils.media_pipeline import media_pipeline
+from app.utils.image_validation import validate_image_file, validate_base64_image
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -113,14 +111,26 @@ def debug_upload():
 @profile_bp.route('/upload-picture', methods=['POST'])
 @jwt_required
 def upload_profile_picture_route():
-    """Upload or update user's profile picture"""
+    """
+    Upload or update user's profile picture
+
+    The image is validated in the request and then processed and stored in the
+    background (see app/utils/media_pipeline.py), so the request returns at once.
+
+    Returns:
+        JSON with the pending upload and the URL to poll for its status:
+            {"message", "upload": {"upload_id", "status", ...}, "status_url"}
+
+    Raises:
+        202: Upload accepted
+        400: If the image is missing or invalid
+        503: If the upload queue is full
+    """
     user = g.current_user
 
     try:
         # Handle file or base64 image input
         if request.files:
-            print(f"DEBUG: Handling file upload for user {user.id}")
-
             if 'profile_picture' not in request.files:
                 return jsonify({"error": "No file provided"}), 400
 
@@ -132,83 +142,87 @@ def upload_profile_picture_route():
             if not validation['valid']:
                 return jsonify({"error": validation['error']}), 400
 
-            print("DEBUG: Starting Cloudinary upload...")
-            upload_result = upload_profile_picture(file, user.id)  # Will use uuid in utils
+            image_data = file.stream.read()
 
         else:
-            print(f"DEBUG: Handling base64 upload for user {user.id}")
-            data = request.get_json()
+            # Not cached on the request, so the raw body and the base64 string can be
+            # freed as soon as the image is decoded
+            data = request.get_json(cache=False)
 
             if not data or 'image' not in data:
                 return jsonify({"error": "No image data provided"}), 400
 
-            validation = validate_base64_image(data['image'])
+            validation = validate_base64_image(data.pop('image'))
             if not validation['valid']:
                 return jsonify({"error": validation['error']}), 400
 
-            upload_result = upload_profile_picture(data['image'], user.id)  # Will use uuid in utils
+            image_data = validation.pop('image_data')
 
-        if 'error' in upload_result:
-            return jsonify({"error": upload_result['error']}), 500
-
-        # Save current public_id for later deletion
-        old_public_id = user.profile_picture_public_id
-
-        # Update user record
         try:
-            user.profile_picture_url = upload_result['url']
-            user.profile_picture_public_id = upload_result['public_id']
-            db.session.commit()
-            print(f"DEBUG: Database updated successfully")
-
-            # Delete old image only after successful commit
-            if old_public_id:
-                delete_profile_picture(old_public_id)
-
-            return jsonify({
-                "message": "Profile picture updated successfully",
-                "profile_picture_url": upload_result['url'],
-                "user": user.to_dict()
-            }), 200
-
-        except Exception as e:
-            print(f"DEBUG: Database update error: {str(e)}")
-            db.session.rollback()
-            delete_profile_picture(upload_result['public_id'])  # Cleanup new upload
-            return jsonify({"error": "Failed to update profile picture. Please try again."}), 500
+            upload = media_pipeline.submit_upload(user, image_data)
+        except PoolBusyError:
+            return pool_busy_response()
+
+        return jsonify({
+            "message": "Profile picture upload accepted, it is being processed",
+            "upload": upload.to_dict(),
+            "status_url": url_for('profile.get_profile_picture_upload', upload_id=upload.id)
+        }), 202
 
     except Exception as e:
         print(f"DEBUG: Unexpected error in upload_profile_picture_route: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 
+@profile_bp.route('/picture-uploads/<upload_id>', methods=['GET'])
+@jwt_required
+def get_profile_picture_upload(upload_id):
+    """
+    Returns the status of a profile picture upload.
+
+    Args:
+        upload_id (str): upload_id returned by POST /upload-picture
+
+    Returns:
+        JSON with the upload ({"upload_id", "status": "pending" | "processing" |
+        "completed" | "superseded" | "failed", "error", ...}) and the current user,
+        whose profile picture is the new one once the upload is completed
+
+    Raises:
+        404: If the upload is not found or access is denied
+    """
+    upload = ProfilePictureUpload.query.filter_by(id=upload_id, user_id=g.current_user.id).first()
+    if upload is None:
+        return jsonify({"error": "Profile picture upload not found or access denied"}), 404
+
+    return jsonify({
+        "upload": upload.to_dict(),
+        "user": g.current_user.to_dict()
+    }), 200
+
+
 @profile_bp.route('/delete-picture', methods=['DELETE'])
 @jwt_required
 def delete_profile_picture_route():
-    """Delete user's profile picture"""
+    """Delete user's profile picture (the stored images are deleted in the background)"""
     user = g.current_user
     
-    if not user.profile_picture_public_id:
+    if not user.profile_picture_public_ids():
         return jsonify({"error": "No profile picture to delete"}), 400
     
-    # Delete from Cloudinary
-    if delete_profile_picture(user.profile_picture_public_id):
-        try:
-            # Update user record
-            user.profile_picture_url = None
-            user.profile_picture_public_id = None
-            db.session.commit()
-            
-            return jsonify({
-                "message": "Profile picture deleted successfully",
-                "user": user.to_dict()
-            }), 200
-            
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({"error": "Failed to delete profile picture. Please try again."}), 500
-    else:
-        return jsonify({"error": "Failed to delete profile picture from cloud storage"}), 500
+    try:
+        # Update user record; the images are deleted once no user references them
+        media_pipeline.clear_profile_picture(user)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": "Failed to delete profile picture. Please try again."}), 500
+
+    media_pipeline.wake()
+    return jsonify({
+        "message": "Profile picture deleted successfully",
+        "user": user.to_dict()
+    }), 200
 
 
 @profile_bp.route('/change-password', methods=['PUT'])
@@ -222,16 +236,24 @@ def change_password():
     
     user = g.current_user
     
-    # Verify current password
-    if not check_password_hash(user.password_hash, data['current_password']):
-        return jsonify({"error": "Current password is incorrect"}), 400
+    # Verify current password (in the bounded password pool)
+    try:
+        if not password_hasher.verify(user.password_hash, data['current_password']):
+            return jsonify({"error": "Current password is incorrect"}), 400
+    except PoolBusyError:
+        return pool_busy_response()
     
     # Validate new password (you can add more validation rules here)
     if len(data['new_password']) < 6:
         return jsonify({"error": "New password must be at least 6 characters long"}), 400
     
     try:
-        user.password_hash = generate_password_hash(data['new_password'])
+        new_password_hash = password_hasher.hash(data['new_password'])
+    except PoolBusyError:
+        return pool_busy_response()
+    
+    try:
+        user.password_hash = new_password_hash
         db.session.commit()
         
         return jsonify({"message": "Password changed successfully"}), 200
@@ -1,13 +1,15 @@
 # --- Routes: AI Recommendation Generation ---
 # app/routes/recommendations.py
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, jsonify, g, url_for, Response, stream_with_context
 from app.utils.auth_decorator import jwt_required
 from app.models.symptom_log import SymptomLog
 from app.models.ai_recommendation import AIRecommendation
-from flask import g
-from app import db
-import openai
-from datetime import datetime
+from app.models.recommendation_job import RecommendationJob
+from app.utils.recommendation_queue import recommendation_queue
+from app.utils.ai_rate_limit import plan_priority
+from app.utils.streaming import sse_event
+from app.utils.http_cache import strong_etag, cache_headers, is_not_modified
+from app.routes.symptoms import stream_ai_recommendation_for_log, section_events
 
 recommendations_bp = Blueprint('recommendations', __name__)
 
@@ -16,7 +18,10 @@ recommendations_bp = Blueprint('recommendations', __name__)
 def get_recommendation(log_id):
     """
     Returns the AI recommendation for a given symptom log,
-    including a markdown-formatted version dynamically assembled.
+    including the markdown version rendered when it was saved.
+
+    Responses carry a strong ETag and Last-Modified (from generated_at); a request
+    with a matching If-None-Match or If-Modified-Since gets 304 Not Modified.
 
     Args:
         log_id (int): ID of the symptom log to retrieve the recommendation for
@@ -34,6 +39,7 @@ def get_recommendation(log_id):
             }
 
     Raises:
+        304: If the client's cached copy is current
         404: If the symptom log is not found or access is denied
     """
     log = SymptomLog.query.filter_by(id=log_id, user_id=g.current_user.id).first()
@@ -44,22 +50,171 @@ def get_recommendation(log_id):
     if not recommendation:
         return jsonify({"error": "No recommendation found for this symptom log"}), 404
 
-    # Generate markdown dynamically (clean and safe)
-    markdown = f"""### 🥗 Diet
-{recommendation.diet}
+    # Recommendations only change when regenerated, which sets a new generated_at
+    etag = strong_etag('recommendation', recommendation.id, recommendation.generated_at.isoformat())
+    headers = cache_headers(etag, recommendation.generated_at)
+    if is_not_modified(etag, recommendation.generated_at):
+        return '', 304, headers
+
+    return jsonify({"recommendation": recommendation.to_dict()}), 200, headers
+
+
+@recommendations_bp.route('/<int:log_id>/stream', methods=['GET'])
+@jwt_required
+def stream_recommendation(log_id):
+    """
+    Streams the AI recommendation for a symptom log as Server-Sent Events, so the
+    client can render each section while the model is still writing it.
+
+    If the log's background job has not started yet, it is claimed here and
+    generated in this request; if the client disconnects before the recommendation
+    is saved, the job goes back to the queue. A recommendation that already exists
+    is replayed.
+
+    Args:
+        log_id (int): ID of the symptom log
+
+    Returns:
+        text/event-stream with the following events:
+            event: section   data: {"section": "diet" | "exercise" | "wellness"}
+            event: delta     data: {"section": str, "text": str}
+            event: done      data: {"diet": str, "exercise": str, "wellness": str,
+                                    "markdown": str, "used_fallback": bool | null}
+        The "done" payload is the saved recommendation and supersedes the deltas.
+
+    Raises:
+        404: If the symptom log is not found or access is denied
+        409: If a background worker is already generating the recommendation
+    """
+    log = SymptomLog.query.filter_by(id=log_id, user_id=g.current_user.id).first()
+    if not log:
+        return jsonify({"error": "Symptom log not found or access denied"}), 404
+
+    if log.recommendation is not None:
+        replay = _replay_events(log.recommendation)
+    else:
+        replay = None
+        running = RecommendationJob.query.filter_by(log_id=log.id, status='running').first()
+        if running:
+            return jsonify({
+                "error": "Recommendation is already being generated",
+                "status_url": url_for('recommendations.get_recommendation_job', job_id=running.id)
+            }), 409
+    priority = plan_priority(g.current_user.subscription_plan)
+
+    def generate():
+        # Claimed once the response starts, so a stream closed before that leaves the job queued
+        job = None
+        if replay is not None:
+            events = replay
+        else:
+            job = recommendation_queue.claim_log_job(log.id)
+            events = stream_ai_recommendation_for_log(log)
+        completed = False
+        try:
+            for event, data in events:
+                if event == 'done' and job is not None:
+                    recommendation_queue.complete_job(job, used_fallback=data['used_fallback'])
+                    completed = True
+                yield sse_event(event, data)
+        finally:
+            if job is not None and not completed:
+                # Client gone (or the stream failed) before the recommendation was saved
+                events.close()
+                recommendation_queue.release_log_job(job, priority)
 
-### 🏃 Exercise
-{recommendation.exercise}
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop nginx-style proxies from buffering the stream
+    })
 
-### 🧘 Wellness
-{recommendation.wellness}"""
 
-    data = {
+def _replay_events(recommendation):
+    sections = {
         "diet": recommendation.diet,
         "exercise": recommendation.exercise,
-        "wellness": recommendation.wellness,
-        "markdown": markdown,
-        "generated_at": recommendation.generated_at.isoformat()
+        "wellness": recommendation.wellness
     }
+    yield from section_events(sections)
+    yield 'done', dict(sections, markdown=recommendation.markdown, used_fallback=None)
+
+
+@recommendations_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required
+def get_recommendation_job(job_id):
+    """
+    Returns the status of a background recommendation job.
+
+    Args:
+        job_id (int): ID of the job returned by POST /api/symptoms/
+
+    Returns:
+        JSON with the following structure:
+            {
+                "job": {
+                    "job_id": int,
+                    "log_id": int,
+                    "batch_id": str | null,
+                    "status": "queued" | "running" | "completed" | "failed",
+                    "attempts": int,
+                    "used_fallback": bool | null,
+                    "error": str | null,
+                    "created_at": str, "started_at": str | null, "finished_at": str | null
+                },
+                "recommendation_url": str | null
+            }
+
+    Raises:
+        404: If the job is not found or access is denied
+    """
+    job = RecommendationJob.query.filter_by(id=job_id, user_id=g.current_user.id).first()
+    if not job:
+        return jsonify({"error": "Recommendation job not found or access denied"}), 404
+
+    recommendation_url = None
+    if job.status == 'completed':
+        recommendation_url = url_for('recommendations.get_recommendation', log_id=job.log_id)
+
+    return jsonify({
+        "job": job.to_dict(),
+        "recommendation_url": recommendation_url
+    }), 200
+
+
+@recommendations_bp.route('/batches/<batch_id>', methods=['GET'])
+@jwt_required
+def get_recommendation_batch(batch_id):
+    """
+    Returns the status of all jobs of a batch upload (POST /api/symptoms/batch).
+
+    Args:
+        batch_id (str): batch_id returned by the batch upload
+
+    Returns:
+        JSON with the following structure:
+            {
+                "batch_id": str,
+                "counts": {"queued": int, "running": int, "completed": int, "failed": int},
+                "done": bool,
+                "jobs": [{...same as GET /jobs/<job_id>...}, ...]
+            }
+
+    Raises:
+        404: If the batch is not found or access is denied
+    """
+    jobs = RecommendationJob.query.filter_by(batch_id=batch_id, user_id=g.current_user.id).order_by(
+        RecommendationJob.id.asc()
+    ).all()
+    if not jobs:
+        return jsonify({"error": "Recommendation batch not found or access denied"}), 404
+
+    counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+    for job in jobs:
+        counts[job.status] = counts.get(job.status, 0) + 1
 
-    return jsonify({"recommendation": data}), 200
+    return jsonify({
+        "batch_id": batch_id,
+        "counts": counts,
+        "done": counts['queued'] == 0 and counts['running'] == 0,
+        "jobs": [job.to_dict() for job in jobs]
+    }), 200
\ No newline at end of file
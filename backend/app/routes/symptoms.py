@@ -1,23 +1,46 @@
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, request, jsonify, current_app, g, url_for
 from app.utils.auth_decorator import jwt_required
 from app import db
 from app.models.symptom_log import SymptomLog
 from app.models.ai_recommendation import AIRecommendation
 from app.models.user import User
+from app.models.symptom_daily_rollup import SymptomDailyRollup
+from app.models.symptom import Symptom, SymptomLogSymptom
+from app.utils.ai_backends import generate_ai_text, stream_ai_text
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.ai_rate_limit import ai_rate_limiter, AIRateLimitedError, plan_priority
+from app.utils.recommendation_queue import recommendation_queue
+from app.utils.recommendation_cache import recommendation_cache, recommendation_fingerprint
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.utils.symptom_rollups import add_logs_to_rollups
+from app.utils.symptom_index import index_log_symptoms, normalize_symptoms
+from app.utils.ai_response_parser import parse_ai_response, parse_batch_response
+from app.utils.streaming import SectionSplitter
+from app.utils.http_cache import strong_etag, cache_headers, is_not_modified
+from app.utils.data_version import get_data_version
+from app.utils.fields import parse_fields, project
 from datetime import datetime
 from datetime import timedelta
 from sqlalchemy import func
-import google.generativeai as genai
-import openai
-import re
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from uuid import uuid4
 
 symptoms_bp = Blueprint('symptoms', __name__)
 
-def generate_ai_recommendation_for_log(log):
+# Fields selectable with `fields=` on the symptom log read endpoints
+SYMPTOM_LOG_FIELDS = {
+    'id': None, 'date': None, 'condition': None, 'symptoms': None, 'pain_level': None,
+    'mood': None, 'cycle_day': None, 'notes': None,
+    'recommendation': ('diet', 'exercise', 'wellness', 'markdown', 'source', 'generated_at')
+}
+
+def generate_ai_recommendation_for_log(log, rate_limit=True):
     """
-    Generate a recommendation for a user's symptom log using the Gemini AI model.
-    Now includes user profile information for more personalized recommendations.
-    If the AI fails, fallback content will be used. The result includes a Markdown version.
+    Generate a recommendation for a user's symptom log using the configured AI backend
+    (Gemini in production). Now includes user profile information for more personalized recommendations.
+    If the AI fails, or the user is over their plan's AI rate limit, fallback content will be used.
+    The result includes a Markdown version.
     """
     try:
         # Get user profile information
@@ -26,48 +49,48 @@ def generate_ai_recommendation_for_log(log):
             current_app.logger.error(f"User not found for log ID: {log.id}")
             return generate_fallback_recommendation(log)
 
-        # Initialize Gemini
-        gemini_api_key = current_app.config.get('GEMINI_API_KEY')
-        genai.configure(api_key=gemini_api_key)
-
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        # Serve repeat inputs from the cache without calling the model
+        cache_key = recommendation_fingerprint(log, user)
+        parsed = recommendation_cache.get(cache_key)
 
-        # Build comprehensive prompt with profile information
-        prompt = build_personalized_prompt(log, user)
+        source = 'cache' if parsed is not None else 'ai'
+        if parsed is None:
+            if rate_limit:
+                ai_rate_limiter.check(user)
 
-        response = model.generate_content(prompt)
+            # Build comprehensive prompt with profile information
+            prompt = build_personalized_prompt(log, user)
 
-        if response and response.text:
-            content = response.text
-        else:
-            raise Exception("Empty response from Gemini")
+            # Generate with the shared AI backend (Gemini, or the stub offline) behind the circuit breaker
+            content = generate_ai_text(prompt)
 
+    except CircuitOpenError:
+        current_app.logger.warning(f"AI circuit open, using fallback recommendation for log ID: {log.id}")
+        return generate_fallback_recommendation(log, user)
+    except AIRateLimitedError as e:
+        current_app.logger.info(f"{e}, using fallback recommendation for log ID: {log.id}")
+        return generate_fallback_recommendation(log, user)
     except Exception as e:
         current_app.logger.error(f"Gemini API error: {e}")
         return generate_fallback_recommendation(log, user)
 
     try:
-        parsed = parse_ai_response_to_markdown(content)
+        if parsed is None:
+            parsed = parse_ai_response_to_markdown(content)
+            recommendation_cache.set(cache_key, parsed)
 
-        # Assemble markdown full output
-        markdown = f"""### 🥗 Diet
-{parsed['diet']}
-
-### 🏃 Exercise
-{parsed['exercise']}
-
-### 🧘 Wellness
-{parsed['wellness']}"""
-
-        # Save to DB
+        # Save to DB (the markdown is rendered once, on insert)
         recommendation = AIRecommendation(
             log_id=log.id,
             diet=parsed['diet'],
             exercise=parsed['exercise'],
             wellness=parsed['wellness'],
+            source=source,
             generated_at=datetime.utcnow()
         )
         db.session.add(recommendation)
+        db.session.flush()
+        markdown = recommendation.markdown  # read before commit expires it
         db.session.commit()
 
         return True, {
@@ -82,59 +105,275 @@ def generate_ai_recommendation_for_log(log):
         return generate_fallback_recommendation(log, user)
 
 
-def build_personalized_prompt(log, user):
+def generate_ai_recommendations_for_logs(logs, user, replace_fallback=False, rate_limit=True):
     """
-    Build a comprehensive prompt that includes both symptom log and user profile information.
+    Generate recommendations for several symptom logs of one user with a single model call.
+
+    Cache hits are saved directly; the remaining logs share one batch prompt
+    (build_batch_prompt) whose answer is split per log. A log the model did not
+    answer gets the full rule-based fallback, and an answered log only gets fallback
+    text for the sections it is missing. If the call fails, every log falls back.
+    The batch call counts once against the user's AI rate limit; over the limit,
+    every log that missed the cache falls back. All recommendations are saved in one commit.
+
+    Args:
+        logs: SymptomLog instances of `user`
+        user: User instance
+        replace_fallback: Also accept logs whose recommendation is a fallback; it is
+            overwritten only if a better (model or cache) recommendation was produced
+        rate_limit: Apply the per-user AI rate limit (callers with their own
+            throttling, such as the backfill command, turn it off)
+
+    Returns:
+        dict: Log ID -> source of the recommendation produced ('ai', 'cache' or 'fallback')
     """
-    # Base symptom information
-    prompt = f"""You are a medical assistant specializing in women's health, particularly PCOS and endometriosis. 
+    if len(logs) == 1 and not replace_fallback:
+        success, _ = generate_ai_recommendation_for_log(logs[0], rate_limit=rate_limit)
+        return {logs[0].id: 'ai' if success else 'fallback'}
 
-SYMPTOM LOG INFORMATION:
-- Condition: {log.condition}
+    sections = {}
+    sources = {}
+    pending = []
+    for log in logs:
+        cached = recommendation_cache.get(recommendation_fingerprint(log, user))
+        if cached is not None:
+            sections[log.id], sources[log.id] = cached, 'cache'
+        else:
+            pending.append(log)
+
+    answers = [None] * len(pending)
+    if pending:
+        try:
+            if rate_limit:
+                ai_rate_limiter.check(user)
+            content = generate_ai_text(build_batch_prompt(pending, user))
+            answers = parse_batch_response(content, len(pending))
+        except CircuitOpenError:
+            current_app.logger.warning(f"AI circuit open, using fallback recommendations for {len(pending)} logs")
+        except AIRateLimitedError as e:
+            current_app.logger.info(f"{e}, using fallback recommendations for {len(pending)} logs")
+        except Exception as e:
+            current_app.logger.error(f"Gemini batch error: {e}")
+
+    for log, answer in zip(pending, answers):
+        if answer is None:
+            sections[log.id], sources[log.id] = fallback_sections(log, user), 'fallback'
+            continue
+        parsed, missing = answer
+        if missing:
+            fallback = fallback_sections(log, user)
+            parsed = dict(parsed, **{section: fallback[section] for section in missing})
+        else:
+            recommendation_cache.set(recommendation_fingerprint(log, user), parsed)
+        sections[log.id], sources[log.id] = parsed, 'fallback' if missing else 'ai'
+
+    recommendations = []
+    for log in logs:
+        existing = log.recommendation if replace_fallback else None
+        if existing is not None:
+            if sources[log.id] != 'fallback':
+                existing.diet = sections[log.id]['diet']
+                existing.exercise = sections[log.id]['exercise']
+                existing.wellness = sections[log.id]['wellness']
+                existing.source = sources[log.id]
+                existing.generated_at = datetime.utcnow()
+            continue
+        recommendations.append(AIRecommendation(
+            log_id=log.id,
+            diet=sections[log.id]['diet'],
+            exercise=sections[log.id]['exercise'],
+            wellness=sections[log.id]['wellness'],
+            source=sources[log.id],
+            generated_at=datetime.utcnow()
+        ))
+    try:
+        db.session.add_all(recommendations)
+        db.session.commit()
+    except IntegrityError:
+        # Another writer (e.g. the streaming endpoint) saved some first; keep theirs, save the rest one by one
+        db.session.rollback()
+        for recommendation in recommendations:
+            try:
+                db.session.add(recommendation)
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+
+    return sources
+
+
+def stream_ai_recommendation_for_log(log):
+    """
+    Streaming variant of generate_ai_recommendation_for_log.
+
+    Yields (event, data) pairs while the model streams its answer:
+        ('section', {"section"})          a Diet/Exercise/Wellness header was recognised
+        ('delta', {"section", "text"})    raw text for that section
+    and finally one ('done', {"diet", "exercise", "wellness", "markdown", "used_fallback"})
+    once the complete response has been parsed and the AIRecommendation saved. The
+    "done" payload is authoritative: if the model fails part-way, the fallback
+    recommendation is saved and sent there. Cache hits and fallbacks (also used when
+    the user is over their AI rate limit) send their sections in one go.
+    """
+    user = db.session.get(User, log.user_id)
+    parsed = None
+    try:
+        if not user:
+            raise Exception(f"User not found for log ID: {log.id}")
+
+        cache_key = recommendation_fingerprint(log, user)
+        parsed = recommendation_cache.get(cache_key)
+        source = 'cache' if parsed is not None else 'ai'
+        if parsed is not None:
+            yield from section_events(parsed)
+        else:
+            ai_rate_limiter.check(user)
+
+            splitter = SectionSplitter()
+            chunks = []
+            for chunk in stream_ai_text(build_personalized_prompt(log, user)):
+                chunks.append(chunk)
+                yield from _splitter_events(splitter.feed(chunk))
+            yield from _splitter_events(splitter.close())
+
+            parsed = parse_ai_response_to_markdown(''.join(chunks))
+            recommendation_cache.set(cache_key, parsed)
+
+    except CircuitOpenError:
+        current_app.logger.warning(f"AI circuit open, using fallback recommendation for log ID: {log.id}")
+    except AIRateLimitedError as e:
+        current_app.logger.info(f"{e}, using fallback recommendation for log ID: {log.id}")
+    except Exception as e:
+        current_app.logger.error(f"Gemini streaming error: {e}")
+        parsed = None
+
+    success = parsed is not None
+    if success:
+        try:
+            recommendation = AIRecommendation(
+                log_id=log.id,
+                diet=parsed['diet'],
+                exercise=parsed['exercise'],
+                wellness=parsed['wellness'],
+                source=source,
+                generated_at=datetime.utcnow()
+            )
+            db.session.add(recommendation)
+            db.session.flush()
+            parsed = dict(parsed, markdown=recommendation.markdown)
+            db.session.commit()
+        except IntegrityError:
+            # A background job saved one first; keep it so every reader sees the same recommendation
+            db.session.rollback()
+            existing = AIRecommendation.query.filter_by(log_id=log.id).first()
+            parsed = {"diet": existing.diet, "exercise": existing.exercise,
+                      "wellness": existing.wellness, "markdown": existing.markdown}
+    else:
+        _, parsed = generate_fallback_recommendation(log, user)
+        yield from section_events(parsed)
+
+    yield 'done', {
+        "diet": parsed['diet'],
+        "exercise": parsed['exercise'],
+        "wellness": parsed['wellness'],
+        "markdown": parsed.get('markdown') or AIRecommendation.render_markdown(
+            parsed['diet'], parsed['exercise'], parsed['wellness']
+        ),
+        "used_fallback": not success
+    }
+
+
+def _splitter_events(events):
+    for event in events:
+        if event[0] == 'section':
+            yield 'section', {"section": event[1]}
+        else:
+            yield 'delta', {"section": event[1], "text": event[2]}
+
+
+def section_events(parsed):
+    """Section and delta events for a recommendation that is available all at once."""
+    for section in ('diet', 'exercise', 'wellness'):
+        yield 'section', {"section": section}
+        yield 'delta', {"section": section, "text": parsed[section]}
+
+
+PROMPT_ROLE = "You are a medical assistant specializing in women's health, particularly PCOS and endometriosis. "
+
+PROMPT_SECTIONS = """## Diet
+[Provide specific dietary recommendations tailored to the user's conditions, age, and current symptoms - use bullet points]
+
+## Exercise  
+[Provide specific exercise recommendations considering pain level, age, conditions, and current symptoms - use bullet points]
+
+## Wellness Tips
+[Provide specific wellness recommendations based on mood, conditions, age, and overall health profile - use bullet points]"""
+
+
+def describe_symptom_log(log):
+    """Symptom log lines of the prompt."""
+    return f"""- Condition: {log.condition}
 - Symptoms: {log.symptoms}
 - Pain level: {log.pain_level}/10
 - Mood: {log.mood}
 - Cycle day: {log.cycle_day}
 - Additional notes: {log.notes or 'None'}
-
-USER PROFILE INFORMATION:
 """
 
+
+def describe_user_profile(user):
+    """User profile lines of the prompt, with the considerations each attribute implies."""
+    profile = ""
+
     # Add age-specific considerations
     if user.age:
-        prompt += f"- Age: {user.age} years\n"
+        profile += f"- Age: {user.age} years\n"
         if user.age < 20:
-            prompt += "  → Focus on gentle, age-appropriate recommendations for teenage health\n"
+            profile += "  → Focus on gentle, age-appropriate recommendations for teenage health\n"
         elif user.age >= 40:
-            prompt += "  → Consider perimenopause/menopause factors and age-related health needs\n"
+            profile += "  → Consider perimenopause/menopause factors and age-related health needs\n"
     else:
-        prompt += "- Age: Not specified\n"
+        profile += "- Age: Not specified\n"
 
     # Add PCOS-specific information
     if user.has_pcos is True:
-        prompt += "- CONFIRMED PCOS diagnosis\n"
-        prompt += "  → Prioritize insulin resistance management, anti-inflammatory approaches\n"
+        profile += "- CONFIRMED PCOS diagnosis\n"
+        profile += "  → Prioritize insulin resistance management, anti-inflammatory approaches\n"
     elif user.has_pcos is False:
-        prompt += "- No PCOS diagnosis\n"
+        profile += "- No PCOS diagnosis\n"
     else:
-        prompt += "- PCOS status: Unknown/Not specified\n"
+        profile += "- PCOS status: Unknown/Not specified\n"
 
     # Add Endometriosis-specific information
     if user.has_endometriosis is True:
-        prompt += "- CONFIRMED Endometriosis diagnosis\n"
-        prompt += "  → Focus on anti-inflammatory diet, pain management, gentle exercise\n"
+        profile += "- CONFIRMED Endometriosis diagnosis\n"
+        profile += "  → Focus on anti-inflammatory diet, pain management, gentle exercise\n"
     elif user.has_endometriosis is False:
-        prompt += "- No Endometriosis diagnosis\n"
+        profile += "- No Endometriosis diagnosis\n"
     else:
-        prompt += "- Endometriosis status: Unknown/Not specified\n"
+        profile += "- Endometriosis status: Unknown/Not specified\n"
 
     # Add subscription-based personalization
     if user.subscription_plan == 'paid':
-        prompt += "- Subscription: Premium user\n"
-        prompt += "  → Provide detailed, comprehensive recommendations with advanced tips\n"
+        profile += "- Subscription: Premium user\n"
+        profile += "  → Provide detailed, comprehensive recommendations with advanced tips\n"
     else:
-        prompt += "- Subscription: Free user\n"
-        prompt += "  → Provide helpful but concise recommendations\n"
+        profile += "- Subscription: Free user\n"
+        profile += "  → Provide helpful but concise recommendations\n"
+
+    return profile
+
+
+def build_personalized_prompt(log, user):
+    """
+    Build a comprehensive prompt that includes both symptom log and user profile information.
+    """
+    prompt = f"""{PROMPT_ROLE}
+
+SYMPTOM LOG INFORMATION:
+{describe_symptom_log(log)}
+USER PROFILE INFORMATION:
+{describe_user_profile(user)}"""
 
     # Add the main instruction
     prompt += f"""
@@ -148,168 +387,51 @@ PERSONALIZATION REQUIREMENTS:
 
 Based on this comprehensive information, provide personalized recommendations in three categories with clear markdown formatting:
 
-## Diet
-[Provide specific dietary recommendations tailored to the user's conditions, age, and current symptoms - use bullet points]
-
-## Exercise  
-[Provide specific exercise recommendations considering pain level, age, conditions, and current symptoms - use bullet points]
-
-## Wellness Tips
-[Provide specific wellness recommendations based on mood, conditions, age, and overall health profile - use bullet points]
+{PROMPT_SECTIONS}
 
 Please format your response using proper markdown with headers (##) and bullet points (-) for each recommendation. Make the advice specific and actionable based on the user's individual profile and current symptoms."""
 
     return prompt
 
 
-def parse_ai_response_to_markdown(content):
-    """Parse the AI response and format it as clean markdown."""
-    parsed = {"diet": "", "exercise": "", "wellness": ""}
-    
-    # Clean up the content
-    content = content.strip()
-    
-    # Split content by markdown headers
-    sections = re.split(r'##\s*(Diet|Exercise|Wellness\s*Tips?)', content, flags=re.IGNORECASE)
-    
-    current_section = None
-    for i, section in enumerate(sections):
-        section = section.strip()
-        if not section:
-            continue
-            
-        # Check if this is a header
-        if re.match(r'^(diet|exercise|wellness\s*tips?)$', section, re.IGNORECASE):
-            current_section = section.lower().replace(' tips', '').replace('tips', '').strip()
-            if current_section == 'wellness':
-                current_section = 'wellness'
-            continue
-        
-        # This is content for the current section
-        if current_section and section:
-            formatted_content = format_section_content(section)
-            parsed[current_section] = formatted_content
-    
-    # Fallback parsing if markdown headers aren't found
-    if not any(parsed.values()):
-        parsed = fallback_parse_ai_response(content)
-    
-    # Ensure all sections have content and are properly formatted
-    for key in parsed:
-        if not parsed[key]:
-            parsed[key] = get_default_recommendation_markdown(key)
-        else:
-            # Ensure content is properly formatted as markdown
-            parsed[key] = ensure_markdown_formatting(parsed[key])
-    
-    return parsed
+def build_batch_prompt(logs, user):
+    """
+    Build one prompt asking for recommendations for several symptom logs of the same user.
 
+    The role, profile and instructions are written once; each log gets a numbered
+    block, and the model is asked to answer each under a "=== LOG <n> ===" marker
+    (see parse_batch_response).
+    """
+    prompt = f"""{PROMPT_ROLE}
 
-def format_section_content(content):
-    """Format section content as clean markdown."""
-    lines = content.split('\n')
-    formatted_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Convert numbered lists to bullet points
-        line = re.sub(r'^\d+\.\s*', '- ', line)
-        
-        # Ensure bullet points are properly formatted
-        if not line.startswith('-') and not line.startswith('*') and line:
-            line = f"- {line}"
-        
-        formatted_lines.append(line)
-    
-    return '\n'.join(formatted_lines)
+USER PROFILE INFORMATION:
+{describe_user_profile(user)}
+PERSONALIZATION REQUIREMENTS:
+- Tailor all recommendations based on the user's age, medical conditions, and symptoms
+- If PCOS is confirmed, emphasize insulin sensitivity, low-glycemic foods, and hormone balance
+- If Endometriosis is confirmed, prioritize anti-inflammatory approaches and pain management
+- Consider each log's pain level when suggesting exercise intensity
+- Account for each log's reported mood in wellness recommendations
+- If a cycle day is provided, consider the menstrual cycle phase in recommendations
 
+SYMPTOM LOGS ({len(logs)}):
+"""
+    for number, log in enumerate(logs, start=1):
+        prompt += f"\nLOG {number}:\n{describe_symptom_log(log)}"
 
-def fallback_parse_ai_response(content):
-    """Fallback parsing method if markdown headers aren't detected."""
-    parsed = {"diet": "", "exercise": "", "wellness": ""}
-    
-    lines = content.split('\n')
-    current_section = None
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        line_lower = line.lower()
-        
-        # Identify sections
-        if any(keyword in line_lower for keyword in ['diet', 'dietary', 'nutrition']):
-            if any(starter in line_lower for starter in ['1.', '##', 'diet:']):
-                current_section = 'diet'
-                continue
-        elif any(keyword in line_lower for keyword in ['exercise', 'physical', 'activity']):
-            if any(starter in line_lower for starter in ['2.', '##', 'exercise:']):
-                current_section = 'exercise'
-                continue
-        elif any(keyword in line_lower for keyword in ['wellness', 'well-being', 'wellbeing']):
-            if any(starter in line_lower for starter in ['3.', '##', 'wellness:']):
-                current_section = 'wellness'
-                continue
-        
-        # Add content to current section
-        if current_section and line:
-            formatted_line = line
-            if not formatted_line.startswith('-') and not formatted_line.startswith('*'):
-                formatted_line = f"- {formatted_line}"
-            
-            if parsed[current_section]:
-                parsed[current_section] += f"\n{formatted_line}"
-            else:
-                parsed[current_section] = formatted_line
-    
-    return parsed
-
-
-def ensure_markdown_formatting(content):
-    """Ensure content is properly formatted as markdown."""
-    if not content:
-        return content
-    
-    lines = content.split('\n')
-    formatted_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Ensure bullet points
-        if not line.startswith('-') and not line.startswith('*') and not line.startswith('#'):
-            line = f"- {line}"
-        
-        formatted_lines.append(line)
-    
-    return '\n'.join(formatted_lines)
+    prompt += f"""
+Based on this information, provide separate personalized recommendations for each of the {len(logs)} logs above, in order. Start each answer with a line containing only "=== LOG <number> ===", followed by three categories with clear markdown formatting:
 
+{PROMPT_SECTIONS}
+
+Please format your response using proper markdown with headers (##) and bullet points (-) for each recommendation. Answer every log, even if two logs are similar, and make the advice specific and actionable for that log."""
+
+    return prompt
 
-def get_default_recommendation_markdown(category):
-    """Provide default recommendations in markdown format based on category."""
-    defaults = {
-        'diet': """- Focus on anti-inflammatory foods like leafy greens, fatty fish, and nuts
-- Limit processed foods and added sugars
-- Include complex carbohydrates and lean proteins
-- Stay hydrated with plenty of water""",
-        
-        'exercise': """- Engage in gentle activities like walking, yoga, or swimming
-- Aim for 20-30 minutes of daily movement
-- Listen to your body and adjust intensity as needed
-- Include both cardio and strength training when possible""",
-        
-        'wellness': """- Maintain a regular sleep schedule (7-8 hours nightly)
-- Practice stress management techniques like meditation
-- Consider mindfulness and relaxation exercises
-- Keep a symptom diary to track patterns"""
-    }
-    return defaults.get(category, '- Consult with your healthcare provider for personalized advice')
+
+def parse_ai_response_to_markdown(content):
+    """Parse the AI response and format it as clean markdown (see app/utils/ai_response_parser.py)."""
+    return parse_ai_response(content)
 
 
 def generate_fallback_recommendation(log, user=None):
@@ -318,20 +440,7 @@ def generate_fallback_recommendation(log, user=None):
     if not user:
         user = User.query.get(log.user_id)
     
-    condition_lower = log.condition.lower() if log.condition else ""
-    
-    # Determine primary condition based on profile and reported condition
-    has_pcos = user.has_pcos if user else False
-    has_endo = user.has_endometriosis if user else False
-    user_age = user.age if user else None
-    
-    # Customize recommendations based on confirmed conditions from profile
-    if has_pcos or 'pcos' in condition_lower:
-        mock = generate_pcos_recommendations(user_age, log.pain_level)
-    elif has_endo or 'endometriosis' in condition_lower:
-        mock = generate_endometriosis_recommendations(user_age, log.pain_level)
-    else:
-        mock = generate_general_recommendations(user_age, log.pain_level)
+    mock = fallback_sections(log, user)
 
     # Save fallback recommendation to database
     try:
@@ -340,6 +449,7 @@ def generate_fallback_recommendation(log, user=None):
             diet=mock['diet'],
             exercise=mock['exercise'],
             wellness=mock['wellness'],
+            source='fallback',
             generated_at=datetime.utcnow()
         )
         db.session.add(recommendation)
@@ -350,6 +460,26 @@ def generate_fallback_recommendation(log, user=None):
     return False, mock
 
 
+def fallback_sections(log, user):
+    """Condition-specific rule-based {"diet", "exercise", "wellness"} sections for a log (nothing is saved)."""
+    condition_lower = log.condition.lower() if log.condition else ""
+    
+    # Determine primary condition based on profile and reported condition
+    has_pcos = user.has_pcos if user else False
+    has_endo = user.has_endometriosis if user else False
+    user_age = user.age if user else None
+    
+    # Customize recommendations based on confirmed conditions from profile
+    if has_pcos or 'pcos' in condition_lower:
+        mock = generate_pcos_recommendations(user_age, log.pain_level)
+    elif has_endo or 'endometriosis' in condition_lower:
+        mock = generate_endometriosis_recommendations(user_age, log.pain_level)
+    else:
+        mock = generate_general_recommendations(user_age, log.pain_level)
+
+    return mock
+
+
 def generate_pcos_recommendations(age, pain_level):
     """Generate age and pain-adjusted PCOS recommendations."""
     base_diet = """- Focus on low-glycemic foods like quinoa, sweet potatoes, and oats
@@ -449,25 +579,22 @@ def generate_general_recommendations(age, pain_level):
 @jwt_required
 def log_symptom():
     """
-    Logs a user's symptoms and generates a personalized AI-based recommendation.
+    Logs a user's symptoms and queues a personalized AI-based recommendation.
 
-    This endpoint allows an authenticated user to log their symptoms. Upon logging,
-    it attempts to generate a recommendation using AI that takes into account both
-    the symptom log and the user's profile information (age, PCOS status, 
-    endometriosis status, etc.). The recommendation focuses on diet, exercise, 
-    and wellness based on the user's comprehensive health profile.
-
-    The function stores the symptom log in the database and tries to create a 
-    personalized AI recommendation. If the AI recommendation generation fails, 
-    it provides personalized fallback recommendations based on the user's profile.
+    This endpoint allows an authenticated user to log their symptoms. The symptom
+    log is stored together with a recommendation job, and the job is handed to the
+    background worker pool, so the request returns without waiting on the AI model.
+    The worker generates a recommendation that takes into account both the symptom
+    log and the user's profile information (age, PCOS status, endometriosis status,
+    etc.), falling back to personalized rule-based recommendations if the AI fails.
 
     Returns:
-        JSON response containing a success message, log ID, and the AI-generated 
-        recommendation in clean markdown format. The recommendations are now 
-        personalized based on user profile information.
+        JSON response containing a message, the log ID, the job and the URL to poll
+        for the job status. Once the job is completed, the recommendation is
+        available from GET /api/recommendations/<log_id>.
 
     Raises:
-        201: Symptom log created, with personalized recommendation (AI or fallback).
+        202: Symptom log created, recommendation generation queued.
     """
 
     data = request.get_json()
@@ -482,28 +609,150 @@ def log_symptom():
         notes=data.get('notes')
     )
     db.session.add(log)
+    db.session.flush()
+
+    # Keep the analytics rollup and symptom index in step with the raw logs (same transaction)
+    add_logs_to_rollups([log])
+    index_log_symptoms([log])
+
+    # Persist the job in the same transaction as the log so it survives restarts
+    job = recommendation_queue.create_job(log)
     db.session.commit()
 
-    # Generate personalized AI recommendation automatically
-    success, result = generate_ai_recommendation_for_log(log)
-    if success:
-        print("\n=== PERSONALIZED MARKDOWN RENDER TEST ===\n")
-        print(result["markdown"])
-        print("\n========================================\n")
+    recommendation_queue.enqueue(job.id, priority=plan_priority(g.current_user.subscription_plan))
+    db.session.refresh(job)
+
+    return jsonify({
+        "message": "Symptom log created, personalized recommendation is being generated",
+        "log_id": log.id,
+        "job": job.to_dict(),
+        "status_url": url_for('recommendations.get_recommendation_job', job_id=job.id)
+    }), 202
+
+
+@symptoms_bp.route('/batch', methods=['POST'])
+@jwt_required
+def log_symptoms_batch():
+    """
+    Logs many symptom entries in one request (offline sync from the mobile app).
+
+    Every entry is validated first; the valid ones are inserted in a single
+    transaction together with their rollups, symptom index links and recommendation
+    jobs. The jobs share a batch_id and are run one after another by a single
+    background worker, so a long sync does not fan out into a burst of model calls.
+
+    Request body:
+        {"logs": [{"date": "YYYY-MM-DD" (optional, default today), "condition", "symptoms",
+                   "pain_level": 0-10, "mood", "cycle_day", "notes",
+                   "client_id": optional, echoed back in the result}, ...]}
+
+    Returns:
+        JSON with the batch_id, counts and one result per entry, in request order:
+            {"index", "client_id", "status": "created", "log_id", "job_id", "status_url"}
+            {"index", "client_id", "status": "invalid", "error"}
+
+    Raises:
+        202: At least one entry was created
+        400: The body is malformed, too large, or no entry is valid
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('logs'), list) or not data['logs']:
+        return jsonify({"error": "Request body must contain a non-empty 'logs' list"}), 400
+
+    max_items = current_app.config.get('SYMPTOM_BATCH_MAX_ITEMS', 100)
+    if len(data['logs']) > max_items:
+        return jsonify({"error": f"A batch can contain at most {max_items} logs"}), 400
+
+    results = []
+    logs = []
+    for index, item in enumerate(data['logs']):
+        values, error = validate_symptom_log_item(item)
+        client_id = item.get('client_id') if isinstance(item, dict) else None
+        result = {"index": index, "client_id": client_id}
+        if error:
+            result.update(status="invalid", error=error)
+        else:
+            log = SymptomLog(user_id=g.current_user.id, **values)
+            logs.append(log)
+            result.update(status="created", log=log)
+        results.append(result)
+
+    if not logs:
         return jsonify({
-            "message": "Symptom log created and personalized recommendation generated",
-            "log_id": log.id,
-            "recommendation": result
-        }), 201
+            "error": "No valid symptom logs in the batch",
+            "results": results
+        }), 400
+
+    # One multi-row INSERT for the logs, then the derived rows, all in one transaction
+    db.session.add_all(logs)
+    db.session.flush()
+    add_logs_to_rollups(logs)
+    index_log_symptoms(logs)
+
+    batch_id = uuid4().hex
+    jobs = recommendation_queue.create_batch_jobs(logs, batch_id)
+    db.session.flush()
+    job_ids = {job.log_id: job.id for job in jobs}
+    db.session.commit()
+
+    for result in results:
+        log = result.pop('log', None)
+        if log is not None:
+            result.update(
+                log_id=log.id,
+                job_id=job_ids[log.id],
+                status_url=url_for('recommendations.get_recommendation_job', job_id=job_ids[log.id])
+            )
+
+    # A single hand-off: the worker that picks up this job runs the whole batch
+    recommendation_queue.enqueue(jobs[0].id, priority=plan_priority(g.current_user.subscription_plan))
+
+    return jsonify({
+        "message": f"{len(logs)} symptom logs created, recommendations are being generated",
+        "batch_id": batch_id,
+        "created": len(logs),
+        "invalid": len(results) - len(logs),
+        "results": results
+    }), 202
+
+
+def validate_symptom_log_item(item):
+    """
+    Validate one entry of a batch upload.
+
+    Returns:
+        tuple: (SymptomLog column values, None) if valid, else (None, error message)
+    """
+    if not isinstance(item, dict):
+        return None, "Each log must be an object"
+
+    values = {}
+    for field in ('condition', 'symptoms', 'mood', 'notes'):
+        value = item.get(field)
+        if value is not None and not isinstance(value, str):
+            return None, f"'{field}' must be a string"
+        values[field] = value
+
+    for field, low, high in (('pain_level', 0, 10), ('cycle_day', 1, 365)):
+        value = item.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high):
+            return None, f"'{field}' must be a whole number between {low} and {high}"
+        values[field] = value
+
+    today = datetime.utcnow().date()
+    if item.get('date') is None:
+        values['date'] = today
     else:
-        # Still return the log creation with personalized fallback recommendations
-        return jsonify({
-            "message": "Symptom log created with personalized fallback recommendation",
-            "log_id": log.id,
-            "recommendation": result  # This will contain personalized fallback markdown recommendations
-        }), 201
+        try:
+            values['date'] = datetime.strptime(str(item['date']), '%Y-%m-%d').date()
+        except ValueError:
+            return None, "Invalid date format. Use YYYY-MM-DD"
+        # Allow a day of slack for clients ahead of UTC
+        if values['date'] > today + timedelta(days=1):
+            return None, "'date' cannot be in the future"
+
+    return values, None
         
-# Add these routes to your symptoms.py file after the existing POST route
 
 @symptoms_bp.route('/', methods=['GET'])
 @jwt_required
@@ -517,7 +766,14 @@ def get_user_symptom_logs():
     - start_date: Filter logs from this date (format: YYYY-MM-DD)
     - end_date: Filter logs until this date (format: YYYY-MM-DD)
     - condition: Filter by specific condition
+    - symptom: Only logs that mention this symptom (case-insensitive exact name)
     - sort: Sort order - 'desc' for newest first, 'asc' for oldest first (default: desc)
+    - cursor: Opaque keyset cursor; pass it empty for the first page, then the returned
+      next_cursor. Deep pages cost the same as the first one. When set, offset is ignored
+      and no total is computed.
+    - fields: Comma-separated fields to return, e.g. `id,date,recommendation.diet`, or
+      fields to leave out, e.g. `-recommendation.markdown` or `-recommendation`
+      (recommendations are then not loaded at all)
     
     Returns:
         JSON response containing user's symptom logs with recommendations
@@ -528,38 +784,111 @@ def get_user_symptom_logs():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     condition = request.args.get('condition')
-    sort_order = request.args.get('sort', 'desc')
-    
-    # Build query
-    query = SymptomLog.query.filter_by(user_id=g.current_user.id)
-    
-    # Apply date filters
+    symptom = request.args.get('symptom')
+    sort_order = 'asc' if request.args.get('sort', 'desc').lower() == 'asc' else 'desc'
+    cursor = request.args.get('cursor')
+    try:
+        fields = parse_fields(request.args.get('fields'), SYMPTOM_LOG_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    with_recommendation = fields is None or 'recommendation' in fields
+
+    # Validate every parameter before answering 304, so a malformed request always gets its 400
     if start_date:
         try:
-            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-            query = query.filter(SymptomLog.date >= start_date_obj)
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
         except ValueError:
             return jsonify({"error": "Invalid start_date format. Use YYYY-MM-DD"}), 400
-    
+
     if end_date:
         try:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-            query = query.filter(SymptomLog.date <= end_date_obj)
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
         except ValueError:
             return jsonify({"error": "Invalid end_date format. Use YYYY-MM-DD"}), 400
+
+    position = None
+    if cursor is not None:
+        try:
+            position = decode_cursor(cursor, sort_order)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    
+    # Any write to the user's logs or recommendations bumps the data version
+    etag = user_data_etag('symptom_logs')
+    headers = cache_headers(etag)
+    if is_not_modified(etag):
+        return '', 304, headers
+    
+    # Build query
+    query = SymptomLog.query.filter_by(user_id=g.current_user.id)
+    
+    # Apply date filters
+    if start_date:
+        query = query.filter(SymptomLog.date >= start_date)
+    
+    if end_date:
+        query = query.filter(SymptomLog.date <= end_date)
     
     # Apply condition filter
     if condition:
         query = query.filter(SymptomLog.condition.ilike(f'%{condition}%'))
     
+    # Apply symptom filter through the normalized symptom index
+    if symptom:
+        names = normalize_symptoms(symptom)
+        query = query.filter(SymptomLog.id.in_(
+            db.session.query(SymptomLogSymptom.log_id).join(Symptom).filter(
+                SymptomLogSymptom.user_id == g.current_user.id,
+                Symptom.name == (names[0] if names else '')
+            )
+        ))
+    
     # Apply sorting
-    if sort_order.lower() == 'asc':
+    if sort_order == 'asc':
         query = query.order_by(SymptomLog.date.asc(), SymptomLog.id.asc())
     else:
         query = query.order_by(SymptomLog.date.desc(), SymptomLog.id.desc())
     
-    # Apply pagination
-    logs = query.offset(offset).limit(limit).all()
+    if with_recommendation:
+        query = query.options(joinedload(SymptomLog.recommendation))
+
+    if cursor is not None:
+        # Keyset pagination: seek past the last (date, id) seen instead of skipping rows
+        if position:
+            query = query.filter(keyset_filter(SymptomLog.date, SymptomLog.id, position, sort_order))
+
+        logs = query.limit(limit + 1).all()
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+
+        pagination = {
+            "limit": limit,
+            "next_cursor": encode_cursor(logs[-1].date, logs[-1].id, sort_order) if has_more else None,
+            "has_more": has_more
+        }
+    else:
+        # Compute the filtered total with a window function, so the page and
+        # its total cost a single query regardless of page size
+        rows = (
+            query.add_columns(func.count().over().label('total_count'))
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        logs = [log for log, _ in rows]
+
+        if rows:
+            total_count = rows[0].total_count
+        else:
+            # Page past the end: the window total is unavailable, count separately
+            total_count = query.order_by(None).count()
+
+        pagination = {
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_count
+        }
     
     # Convert to JSON format
     logs_data = []
@@ -577,36 +906,15 @@ def get_user_symptom_logs():
         }
         
         # Include recommendation if exists
-        if log.recommendation:
-            log_data["recommendation"] = {
-                "diet": log.recommendation.diet,
-                "exercise": log.recommendation.exercise,
-                "wellness": log.recommendation.wellness,
-                "generated_at": log.recommendation.generated_at.isoformat(),
-                "markdown": f"""### 🥗 Diet
-{log.recommendation.diet}
-
-### 🏃 Exercise
-{log.recommendation.exercise}
-
-### 🧘 Wellness
-{log.recommendation.wellness}"""
-            }
+        if with_recommendation and log.recommendation:
+            log_data["recommendation"] = log.recommendation.to_dict()
         
-        logs_data.append(log_data)
-    
-    # Get total count for pagination info
-    total_count = SymptomLog.query.filter_by(user_id=g.current_user.id).count()
+        logs_data.append(project(log_data, fields))
     
     return jsonify({
         "logs": logs_data,
-        "pagination": {
-            "total": total_count,
-            "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < total_count
-        }
-    }), 200
+        "pagination": pagination
+    }), 200, headers
 
 
 @symptoms_bp.route('/<int:log_id>', methods=['GET'])
@@ -618,10 +926,19 @@ def get_symptom_log_by_id(log_id):
     Args:
         log_id: The ID of the symptom log to retrieve
         
+    Query parameters:
+    - fields: Fields to return or leave out, as for the list endpoint
+        
     Returns:
         JSON response containing the specific symptom log with recommendation
+        (304 Not Modified if the client's ETag or Last-Modified is still current)
     """
-    log = SymptomLog.query.filter_by(
+    try:
+        fields = parse_fields(request.args.get('fields'), SYMPTOM_LOG_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    log = SymptomLog.query.options(joinedload(SymptomLog.recommendation)).filter_by(
         id=log_id, 
         user_id=g.current_user.id
     ).first()
@@ -629,6 +946,15 @@ def get_symptom_log_by_id(log_id):
     if not log:
         return jsonify({"error": "Symptom log not found"}), 404
     
+    # Logs are immutable, so the representation only changes when the recommendation arrives
+    recommendation = log.recommendation
+    generated_at = recommendation.generated_at if recommendation else None
+    etag = strong_etag('symptom_log', log.id, recommendation.id if recommendation else None,
+                       generated_at.isoformat() if generated_at else None, request.args.get('fields'))
+    headers = cache_headers(etag, generated_at)
+    if is_not_modified(etag, generated_at):
+        return '', 304, headers
+    
     log_data = {
         "id": log.id,
         "date": log.date.isoformat(),
@@ -643,22 +969,9 @@ def get_symptom_log_by_id(log_id):
     
     # Include recommendation if exists
     if log.recommendation:
-        log_data["recommendation"] = {
-            "diet": log.recommendation.diet,
-            "exercise": log.recommendation.exercise,
-            "wellness": log.recommendation.wellness,
-            "generated_at": log.recommendation.generated_at.isoformat(),
-            "markdown": f"""### 🥗 Diet
-{log.recommendation.diet}
-
-### 🏃 Exercise
-{log.recommendation.exercise}
-
-### 🧘 Wellness
-{log.recommendation.wellness}"""
-        }
+        log_data["recommendation"] = log.recommendation.to_dict()
     
-    return jsonify({"log": log_data}), 200
+    return jsonify({"log": project(log_data, fields)}), 200, headers
 
 
 @symptoms_bp.route('/recent', methods=['GET'])
@@ -676,16 +989,24 @@ def get_recent_symptom_logs():
     """
     days = min(int(request.args.get('days', 7)), 30)  # Max 30 days
     
-    from datetime import timedelta
+    # The window moves daily, so the date is part of the validator
+    etag = user_data_etag('recent_symptom_logs', datetime.utcnow().date().isoformat())
+    headers = cache_headers(etag)
+    if is_not_modified(etag):
+        return '', 304, headers
+    
     cutoff_date = datetime.utcnow().date() - timedelta(days=days)
     
-    logs = SymptomLog.query.filter(
+    # Outer join on the recommendation ID only, instead of lazy-loading each recommendation
+    rows = db.session.query(SymptomLog, AIRecommendation.id).outerjoin(
+        AIRecommendation, AIRecommendation.log_id == SymptomLog.id
+    ).filter(
         SymptomLog.user_id == g.current_user.id,
         SymptomLog.date >= cutoff_date
     ).order_by(SymptomLog.date.desc()).all()
     
     logs_data = []
-    for log in logs:
+    for log, recommendation_id in rows:
         log_data = {
             "id": log.id,
             "date": log.date.isoformat(),
@@ -695,7 +1016,7 @@ def get_recent_symptom_logs():
             "mood": log.mood,
             "cycle_day": log.cycle_day,
             "notes": log.notes,
-            "has_recommendation": log.recommendation is not None
+            "has_recommendation": recommendation_id is not None
         }
         logs_data.append(log_data)
     
@@ -703,7 +1024,7 @@ def get_recent_symptom_logs():
         "logs": logs_data,
         "period_days": days,
         "total_logs": len(logs_data)
-    }), 200
+    }), 200, headers
 
 
 @symptoms_bp.route('/analytics', methods=['GET'])
@@ -720,58 +1041,43 @@ def get_symptom_analytics():
     """
     days = min(int(request.args.get('days', 30)), 90)  # Max 90 days
     
-    from datetime import timedelta
-    from sqlalchemy import func
+    etag = user_data_etag('symptom_analytics', datetime.utcnow().date().isoformat())
+    headers = cache_headers(etag)
+    if is_not_modified(etag):
+        return '', 304, headers
     
     cutoff_date = datetime.utcnow().date() - timedelta(days=days)
     
-    # Get logs for analysis
-    logs = SymptomLog.query.filter(
-        SymptomLog.user_id == g.current_user.id,
-        SymptomLog.date >= cutoff_date
+    # Read the per-day rollups (at most one row per day) instead of every raw log
+    rollups = SymptomDailyRollup.query.filter(
+        SymptomDailyRollup.user_id == g.current_user.id,
+        SymptomDailyRollup.date >= cutoff_date
     ).all()
     
-    if not logs:
+    total_logs = sum(rollup.log_count for rollup in rollups)
+    if not total_logs:
         return jsonify({
             "message": "No symptom logs found for the specified period",
             "analytics": None
-        }), 200
-    
-    # Calculate analytics
-    total_logs = len(logs)
+        }), 200, headers
     
     # Pain level analytics
-    pain_levels = [log.pain_level for log in logs if log.pain_level is not None]
-    avg_pain = sum(pain_levels) / len(pain_levels) if pain_levels else 0
-    max_pain = max(pain_levels) if pain_levels else 0
+    pain_entries = sum(rollup.pain_count for rollup in rollups)
+    pain_maxima = [rollup.pain_max for rollup in rollups if rollup.pain_max is not None]
+    avg_pain = sum(rollup.pain_sum for rollup in rollups) / pain_entries if pain_entries else 0
+    max_pain = max(pain_maxima) if pain_maxima else 0
     
-    # Mood analytics
-    moods = [log.mood for log in logs if log.mood]
+    # Mood and condition analytics
     mood_counts = {}
-    for mood in moods:
-        mood_counts[mood] = mood_counts.get(mood, 0) + 1
-    
-    # Condition analytics
-    conditions = [log.condition for log in logs if log.condition]
     condition_counts = {}
-    for condition in conditions:
-        condition_counts[condition] = condition_counts.get(condition, 0) + 1
+    for rollup in rollups:
+        for mood, count in (rollup.mood_counts or {}).items():
+            mood_counts[mood] = mood_counts.get(mood, 0) + count
+        for condition, count in (rollup.condition_counts or {}).items():
+            condition_counts[condition] = condition_counts.get(condition, 0) + count
     
-    # Most common symptoms
-    all_symptoms = []
-    for log in logs:
-        if log.symptoms:
-            # Split symptoms by common delimiters
-            symptoms = [s.strip() for s in log.symptoms.replace(',', ';').split(';')]
-            all_symptoms.extend(symptoms)
-    
-    symptom_counts = {}
-    for symptom in all_symptoms:
-        if symptom:  # Skip empty strings
-            symptom_counts[symptom.lower()] = symptom_counts.get(symptom.lower(), 0) + 1
-    
-    # Get top 5 symptoms
-    top_symptoms = sorted(symptom_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Top 5 symptoms, aggregated in SQL over the normalized symptom index
+    top_symptoms = top_symptoms_query(g.current_user.id, cutoff_date).limit(5).all()
     
     analytics = {
         "period_days": days,
@@ -779,7 +1085,7 @@ def get_symptom_analytics():
         "pain_analytics": {
             "average_pain": round(avg_pain, 1),
             "max_pain": max_pain,
-            "total_pain_entries": len(pain_levels)
+            "total_pain_entries": pain_entries
         },
         "mood_distribution": mood_counts,
         "condition_distribution": condition_counts,
@@ -787,4 +1093,87 @@ def get_symptom_analytics():
         "logging_frequency": round(total_logs / days, 2)  # logs per day
     }
     
-    return jsonify({"analytics": analytics}), 200
\ No newline at end of file
+    return jsonify({"analytics": analytics}), 200, headers
+
+
+def user_data_etag(resource, *parts):
+    """
+    ETag for a view over the current user's data, derived from their data version
+    and the query string, so it can be checked before running any of the view's queries.
+    """
+    return strong_etag(resource, g.current_user.id, get_data_version(g.current_user.id),
+                       sorted(request.args.items(multi=True)), *parts)
+
+
+def top_symptoms_query(user_id, cutoff_date):
+    """Query (symptom name, log count) pairs for a user since a date, most frequent first."""
+    count = func.count(SymptomLogSymptom.log_id)
+    return db.session.query(Symptom.name, count).join(
+        SymptomLogSymptom, SymptomLogSymptom.symptom_id == Symptom.id
+    ).filter(
+        SymptomLogSymptom.user_id == user_id,
+        SymptomLogSymptom.date >= cutoff_date
+    ).group_by(Symptom.name).order_by(count.desc(), Symptom.name.asc())
+
+
+@symptoms_bp.route('/analytics/symptoms', methods=['GET'])
+@jwt_required
+def get_top_symptoms():
+    """
+    Get the user's most frequent symptoms.
+    
+    Query parameters:
+    - days: Number of days to analyze (default: 30, max: 365)
+    - limit: Number of symptoms to return (default: 10, max: 50)
+    
+    Returns:
+        JSON response containing symptoms and the number of logs mentioning each
+    """
+    days = min(int(request.args.get('days', 30)), 365)
+    limit = min(int(request.args.get('limit', 10)), 50)
+    cutoff_date = datetime.utcnow().date() - timedelta(days=days)
+
+    top_symptoms = top_symptoms_query(g.current_user.id, cutoff_date).limit(limit).all()
+
+    return jsonify({
+        "period_days": days,
+        "symptoms": [{"symptom": symptom, "count": count} for symptom, count in top_symptoms]
+    }), 200
+
+
+@symptoms_bp.route('/analytics/symptoms/<path:symptom>', methods=['GET'])
+@jwt_required
+def get_symptom_frequency(symptom):
+    """
+    Get how often a symptom was logged per day.
+    
+    Args:
+        symptom: Symptom name (case-insensitive)
+    
+    Query parameters:
+    - days: Number of days to analyze (default: 90, max: 365)
+    
+    Returns:
+        JSON response containing the daily counts for days on which the symptom was logged
+    """
+    days = min(int(request.args.get('days', 90)), 365)
+    cutoff_date = datetime.utcnow().date() - timedelta(days=days)
+    names = normalize_symptoms(symptom)
+    if not names:
+        return jsonify({"error": "Symptom name is required"}), 400
+
+    count = func.count(SymptomLogSymptom.log_id)
+    rows = db.session.query(SymptomLogSymptom.date, count).join(
+        Symptom, SymptomLogSymptom.symptom_id == Symptom.id
+    ).filter(
+        SymptomLogSymptom.user_id == g.current_user.id,
+        SymptomLogSymptom.date >= cutoff_date,
+        Symptom.name == names[0]
+    ).group_by(SymptomLogSymptom.date).order_by(SymptomLogSymptom.date.asc()).all()
+
+    return jsonify({
+        "symptom": names[0],
+        "period_days": days,
+        "total_logs": sum(day_count for _, day_count in rows),
+        "frequency": [{"date": day.isoformat(), "count": day_count} for day, day_count in rows]
+    }), 200
\ No newline at end of file
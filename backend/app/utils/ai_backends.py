@@ -0,0 +1,237 @@
+# app/utils/ai_backends.py
+import os
+import re
+import threading
+import time
+from flask import current_app
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.providers import providers
+
+# Log count of a batch prompt (see build_batch_prompt in app/routes/symptoms.py)
+BATCH_PROMPT_LOGS = re.compile(r'^SYMPTOM LOGS \((\d+)\):', re.MULTILINE)
+
+class GeminiBackend:
+    """
+    Generate recommendation text with Google Gemini.
+
+    One instance lives for the whole process: the SDK is imported and configured
+    on the first call, and the GenerativeModel (with its underlying client
+    connection) is reused across requests, so only the first call pays for client
+    setup. The model is rebuilt if the process has been forked, since client
+    connections must not be shared between processes.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name='gemini-2.0-flash'):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._model = None
+        self._pid = None
+        self.clients_created = 0
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def _get_model(self):
+        if self._model is not None and self._pid == os.getpid():
+            return self._model
+        with self._lock:
+            if self._model is None or self._pid != os.getpid():
+                # Configure per process, so a forked child never reuses the parent's client
+                genai = providers.get('gemini')
+                genai.configure(api_key=self.api_key)
+                self._model = genai.GenerativeModel(self.model_name)
+                self._pid = os.getpid()
+                self.clients_created += 1
+            return self._model
+
+    def generate(self, prompt):
+        """
+        Send the prompt to Gemini and return the raw response text.
+
+        Raises:
+            Exception: If the API call fails or the response is empty
+        """
+        model = self._get_model()
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+
+        response = model.generate_content(prompt)
+        if response and response.text:
+            return response.text
+        raise Exception("Empty response from Gemini")
+
+    def stream(self, prompt):
+        """
+        Send the prompt to Gemini in streaming mode and yield text chunks as they arrive.
+
+        Raises:
+            Exception: If the API call fails or the response is empty
+        """
+        model = self._get_model()
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+
+        received = False
+        for chunk in model.generate_content(prompt, stream=True):
+            if chunk.text:
+                received = True
+                yield chunk.text
+        if not received:
+            raise Exception("Empty response from Gemini")
+
+    def stats(self):
+        """Return client reuse counters for monitoring."""
+        return {
+            'backend': self.name,
+            'model': self.model_name,
+            'clients_created': self.clients_created,
+            'calls': self.calls,
+            'prompt_chars': self.prompt_chars,
+            'client_reuses': max(0, self.calls - self.clients_created)
+        }
+
+
+class StubBackend:
+    """
+    Offline stand-in for Gemini, used in tests and benchmarks.
+    Returns a fixed, well-formed three-section response after an optional delay
+    (one per log, under "=== LOG <n> ===" markers, for batch prompts).
+    """
+
+    name = 'stub'
+
+    RESPONSE = """## Diet
+- Eat plenty of leafy greens and whole grains
+- Include lean proteins such as fish, eggs, and legumes
+- Stay hydrated throughout the day
+
+## Exercise
+- Take a 20-minute walk at a comfortable pace
+- Try gentle stretching or yoga in the evening
+
+## Wellness Tips
+- Keep a regular sleep schedule
+- Practice deep breathing when you feel stressed
+- Note your symptoms to spot patterns over time"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def _response(self, prompt):
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        batch = BATCH_PROMPT_LOGS.search(prompt)
+        if batch is None:
+            return self.RESPONSE
+        return '\n\n'.join(f"=== LOG {n} ===\n{self.RESPONSE}" for n in range(1, int(batch.group(1)) + 1))
+
+    def generate(self, prompt):
+        """Return the canned response, simulating model latency if configured."""
+        response = self._response(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        return response
+
+    def stream(self, prompt, chunk_size=32):
+        """Yield the canned response in small chunks, spreading the latency across them."""
+        response = self._response(prompt)
+        chunks = [response[i:i + chunk_size] for i in range(0, len(response), chunk_size)]
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    def stats(self):
+        return {'backend': self.name, 'calls': self.calls, 'prompt_chars': self.prompt_chars}
+
+
+def create_ai_backend(config):
+    """
+    Build the AI backend selected by the AI_BACKEND config value.
+
+    Args:
+        config: Flask config mapping
+
+    Returns:
+        GeminiBackend or StubBackend instance
+    """
+    backend = (config.get('AI_BACKEND') or 'gemini').lower()
+    if backend == 'stub':
+        return StubBackend(latency=float(config.get('AI_STUB_LATENCY') or 0))
+    if backend == 'gemini':
+        return GeminiBackend(api_key=config.get('GEMINI_API_KEY'))
+    raise ValueError(f"Unknown AI_BACKEND: {backend}")
+
+
+def init_ai_backend(app):
+    """Create the process-wide AI backend and its circuit breaker and attach them to the app."""
+    app.extensions['ai_backend'] = create_ai_backend(app.config)
+    app.extensions['ai_circuit_breaker'] = CircuitBreaker(
+        failure_threshold=int(app.config.get('AI_BREAKER_FAILURE_THRESHOLD', 5)),
+        recovery_timeout=float(app.config.get('AI_BREAKER_RECOVERY_TIMEOUT', 30))
+    )
+
+
+def get_ai_backend():
+    """Return the AI backend for the current application."""
+    return current_app.extensions['ai_backend']
+
+
+def get_ai_circuit_breaker():
+    """Return the circuit breaker guarding the AI backend."""
+    return current_app.extensions['ai_circuit_breaker']
+
+
+def generate_ai_text(prompt):
+    """
+    Call the AI backend through the circuit breaker.
+
+    Raises:
+        CircuitOpenError: If the breaker is open and the call was skipped
+        Exception: Any error raised by the backend (recorded as a failure)
+    """
+    breaker = get_ai_circuit_breaker()
+    if not breaker.allow_request():
+        raise CircuitOpenError("AI backend circuit is open")
+
+    try:
+        text = get_ai_backend().generate(prompt)
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    breaker.record_success()
+    return text
+
+
+def stream_ai_text(prompt):
+    """
+    Stream text chunks from the AI backend through the circuit breaker.
+
+    The call counts as a success once the stream completes (or the consumer stops
+    early, since the backend was responding), and as a failure if it raises part-way
+    through.
+
+    Raises:
+        CircuitOpenError: If the breaker is open and the call was skipped
+        Exception: Any error raised by the backend (recorded as a failure)
+    """
+    breaker = get_ai_circuit_breaker()
+    if not breaker.allow_request():
+        raise CircuitOpenError("AI backend circuit is open")
+
+    try:
+        for chunk in get_ai_backend().stream(prompt):
+            yield chunk
+    except GeneratorExit:
+        breaker.record_success()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    breaker.record_success()
\ No newline at end of file
@@ -0,0 +1,148 @@
+# app/utils/ai_rate_limit.py
+import threading
+import time
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app import db
+from app.models.ai_rate_bucket import AIRateBucket
+
+# Dispatch priority of each subscription plan (lower goes first); unknown plans rank last
+PLAN_PRIORITIES = {'paid': 0, 'free': 1}
+LOWEST_PRIORITY = max(PLAN_PRIORITIES.values()) + 1
+
+
+class AIRateLimitedError(Exception):
+    """Raised when a user has used up their budget of AI model calls."""
+
+
+def plan_priority(plan):
+    """Return the dispatch priority of a subscription plan (lower goes first)."""
+    return PLAN_PRIORITIES.get(plan, LOWEST_PRIORITY)
+
+
+class AIRateLimiter:
+    """
+    Per-user token buckets limiting AI model calls, with a budget per subscription plan.
+
+    Each plan has a sustained rate (AI_RATE_LIMIT_<PLAN>, calls per minute) and a
+    burst (AI_RATE_BURST_<PLAN>); a rate of 0 leaves the plan unlimited. A model
+    call takes one token, whether it answers one log or a batch, and cache hits
+    take none. Callers over budget get the rule-based fallback at once instead of
+    waiting for tokens.
+
+    Buckets live in the `ai_rate_buckets` table, so the limits hold across all
+    server processes. A token is taken with one conditional UPDATE that refills
+    the bucket and takes the token only if one is available, committed on its own
+    connection so the caller's transaction is left alone. A user whose plan
+    changes starts again with a full bucket for that plan. The granted/throttled
+    counters are per process.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = limits or {}
+        self._lock = threading.Lock()
+        self._granted = {}
+        self._throttled = {}
+
+    def init_app(self, app):
+        """Read the per-plan budgets from the app config."""
+        self.limits = {}
+        for plan in PLAN_PRIORITIES:
+            per_minute = float(app.config.get(f'AI_RATE_LIMIT_{plan.upper()}') or 0)
+            if per_minute > 0:
+                burst = float(app.config.get(f'AI_RATE_BURST_{plan.upper()}') or max(1.0, per_minute))
+                self.limits[plan] = (per_minute, burst)
+        app.extensions['ai_rate_limiter'] = self
+
+    def _take(self, user_id, plan, attempts=3):
+        """Take one token from a user's bucket for `plan`. Returns False if none is available."""
+        per_minute, burst = self.limits[plan]
+        bucket = AIRateBucket.__table__
+        for _ in range(attempts):
+            now = time.time()
+            refilled = bucket.c.tokens + (now - bucket.c.updated_at) * (per_minute / 60)
+            available = case((refilled > burst, burst), else_=refilled)
+            try:
+                with db.engine.begin() as connection:
+                    taken = connection.execute(
+                        bucket.update()
+                        .where(bucket.c.user_id == user_id, bucket.c.plan == plan, available >= 1)
+                        .values(tokens=available - 1, updated_at=now)
+                    ).rowcount
+                    if taken:
+                        return True
+                    current_plan = connection.execute(
+                        select(bucket.c.plan).where(bucket.c.user_id == user_id)
+                    ).scalar()
+                    if current_plan == plan:
+                        return False
+                    # First call, or the plan changed: start from a full bucket
+                    if current_plan is None:
+                        connection.execute(bucket.insert().values(
+                            user_id=user_id, plan=plan, tokens=burst - 1, updated_at=now
+                        ))
+                        return True
+                    if connection.execute(
+                        bucket.update()
+                        .where(bucket.c.user_id == user_id, bucket.c.plan == current_plan)
+                        .values(plan=plan, tokens=burst - 1, updated_at=now)
+                    ).rowcount:
+                        return True
+            except IntegrityError:
+                pass  # another process created the bucket first: take from theirs
+        return False
+
+    def try_acquire(self, user):
+        """
+        Take one model call from the user's budget.
+
+        Args:
+            user: User instance
+
+        Returns:
+            bool: True if the call may go ahead, False if the user is over budget
+        """
+        plan = user.subscription_plan
+        if plan not in self.limits:
+            return True
+        allowed = self._take(user.id, plan)
+        counters = self._granted if allowed else self._throttled
+        with self._lock:
+            counters[plan] = counters.get(plan, 0) + 1
+        return allowed
+
+    def check(self, user):
+        """
+        Take one model call from the user's budget.
+
+        Raises:
+            AIRateLimitedError: If the user is over budget
+        """
+        if not self.try_acquire(user):
+            raise AIRateLimitedError(f"AI rate limit reached for user {user.id} ({user.subscription_plan} plan)")
+
+    def stats(self):
+        """
+        Return the budgets, users with a bucket and granted/throttled counters per plan
+        for monitoring. `users` is None while the buckets table cannot be read (e.g.
+        before `flask db upgrade`).
+        """
+        try:
+            users = dict(db.session.query(AIRateBucket.plan, func.count(AIRateBucket.user_id)).group_by(AIRateBucket.plan))
+        except SQLAlchemyError:
+            db.session.rollback()
+            users = None
+        with self._lock:
+            plans = {}
+            for plan in PLAN_PRIORITIES:
+                per_minute, burst = self.limits.get(plan, (None, None))
+                plans[plan] = {
+                    'per_minute': per_minute,  # None: unlimited
+                    'burst': burst,
+                    'users': users.get(plan, 0) if users is not None else None,
+                    'granted': self._granted.get(plan, 0),
+                    'throttled': self._throttled.get(plan, 0)
+                }
+            return {'plans': plans}
+
+ai_rate_limiter = AIRateLimiter()
\ No newline at end of file
@@ -0,0 +1,146 @@
+# app/utils/ai_response_parser.py
+import re
+
+# "## Diet", "## Exercise", "## Wellness Tips" anywhere in the text (not only at line starts)
+HEADER = re.compile(r'##\s*(Diet|Exercise|Wellness\s*Tips?)', re.IGNORECASE)
+# A section whose whole text is one of the names also switches section
+SECTION_NAME = re.compile(r'(diet|exercise|wellness\s*tips?)', re.IGNORECASE)
+NUMBERED_ITEM = re.compile(r'\d+\.\s*')
+
+# "=== LOG 3 ===" (also "LOG 3:", "**Log 3**", "### LOG 3") on a line of its own, in batch responses
+LOG_MARKER = re.compile(r'^[ \t#=*_>\-]*LOG[ \t]*#?[ \t]*(\d+)[ \t#=*_:.\-]*$', re.IGNORECASE | re.MULTILINE)
+
+# Lines without "##" headers: (section, keywords, markers); a line with a keyword and a marker starts the section
+FALLBACK_SECTIONS = (
+    ('diet', ('diet', 'nutrition'), ('1.', '##', 'diet:')),
+    ('exercise', ('exercise', 'physical', 'activity'), ('2.', '##', 'exercise:')),
+    ('wellness', ('wellness', 'well-being', 'wellbeing'), ('3.', '##', 'wellness:')),
+)
+
+DEFAULT_RECOMMENDATIONS = {
+    'diet': """- Focus on anti-inflammatory foods like leafy greens, fatty fish, and nuts
+- Limit processed foods and added sugars
+- Include complex carbohydrates and lean proteins
+- Stay hydrated with plenty of water""",
+
+    'exercise': """- Engage in gentle activities like walking, yoga, or swimming
+- Aim for 20-30 minutes of daily movement
+- Listen to your body and adjust intensity as needed
+- Include both cardio and strength training when possible""",
+
+    'wellness': """- Maintain a regular sleep schedule (7-8 hours nightly)
+- Practice stress management techniques like meditation
+- Consider mindfulness and relaxation exercises
+- Keep a symptom diary to track patterns"""
+}
+
+
+def get_default_recommendation_markdown(category):
+    """Provide default recommendations in markdown format based on category."""
+    return DEFAULT_RECOMMENDATIONS.get(category, '- Consult with your healthcare provider for personalized advice')
+
+
+def format_lines(text):
+    """Strip each line of a section, drop blank ones, and make each a "- " bullet (numbered items included)."""
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        numbered = NUMBERED_ITEM.match(line)
+        if numbered:
+            line = '- ' + line[numbered.end():] if numbered.end() < len(line) else '-'
+        elif not line.startswith(('-', '*')):
+            line = f"- {line}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def fallback_sections(content):
+    """Assign lines to sections by keywords (e.g. "1. Diet:", "Exercise:") when there are no "##" headers."""
+    sections = {'diet': [], 'exercise': [], 'wellness': []}
+    current = None
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        lower = line.lower()
+        for section, keywords, markers in FALLBACK_SECTIONS:
+            if any(keyword in lower for keyword in keywords):
+                if any(marker in lower for marker in markers):
+                    current, line = section, None
+                break
+        if current and line:
+            sections[current].append(line if line.startswith(('-', '*')) else f"- {line}")
+    return {key: '\n'.join(lines) for key, lines in sections.items()}
+
+
+def parse_sections(content):
+    """
+    Parse an AI response into its sections.
+
+    Text is split on "## Diet" / "## Exercise" / "## Wellness Tips" headers (also
+    mid-line); a part consisting only of a section name also switches section, a
+    repeated section keeps its last occurrence and text before the first header is
+    dropped. If no section gets any content, lines are assigned by keywords
+    instead (FALLBACK_SECTIONS). Empty sections get DEFAULT_RECOMMENDATIONS.
+
+    Args:
+        content: Raw response text
+
+    Returns:
+        tuple: ({"diet", "exercise", "wellness"} markdown bullet lists,
+        names of the sections that fell back to the defaults)
+    """
+    sections = {'diet': '', 'exercise': '', 'wellness': ''}
+    current = None
+    for part in HEADER.split(content):
+        part = part.strip()
+        if not part:
+            continue
+        if SECTION_NAME.fullmatch(part):
+            current = part.lower().replace(' tips', '').replace('tips', '').strip()
+        elif current:
+            sections[current] = format_lines(part)
+
+    if not any(sections.values()):
+        sections = fallback_sections(content)
+
+    missing = [key for key, value in sections.items() if not value]
+    return {key: value or get_default_recommendation_markdown(key) for key, value in sections.items()}, missing
+
+
+def parse_ai_response(content):
+    """
+    Parse a complete AI response into {"diet", "exercise", "wellness"} markdown sections.
+
+    Args:
+        content: Raw response text
+
+    Returns:
+        dict: Section name -> markdown bullet list
+    """
+    return parse_sections(content)[0]
+
+
+def parse_batch_response(content, count):
+    """
+    Split a response to a batch prompt into per-log sections.
+
+    Answers are located by their "=== LOG <n> ===" markers (numbered from 1; other
+    numbers are ignored) and each is parsed like a single response. If a log
+    is answered twice, the last answer wins.
+
+    Args:
+        content: Raw response text
+        count: Number of logs in the prompt
+
+    Returns:
+        list: One entry per log, in prompt order: (sections, missing section names),
+        or None if the response has no answer for that log
+    """
+    markers = [match for match in LOG_MARKER.finditer(content) if 1 <= int(match.group(1)) <= count]
+    answers = [None] * count
+    for marker, following in zip(markers, markers[1:] + [None]):
+        answers[int(marker.group(1)) - 1] = parse_sections(content[marker.end():following.start() if following else len(content)])
+    return answers
\ No newline at end of file
@@ -0,0 +1,67 @@
+# app/utils/auth_cache.py
+import time
+import jwt
+from app import db
+from app.models.user import User
+from app.utils.ttl_cache import TTLCache
+
+
+class AuthCache:
+    """
+    Caches decoded JWT payloads for `jwt_required`.
+
+    The verified payload is cached (never past its `exp`), so repeated requests
+    with the same token skip signature verification. A token's payload never
+    changes, so a cached entry cannot go stale.
+
+    The User row itself is not cached: it is loaded by primary key on every
+    request. This lookup is kept on purpose, so authenticated requests still
+    make one database round trip for the user. A per-process snapshot could not
+    see a user deleted, or a password or plan changed, through another server
+    process, and checking it against the database on each hit would cost the
+    same round trip as the load.
+    """
+
+    def __init__(self, max_size=10000, ttl=30):
+        self.tokens = TTLCache(max_size=max_size, ttl=ttl)
+
+    def init_app(self, app):
+        """Read the cache size and TTL from the app config."""
+        self.tokens.max_size = int(app.config.get('AUTH_CACHE_SIZE', self.tokens.max_size))
+        self.tokens.ttl = float(app.config.get('AUTH_CACHE_TTL', self.tokens.ttl))
+        app.extensions['auth_cache'] = self
+
+    def decode_token(self, token, secret):
+        """
+        Return the verified payload of a token, from the cache when possible.
+
+        Raises:
+            jwt.ExpiredSignatureError: If the token has expired
+            jwt.InvalidTokenError: If the token is invalid
+        """
+        payload = self.tokens.get(token)
+        if payload is not None:
+            if payload.get('exp') is None or payload['exp'] > time.time():
+                return payload
+            self.tokens.delete(token)
+
+        payload = jwt.decode(token, secret, algorithms=["HS256"])
+        ttl = payload['exp'] - time.time() if payload.get('exp') else None
+        self.tokens.set(token, payload, ttl=ttl)
+        return payload
+
+    def load_user(self, user_id):
+        """
+        Return the current User row for an ID, from the database.
+
+        Returns:
+            User or None if the user does not exist
+        """
+        return db.session.get(User, user_id)
+
+    def stats(self):
+        """Return the hit rate and size of the token cache for monitoring."""
+        return {'tokens': self.tokens.stats()}
+
+
+auth_cache = AuthCache()
\ No newline at end of file
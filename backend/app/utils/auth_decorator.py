@@ -1,9 +1,10 @@
 # --- Utils: JWT Decorator ---
 # app/utils/auth_decorator.py
+import hmac
 from functools import wraps
 from flask import request, jsonify, current_app, g
 import jwt
-from app.models.user import User
+from app.utils.auth_cache import auth_cache
 
 def jwt_required(f):
     """
@@ -28,8 +29,9 @@ def jwt_required(f):
             return jsonify({"error": "Token is missing"}), 401
 
         try:
-            data = jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=["HS256"])
-            user = User.query.get(data['user_id'])
+            # Decoded tokens are cached; the user is always read from the database (see app/utils/auth_cache.py)
+            data = auth_cache.decode_token(token, current_app.config['JWT_SECRET'])
+            user = auth_cache.load_user(data['user_id'])
             if not user:
                 raise Exception("User not found")
             g.current_user = user
@@ -38,5 +40,26 @@ def jwt_required(f):
         except Exception as e:
             return jsonify({"error": f"Invalid token: {str(e)}"}), 401
 
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def metrics_token_required(f):
+    """
+    Decorator for internal monitoring endpoints. The request must carry the
+    METRICS_TOKEN config value as a bearer token; without a configured token the
+    endpoint is disabled (404), so nothing is exposed by default.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        expected = current_app.config.get('METRICS_TOKEN')
+        if not expected:
+            return jsonify({"error": "Not Found"}), 404
+
+        bearer = request.headers.get('Authorization', '')
+        token = bearer[len("Bearer "):] if bearer.startswith("Bearer ") else ''
+        if not hmac.compare_digest(token.encode(), expected.encode()):
+            return jsonify({"error": "Metrics token is missing or invalid"}), 401
+
         return f(*args, **kwargs)
     return decorated_function
\ No newline at end of file
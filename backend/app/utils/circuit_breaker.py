@@ -0,0 +1,91 @@
+# app/utils/circuit_breaker.py
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    - closed: calls go through; consecutive failures are counted
+    - open: after `failure_threshold` consecutive failures, calls are refused
+      until `recovery_timeout` seconds have passed
+    - half_open: a single probe call is let through; success closes the
+      circuit, failure opens it again for another cool-down
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.short_circuits = 0
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == 'open' and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = 'half_open'
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        """Return True if a call may go through, counting refused calls."""
+        with self._lock:
+            state = self._current_state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            self._state = 'closed'
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self._state == 'half_open' or self._consecutive_failures >= self.failure_threshold:
+                if self._state != 'open':
+                    self.times_opened += 1
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self):
+        """Return the breaker state and counters for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == 'open':
+                retry_in = round(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                'state': state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout_seconds': self.recovery_timeout,
+                'retry_in_seconds': retry_in,
+                'successes': self.successes,
+                'failures': self.failures,
+                'short_circuits': self.short_circuits,
+                'times_opened': self.times_opened
+            }
\ No newline at end of file
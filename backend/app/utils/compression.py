@@ -0,0 +1,102 @@
+# app/utils/compression.py
+import gzip
+import threading
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional; responses are gzip-compressed without it
+    brotli = None
+
+class ResponseCompressor:
+    """
+    Compresses response bodies with brotli or gzip, as negotiated by Accept-Encoding.
+
+    Runs as an `after_request` hook. Only buffered responses of a compressible type
+    and at least `min_size` bytes are compressed; streamed responses (SSE) and
+    already-encoded ones pass through. A compressed body is a different
+    representation, so its ETag is weakened (W/"..."); weak comparison in
+    `is_not_modified` still matches it on revalidation.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        self.mimetypes = {'application/json', 'text/html', 'text/plain', 'text/markdown'}
+        self._lock = threading.Lock()
+        self._counts = {'gzip': 0, 'br': 0, 'skipped_small': 0}
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def init_app(self, app):
+        """Read the limits from the app config and register the after_request hook."""
+        self.enabled = app.config.get('COMPRESS_ENABLED', self.enabled)
+        self.min_size = int(app.config.get('COMPRESS_MIN_SIZE', self.min_size))
+        self.gzip_level = int(app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level))
+        self.brotli_quality = int(app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality))
+        app.after_request(self.compress)
+        app.extensions['response_compressor'] = self
+
+    def choose_encoding(self, accept_encodings):
+        """Pick 'br' or 'gzip' from an Accept-Encoding header, or None for identity."""
+        candidates = []
+        if brotli is not None and accept_encodings.quality('br') > 0:
+            candidates.append((accept_encodings.quality('br'), 1, 'br'))
+        if accept_encodings.quality('gzip') > 0:
+            candidates.append((accept_encodings.quality('gzip'), 0, 'gzip'))
+        return max(candidates)[2] if candidates else None
+
+    def encode(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress(self, response):
+        if (not self.enabled or response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            with self._lock:
+                self._counts['skipped_small'] += 1
+            return response
+
+        compressed = self.encode(data, encoding)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        with self._lock:
+            self._counts[encoding] += 1
+            self._bytes_in += len(data)
+            self._bytes_out += len(compressed)
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'min_size': self.min_size,
+                'brotli_available': brotli is not None,
+                'responses': dict(self._counts),
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'ratio': round(self._bytes_out / self._bytes_in, 3) if self._bytes_in else None
+            }
+
+
+response_compressor = ResponseCompressor()
\ No newline at end of file
@@ -0,0 +1,55 @@
+# app/utils/data_version.py
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from app import db
+from app.models.user import User
+from app.models.symptom_log import SymptomLog
+from app.models.ai_recommendation import AIRecommendation
+
+def get_data_version(user_id):
+    """
+    Read a user's data version straight from the database.
+
+    The version is bumped with Core UPDATEs that do not refresh ORM objects, so
+    the User loaded for the request (earlier in the same session) must not be
+    trusted for it.
+    """
+    return db.session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+def bump_data_version(user_ids, connection=None):
+    """
+    Increment the data version of the given users in the current transaction.
+
+    Writes to symptom logs and recommendations through the ORM are covered by the
+    flush hook below; call this directly after bulk statements (Query.update/delete,
+    Core inserts) that bypass the unit of work.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    (connection or db.session.connection()).execute(
+        update(User.__table__)
+        .where(User.__table__.c.id.in_(user_ids))
+        .values(data_version=User.__table__.c.data_version + 1)
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_flush(session, flush_context):
+    user_ids = set()
+    log_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SymptomLog):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, AIRecommendation):
+            log_ids.add(obj.log_id)
+    if not user_ids and not log_ids:
+        return
+
+    connection = session.connection()
+    if log_ids:
+        user_ids.update(connection.execute(
+            select(SymptomLog.__table__.c.user_id).where(SymptomLog.__table__.c.id.in_(log_ids))
+        ).scalars())
+    bump_data_version(user_ids, connection)
\ No newline at end of file
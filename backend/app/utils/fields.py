@@ -0,0 +1,64 @@
+# app/utils/fields.py
+
+def parse_fields(value, allowed):
+    """
+    Parse a `fields=` projection parameter.
+
+    The value is a comma-separated list of field names. Nested fields are named
+    with a dot (`recommendation.diet`), and a leading `-` excludes a field
+    (`-recommendation.markdown`). With only exclusions, every other field is kept.
+
+    Args:
+        value: Raw parameter value, or None
+        allowed: Ordered dict of field name -> tuple of subfield names (None if the field has none)
+
+    Returns:
+        dict | None: Field name -> frozenset of subfields to keep (None to keep the
+        whole field), in `allowed` order; None when no projection was requested
+
+    Raises:
+        ValueError: If a field is not in `allowed`
+    """
+    if value is None or not value.strip():
+        return None
+
+    include, exclude = [], []
+    for token in value.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        name = token.lstrip('-')
+        field, _, subfield = name.partition('.')
+        if field not in allowed or (subfield and subfield not in (allowed[field] or ())):
+            raise ValueError(f"Unknown field '{name}'")
+        (exclude if token.startswith('-') else include).append((field, subfield or None))
+
+    projection = {}
+    for field, subfields in allowed.items():
+        keep = None
+        if include:
+            picked = [subfield for name, subfield in include if name == field]
+            if not picked:
+                continue
+            if None not in picked:
+                keep = [subfield for subfield in subfields if subfield in picked]
+        dropped = [subfield for name, subfield in exclude if name == field]
+        if None in dropped:
+            continue
+        if dropped:
+            keep = [subfield for subfield in (subfields if keep is None else keep) if subfield not in dropped]
+        projection[field] = None if keep is None else frozenset(keep)
+    return projection
+
+
+def project(data, projection):
+    """Apply a projection from `parse_fields` to a serialized object."""
+    if projection is None:
+        return data
+    result = {}
+    for field, subfields in projection.items():
+        value = data.get(field)
+        if subfields is not None and isinstance(value, dict):
+            value = {key: item for key, item in value.items() if key in subfields}
+        result[field] = value
+    return result
\ No newline at end of file
@@ -0,0 +1,55 @@
+# app/utils/http_cache.py
+import hashlib
+from datetime import timezone
+from flask import current_app, request
+from werkzeug.http import http_date
+
+DEFAULT_CACHE_CONTROL = 'private, no-cache'  # per-user data; clients must revalidate before reuse
+
+
+def strong_etag(*parts):
+    """
+    Build a strong ETag from the values that fully determine a representation.
+
+    Args:
+        parts: Values such as a resource name, IDs and modification timestamps
+
+    Returns:
+        str: Quoted ETag header value
+    """
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _to_http_time(value):
+    """Naive UTC datetimes (as stored) to aware UTC, truncated to HTTP-date precision."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def cache_headers(etag, last_modified=None, cache_control=None):
+    """
+    Validator and Cache-Control headers, for both the 200 and the 304 response.
+    Cache-Control defaults to the CACHE_CONTROL config entry of the current endpoint.
+    """
+    if cache_control is None:
+        cache_control = current_app.config.get('CACHE_CONTROL', {}).get(request.endpoint, DEFAULT_CACHE_CONTROL)
+    # Responses depend on the caller's token, so caches must key them by it
+    headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Authorization'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(_to_http_time(last_modified))
+    return headers
+
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Return True if the client's cached copy is still current, so the route can answer
+    304 without building the body. If-None-Match takes precedence over
+    If-Modified-Since, as HTTP requires.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag.strip('"'))
+    if last_modified is not None and request.if_modified_since is not None:
+        return _to_http_time(last_modified) <= request.if_modified_since
+    return False
\ No newline at end of file
@@ -0,0 +1,126 @@
+# app/utils/image_processing.py
+import hashlib
+import io
+import threading
+import time
+from collections import deque
+from app.utils.process_pool import BoundedProcessPool, PoolBusyError, latency_stats
+
+def render_variants(image_data, sizes, quality):
+    """
+    Build square JPEG variants of an uploaded image (runs in a pool worker).
+
+    The image is turned upright from its EXIF orientation, flattened onto white if
+    it has transparency, center-cropped to a square and resized to each size.
+
+    Args:
+        image_data: Encoded image bytes
+        sizes: Edge lengths in pixels, e.g. (300, 64)
+        quality: JPEG quality (1-95)
+
+    Returns:
+        dict: Size -> JPEG bytes
+    """
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(image_data))
+    # Let the JPEG decoder downscale by a power of two while staying above the largest size
+    image.draft('RGB', (max(sizes), max(sizes)))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        image = Image.new('RGB', rgba.size, (255, 255, 255))
+        image.paste(rgba, mask=rgba.getchannel('A'))
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    variants = {}
+    # Largest first, so each smaller variant is resized from the previous one
+    for size in sorted(sizes, reverse=True):
+        image = ImageOps.fit(image, (size, size), method=Image.LANCZOS, centering=(0.5, 0.5))
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=size >= 128)
+        variants[size] = buffer.getvalue()
+    return variants
+
+
+class ImageProcessor:
+    """
+    Turns uploaded profile pictures into the small JPEG variants that are stored,
+    so only derived images (a few tens of KB) are sent to Cloudinary instead of
+    the original of up to 5MB. PIL work runs in a dedicated, bounded process pool,
+    keeping decoding and resizing off the request threads; over-capacity calls
+    raise PoolBusyError, which routes turn into a 503.
+    """
+
+    def __init__(self):
+        self.pool = BoundedProcessPool('image-processing', max_workers=2, max_queue=16, preload=['PIL.Image'])
+        self.sizes = (300, 64)
+        self.quality = 85
+        self.timeout = 15.0
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)
+        self._count = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def init_app(self, app):
+        """Read variant sizes, JPEG quality and pool limits from the app config."""
+        sizes = app.config.get('PROFILE_PICTURE_SIZES', self.sizes)
+        if isinstance(sizes, str):
+            sizes = [int(size) for size in sizes.split(',') if size.strip()]
+        self.sizes = tuple(sorted(set(sizes), reverse=True))
+        self.quality = int(app.config.get('PROFILE_PICTURE_QUALITY', self.quality))
+        self.timeout = float(app.config.get('IMAGE_PROCESSING_TIMEOUT', self.timeout))
+        self.pool.configure(
+            max_workers=int(app.config.get('IMAGE_PROCESSING_WORKERS', self.pool.max_workers)),
+            max_queue=int(app.config.get('IMAGE_PROCESSING_MAX_QUEUE', self.pool.max_queue))
+        )
+        app.extensions['image_processor'] = self
+
+    def fingerprint(self, image_data):
+        """
+        Content hash of an image together with the rendering settings, so the
+        same picture rendered with other sizes or quality gets another hash.
+        """
+        digest = hashlib.sha256(f"{','.join(map(str, self.sizes))}:{self.quality}:".encode())
+        digest.update(image_data)
+        return digest.hexdigest()
+
+    def render(self, image_data):
+        """
+        Build the configured variants of an image.
+
+        Returns:
+            dict: Size -> JPEG bytes, largest first
+
+        Raises:
+            PoolBusyError: If the pool and its queue are full
+            PoolTimeoutError: If processing takes longer than the timeout (a PoolBusyError)
+            Exception: If PIL cannot decode the image
+        """
+        started = time.perf_counter()
+        variants = self.pool.run(render_variants, image_data, self.sizes, self.quality, timeout=self.timeout)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._latencies.append(elapsed)
+            self._count += 1
+            self._bytes_in += len(image_data)
+            self._bytes_out += sum(len(data) for data in variants.values())
+        return variants
+
+    def stats(self):
+        """Return processing latency (milliseconds), byte counts and pool limits."""
+        with self._lock:
+            return {
+                'sizes': list(self.sizes),
+                'quality': self.quality,
+                'pool': self.pool.stats(),
+                'count': self._count,
+                **latency_stats(self._latencies),
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out
+            }
+
+
+image_processor = ImageProcessor()
\ No newline at end of file
@@ -0,0 +1,95 @@
+# app/utils/image_validation.py
+from werkzeug.utils import secure_filename
+import binascii
+import io
+from app.utils.providers import providers
+
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # bytes, after decoding
+
+def validate_image_file(file):
+    """
+    Validate uploaded image file
+    
+    Args:
+        file: Uploaded file object
+        
+    Returns:
+        dict: Contains 'valid' boolean and 'error' message if invalid
+    """
+    if not file:
+        return {'valid': False, 'error': 'No file provided'}
+    
+    if not file.filename:
+        return {'valid': False, 'error': 'No file selected'}
+    
+    # Check file extension first
+    allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+    filename = secure_filename(file.filename.lower())
+    
+    if '.' not in filename:
+        return {'valid': False, 'error': 'Invalid file type. Only PNG, JPG, JPEG, GIF, and WebP are allowed'}
+    
+    file_extension = filename.rsplit('.', 1)[1].lower()
+    if file_extension not in allowed_extensions:
+        return {'valid': False, 'error': 'Invalid file type. Only PNG, JPG, JPEG, GIF, and WebP are allowed'}
+    
+    # Check file size (max 5MB)
+    file.seek(0, 2)  # Seek to end
+    file_size = file.tell()
+    file.seek(0)  # Reset to beginning
+    
+    if file_size > MAX_IMAGE_SIZE:  # 5MB limit
+        return {'valid': False, 'error': 'File size must be less than 5MB'}
+    
+    if file_size == 0:
+        return {'valid': False, 'error': 'File is empty'}
+    
+    try:
+        # Try to open with PIL to verify it's a valid image
+        image = providers.get('pil').open(file)
+        image.verify()
+        file.seek(0)  # Reset file pointer after verification
+        return {'valid': True}
+    except Exception as e:
+        return {'valid': False, 'error': 'Invalid image file or corrupted file'}
+
+def decode_base64_image(base64_string):
+    """
+    Decode a base64 image string, with or without a data URL prefix, into bytes.
+
+    The string is encoded to ASCII once and the prefix is skipped through a
+    memoryview, so the decoded image is the only full-size copy that is kept.
+
+    Raises:
+        ValueError: If the string is not ASCII or not valid base64
+    """
+    encoded = base64_string.encode('ascii')
+    start = encoded.find(b',') + 1 if encoded.startswith(b'data:image') else 0
+    return binascii.a2b_base64(memoryview(encoded)[start:])
+
+def validate_base64_image(base64_string):
+    """
+    Validate base64 image string
+
+    Args:
+        base64_string: Base64 encoded image string
+
+    Returns:
+        dict: Contains 'valid' boolean and 'error' message if invalid; if valid,
+            'image_data' holds the decoded bytes, ready for processing
+    """
+    try:
+        image_data = decode_base64_image(base64_string)
+
+        # Check size (max 5MB)
+        if len(image_data) > MAX_IMAGE_SIZE:
+            return {'valid': False, 'error': 'Image size must be less than 5MB'}
+
+        # Try to open with PIL (BytesIO shares the bytes instead of copying them)
+        image = providers.get('pil').open(io.BytesIO(image_data))
+        image.verify()
+
+        return {'valid': True, 'image_data': image_data}
+
+    except Exception as e:
+        return {'valid': False, 'error': 'Invalid base64 image data'}
\ No newline at end of file
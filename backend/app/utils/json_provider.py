@@ -0,0 +1,43 @@
+# app/utils/json_provider.py
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used without it
+    orjson = None
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed.
+
+    orjson serializes large list pages several times faster than the standard
+    library and writes bytes directly, skipping the str round trip. Types it does
+    not handle natively (dates, Decimal, dataclasses) go through Flask's usual
+    `default`, so responses look the same either way. Decoding is left to the
+    standard library.
+    """
+
+    def _orjson_options(self, pretty):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options(False)).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options(pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+    @staticmethod
+    def backend():
+        return 'orjson' if orjson is not None else 'json'
\ No newline at end of file
@@ -0,0 +1,458 @@
+# app/utils/media_pipeline.py
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.media_deletion import MediaDeletion
+from app.models.media_object import MediaObject
+from app.models.profile_picture_upload import ProfilePictureUpload
+from app.models.user import User
+from app.utils.media_storage import PROFILE_PICTURE_PREFIX, get_media_storage
+from app.utils.process_pool import PoolBusyError
+
+# How long a claimed deletion is hidden from other workers while the storage call runs
+DELETE_LEASE = timedelta(minutes=5)
+
+class MediaPipeline:
+    """
+    Background processing of profile pictures: uploads and deletions.
+
+    An accepted upload is recorded in `profile_picture_uploads` and its image bytes
+    go on a bounded in-memory queue, so the request returns at once with a pending
+    upload. A worker renders the variants, stores them (see app/utils/media_storage.py)
+    and points the user at them; if the user uploaded again meanwhile, the newest
+    completed upload wins. Stored variants are content-addressed: a `media_objects`
+    row per source image hash records them with a count of the references to them,
+    so uploading a picture that is already stored (by anyone) neither renders nor
+    transfers anything. An upload takes its reference (committed) as soon as it
+    finds or creates the object, so the object cannot be deleted under it.
+    The bytes only live in memory, so an upload interrupted by a restart is marked
+    failed after `upload_timeout` and the client uploads again.
+
+    Images to delete (pictures no user references any more, leftovers of failed
+    uploads) are rows in `media_deletions`, committed with the change that
+    orphaned them. A content-addressed image whose object has been referenced
+    again by the time its deletion runs is kept; the check and the object's removal
+    are one conditional DELETE, which serializes with an upload taking a reference.
+    Idle workers sweep the table and retry failed deletions with exponential
+    backoff and jitter, giving up after `delete_max_attempts`; a due row is
+    claimed with a conditional UPDATE, so processes sharing the database never
+    delete the same image twice at once. `flask media reconcile` finds stored
+    images that nothing references (e.g. from before this table existed).
+
+    Workers are started lazily in each process, as for the recommendation queue.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._queue = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._last_sweep = 0.0
+        self._counts = {'uploads_completed': 0, 'uploads_failed': 0, 'dedup_hits': 0, 'deleted': 0, 'delete_failures': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read pipeline settings from the app config and register the start hook."""
+        self.app = app
+        self.num_workers = int(app.config.get('MEDIA_WORKERS', 2))
+        self.max_queue_size = int(app.config.get('MEDIA_QUEUE_SIZE', 16))
+        self.poll_interval = float(app.config.get('MEDIA_POLL_INTERVAL', 5))
+        self.upload_timeout = int(app.config.get('MEDIA_UPLOAD_TIMEOUT', 300))
+        self.delete_max_attempts = int(app.config.get('MEDIA_DELETE_MAX_ATTEMPTS', 10))
+        self.delete_backoff = float(app.config.get('MEDIA_DELETE_BACKOFF', 30))
+        self.delete_max_backoff = float(app.config.get('MEDIA_DELETE_MAX_BACKOFF', 6 * 3600))
+        app.extensions['media_pipeline'] = self
+        app.before_request(self.ensure_started)
+
+    def ensure_started(self):
+        """Start the worker threads for this process if they are not running yet."""
+        if self.num_workers <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._queue = queue.Queue(maxsize=self.max_queue_size)
+            self._threads = []
+            for i in range(self.num_workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"media-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._pid = os.getpid()
+
+    def shutdown(self, timeout=None):
+        """Ask the worker threads to stop and wait for them to exit."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._pid = None
+
+    def submit_upload(self, user, image_data):
+        """
+        Accept a validated profile picture for background processing.
+        With MEDIA_WORKERS set to 0 the upload is processed inline instead.
+
+        Args:
+            user: User the picture is for
+            image_data: Encoded image bytes (already validated)
+
+        Returns:
+            ProfilePictureUpload: The committed upload record
+
+        Raises:
+            PoolBusyError: If the upload queue is full
+        """
+        if self.num_workers > 0:
+            self.ensure_started()
+            if self._queue.full():
+                raise PoolBusyError("Profile picture upload queue is full")
+
+        upload = ProfilePictureUpload(id=uuid.uuid4().hex, user_id=user.id, status='pending')
+        db.session.add(upload)
+        db.session.commit()
+
+        if self.num_workers <= 0:
+            self._process_upload(upload.id, image_data)
+        else:
+            try:
+                self._queue.put_nowait((upload.id, image_data))
+            except queue.Full:
+                upload.status = 'failed'
+                upload.error = "Upload queue is full"
+                upload.finished_at = datetime.utcnow()
+                db.session.commit()
+                raise PoolBusyError("Profile picture upload queue is full")
+        db.session.refresh(upload)
+        return upload
+
+    def schedule_deletions(self, public_ids):
+        """
+        Add deletions of stored images to the current session.
+        The caller commits them together with the change that orphaned the images
+        and then calls `wake`.
+        """
+        public_ids = set(public_ids)
+        if not public_ids:
+            return
+        existing = {
+            public_id for (public_id,) in
+            db.session.query(MediaDeletion.public_id).filter(MediaDeletion.public_id.in_(public_ids))
+        }
+        db.session.add_all([MediaDeletion(public_id=public_id) for public_id in public_ids - existing])
+
+    def wake(self):
+        """Have a worker process due deletions now instead of at its next idle sweep."""
+        if self.num_workers <= 0:
+            self.process_deletions()
+            return
+        self.ensure_started()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # the workers are busy and sweep between uploads anyway
+
+    def set_profile_picture(self, user, media):
+        """
+        Point a user's profile picture at a media object, in the current session,
+        releasing the previous picture. The caller must hold a reference to `media`
+        (see `_acquire_media`), which becomes the user's. The caller commits and
+        then calls `wake`.
+        """
+        self.clear_profile_picture(user)
+        largest = media.variants[max(media.variants, key=int)]
+        user.profile_picture_url = largest['url']
+        user.profile_picture_public_id = largest['public_id']
+        user.profile_picture_variants = media.variants
+        user.profile_picture_media_id = media.id
+
+    def clear_profile_picture(self, user):
+        """
+        Remove a user's profile picture, in the current session. Its images are
+        scheduled for deletion once no user references them any more. The caller
+        commits and then calls `wake`.
+        """
+        if user.profile_picture_media_id is not None:
+            self._release_media(user.profile_picture_media_id)
+        else:
+            # Pictures stored before media objects existed belong to this user alone
+            self.schedule_deletions(user.profile_picture_public_ids())
+        user.profile_picture_url = None
+        user.profile_picture_public_id = None
+        user.profile_picture_variants = None
+        user.profile_picture_media_id = None
+
+    def _add_reference(self, media_id):
+        """Take a reference to a media object and commit it. Returns False if the object no longer exists."""
+        added = MediaObject.query.filter_by(id=media_id).update(
+            {'refcount': MediaObject.refcount + 1}, synchronize_session=False
+        )
+        db.session.commit()
+        return added == 1
+
+    def _release_media(self, media_id):
+        """
+        Drop a reference to a media object, in the current session, scheduling its
+        images for deletion when it was the last one. The caller commits.
+        """
+        MediaObject.query.filter_by(id=media_id).update(
+            {'refcount': MediaObject.refcount - 1}, synchronize_session=False
+        )
+        media = db.session.get(MediaObject, media_id, populate_existing=True)
+        if media is None:
+            self.app.logger.warning(f"Media object {media_id} was already deleted")
+        elif media.refcount <= 0:
+            self.schedule_deletions(media.public_ids())
+
+    def process_deletions(self, limit=50):
+        """
+        Delete the images whose deletion is due, rescheduling failures with backoff.
+
+        Returns:
+            int: Number of images deleted
+        """
+        storage = get_media_storage()
+        now = datetime.utcnow()
+        due = db.session.query(MediaDeletion.id, MediaDeletion.next_attempt_at).filter(
+            MediaDeletion.status == 'pending',
+            MediaDeletion.next_attempt_at <= now
+        ).order_by(MediaDeletion.next_attempt_at.asc()).limit(limit).all()
+
+        deleted = 0
+        for deletion_id, next_attempt_at in due:
+            # Lease the row, so no other worker or process picks it up while we call the storage
+            claimed = MediaDeletion.query.filter_by(id=deletion_id, next_attempt_at=next_attempt_at).update(
+                {'next_attempt_at': now + DELETE_LEASE}, synchronize_session=False
+            )
+            db.session.commit()
+            if not claimed:
+                continue
+
+            deletion = db.session.get(MediaDeletion, deletion_id)
+            digest = MediaObject.digest_of_key(deletion.public_id)
+            media = MediaObject.query.filter_by(digest=digest).first() if digest is not None else None
+            if media is not None and deletion.public_id in media.public_ids():
+                # The image still belongs to a media object: remove the object while nobody references
+                # it (an upload taking a reference waits for this row, or makes the DELETE miss), or keep
+                # the image if somebody uses it again. Images of an object already removed, or of an
+                # earlier object with the same digest, are unreferenced and deleted below.
+                removed = MediaObject.query.filter_by(id=media.id, refcount=0).delete(synchronize_session=False)
+                if not removed:
+                    db.session.delete(deletion)
+                    db.session.commit()
+                    continue
+
+            if storage.delete(deletion.public_id):
+                db.session.delete(deletion)
+                deleted += 1
+                self._count('deleted')
+            else:
+                deletion.attempts += 1
+                deletion.last_error = "Storage delete failed"
+                if deletion.attempts >= self.delete_max_attempts:
+                    deletion.status = 'failed'
+                    self.app.logger.error(f"Giving up deleting {deletion.public_id} after {deletion.attempts} attempts")
+                else:
+                    delay = min(self.delete_max_backoff, self.delete_backoff * 2 ** (deletion.attempts - 1))
+                    deletion.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.5, 1.0))
+                self._count('delete_failures')
+            db.session.commit()
+        return deleted
+
+    def stats(self):
+        """Return worker, queue depth and outcome counters for monitoring."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'workers': len(self._threads),
+            'queue_size': self._queue.qsize() if self._queue else 0,
+            'max_queue_size': self.max_queue_size,
+            **counts
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                self._sweep()
+                continue
+
+            try:
+                if item is None:
+                    self._sweep(force=True)
+                else:
+                    self._process_upload(*item)
+            except Exception as e:
+                self.app.logger.error(f"Media worker crashed: {e}")
+            finally:
+                item = None  # drop the image bytes before waiting for the next item
+                self._queue.task_done()
+            # Keep deletions moving while uploads keep the queue busy
+            if time.monotonic() - self._last_sweep >= self.poll_interval:
+                self._sweep()
+
+    def _sweep(self, force=False):
+        """Fail uploads interrupted by a restart and process due deletions."""
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            if not force and time.monotonic() - self._last_sweep < self.poll_interval:
+                return
+            self._last_sweep = time.monotonic()
+            with self.app.app_context():
+                stale_before = datetime.utcnow() - timedelta(seconds=self.upload_timeout)
+                ProfilePictureUpload.query.filter(
+                    ProfilePictureUpload.status.in_(('pending', 'processing')),
+                    ProfilePictureUpload.created_at < stale_before
+                ).update({
+                    'status': 'failed',
+                    'error': "Upload was interrupted, please try again",
+                    'finished_at': datetime.utcnow()
+                }, synchronize_session=False)
+                db.session.commit()
+                self.process_deletions()
+        except Exception as e:
+            self.app.logger.error(f"Media sweep failed: {e}")
+        finally:
+            self._sweep_lock.release()
+
+    def _process_upload(self, upload_id, image_data):
+        from app.utils.image_processing import image_processor
+
+        with self.app.app_context():
+            claimed = ProfilePictureUpload.query.filter_by(id=upload_id, status='pending').update(
+                {'status': 'processing'}, synchronize_session=False
+            )
+            db.session.commit()
+            if not claimed:
+                return
+
+            upload = db.session.get(ProfilePictureUpload, upload_id)
+            media_id = None
+            try:
+                # The same picture (with the same rendering settings) is stored once and shared
+                media = self._acquire_media(image_processor.fingerprint(image_data), image_data)
+                media_id = media.id
+
+                user = db.session.get(User, upload.user_id)
+                newer = ProfilePictureUpload.query.filter(
+                    ProfilePictureUpload.user_id == upload.user_id,
+                    ProfilePictureUpload.status == 'completed',
+                    ProfilePictureUpload.created_at > upload.created_at
+                ).first()
+                if user is None or newer is not None:
+                    # A later upload already replaced the picture: this one is never shown
+                    upload.status = 'superseded'
+                    self._release_media(media_id)
+                else:
+                    self.set_profile_picture(user, media)
+                    upload.status = 'completed'
+                upload.error = None
+                upload.finished_at = datetime.utcnow()
+                db.session.commit()
+                media_id = None
+                self._count('uploads_completed')
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.error(f"Profile picture upload {upload_id} failed: {e}")
+                upload = db.session.get(ProfilePictureUpload, upload_id)
+                upload.status = 'failed'
+                upload.error = str(e)
+                upload.finished_at = datetime.utcnow()
+                if media_id is not None:
+                    # Give back the reference this upload took; the images go if nobody else uses them
+                    self._release_media(media_id)
+                db.session.commit()
+                self._count('uploads_failed')
+            self.wake()
+
+    def _acquire_media(self, digest, image_data, attempts=3):
+        """
+        Return the media object for a picture, with a committed reference taken for
+        the caller, rendering and storing the picture first if it is not stored yet.
+
+        The object found by the lookup may be deleted (its last user having left it)
+        before the reference is taken; the picture is then stored again, under new
+        keys, so pending deletions of the old images cannot touch the new ones.
+
+        Raises:
+            Exception: If rendering or storing fails (images already stored are
+                scheduled for deletion)
+        """
+        from app.utils.image_processing import image_processor
+
+        for _ in range(attempts):
+            media = MediaObject.query.filter_by(digest=digest).first()
+            if media is not None:
+                if self._add_reference(media.id):
+                    self._count('dedup_hits')
+                    return media
+                continue
+
+            storage = get_media_storage()
+            nonce = uuid.uuid4().hex[:12]
+            stored = {}
+            try:
+                for size, data in image_processor.render(image_data).items():
+                    key = f"{PROFILE_PICTURE_PREFIX}{digest}_{nonce}_{size}"
+                    stored[str(size)] = {'url': storage.put(key, data), 'public_id': key}
+                media = MediaObject(digest=digest, variants=stored, refcount=1)
+                db.session.add(media)
+                db.session.commit()
+                return media
+            except IntegrityError:
+                # Another worker stored the same picture at the same time: use theirs
+                db.session.rollback()
+                self.schedule_deletions(variant['public_id'] for variant in stored.values())
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self.schedule_deletions(variant['public_id'] for variant in stored.values())
+                db.session.commit()
+                raise
+        raise Exception("Profile picture could not be stored, please try again")
+
+
+def find_orphaned_pictures(older_than):
+    """
+    List stored profile pictures that no user references and no deletion is pending for.
+
+    Args:
+        older_than: Only consider images created before this (naive UTC) datetime,
+            so uploads still in flight are not reported
+
+    Returns:
+        list: public_ids of the orphaned images
+    """
+    referenced = set()
+    for public_id, variants in db.session.query(User.profile_picture_public_id, User.profile_picture_variants).filter(
+        User.profile_picture_public_id.isnot(None)
+    ):
+        referenced.add(public_id)
+        referenced.update(variant['public_id'] for variant in (variants or {}).values())
+    for (variants,) in db.session.query(MediaObject.variants).filter(MediaObject.refcount > 0):
+        referenced.update(variant['public_id'] for variant in variants.values())
+    referenced.update(public_id for (public_id,) in db.session.query(MediaDeletion.public_id))
+
+    return [
+        public_id for public_id, created_at in get_media_storage().list(PROFILE_PICTURE_PREFIX)
+        if created_at < older_than and public_id not in referenced
+    ]
+
+
+media_pipeline = MediaPipeline()
\ No newline at end of file
@@ -0,0 +1,196 @@
+# app/utils/media_storage.py
+import os
+import threading
+from datetime import datetime
+from flask import current_app, send_from_directory
+from app.utils.providers import providers
+
+# Storage key prefix of profile pictures (keys are "<prefix><content hash>_<size>")
+PROFILE_PICTURE_PREFIX = 'avyna/profile_pictures/'
+
+class CloudinaryStorage:
+    """
+    Stores images in Cloudinary, with the storage key as public_id.
+
+    The SDK is imported and configured once per process, on first use, instead of
+    on every call.
+    """
+
+    name = 'cloudinary'
+
+    def __init__(self, cloud_name, api_key, api_secret):
+        self._credentials = {'cloud_name': cloud_name, 'api_key': api_key, 'api_secret': api_secret}
+        self._lock = threading.Lock()
+        self._sdk = None
+        self.puts = 0
+        self.deletes = 0
+        self.bytes_stored = 0
+
+    def _get_sdk(self):
+        if self._sdk is not None:
+            return self._sdk
+        with self._lock:
+            if self._sdk is None:
+                cloudinary = providers.get('cloudinary')
+                cloudinary.config(secure=True, **self._credentials)
+                self._sdk = cloudinary
+            return self._sdk
+
+    def put(self, key, data):
+        """
+        Store image bytes under `key` (replacing any image stored there) and return its URL.
+
+        Raises:
+            Exception: If the upload fails
+        """
+        result = self._get_sdk().uploader.upload(data, public_id=key, overwrite=True, resource_type='image')
+        self.puts += 1
+        self.bytes_stored += len(data)
+        return result['secure_url']
+
+    def delete(self, key):
+        """
+        Delete the image stored under `key`.
+
+        Returns:
+            bool: True if it is gone (including when it did not exist), False if the call failed
+        """
+        try:
+            result = self._get_sdk().uploader.destroy(key)
+        except Exception as e:
+            current_app.logger.error(f"Cloudinary delete of {key} failed: {e}")
+            return False
+        self.deletes += 1
+        return result.get('result') in ('ok', 'not found')
+
+    def list(self, prefix):
+        """
+        List the stored images whose key starts with `prefix`, page by page.
+
+        Yields:
+            tuple: (key, created_at as a naive UTC datetime)
+        """
+        cloudinary = self._get_sdk()
+        cursor = None
+        while True:
+            options = {'next_cursor': cursor} if cursor else {}
+            page = cloudinary.api.resources(type='upload', resource_type='image', prefix=prefix, max_results=500, **options)
+            for resource in page.get('resources', []):
+                yield resource['public_id'], datetime.strptime(resource['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+            cursor = page.get('next_cursor')
+            if not cursor:
+                break
+
+    def stats(self):
+        return {'backend': self.name, 'puts': self.puts, 'deletes': self.deletes, 'bytes_stored': self.bytes_stored}
+
+
+class LocalStorage:
+    """
+    Stores images as files under a local directory, for tests, development and
+    deployments without access to Cloudinary. The app serves them at `base_url`.
+    Files are written to a temporary name and renamed, so a reader never sees a
+    partial image.
+    """
+
+    name = 'local'
+
+    def __init__(self, root, base_url='/media'):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/')
+        self.puts = 0
+        self.deletes = 0
+        self.bytes_stored = 0
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root, f"{key}.jpg"))
+        if not path.startswith(os.path.abspath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put(self, key, data):
+        """Store image bytes under `key` (replacing any image stored there) and return its URL."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+        self.puts += 1
+        self.bytes_stored += len(data)
+        return f"{self.base_url}/{key}.jpg"
+
+    def delete(self, key):
+        """Delete the image stored under `key`. Returns True once it is gone."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            current_app.logger.error(f"Local delete of {key} failed: {e}")
+            return False
+        self.deletes += 1
+        return True
+
+    def list(self, prefix):
+        """
+        List the stored images whose key starts with `prefix`.
+
+        Yields:
+            tuple: (key, modification time as a naive UTC datetime)
+        """
+        directory = os.path.join(self.root, os.path.dirname(prefix))
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if not filename.endswith('.jpg'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                key = os.path.relpath(path, self.root)[:-len('.jpg')].replace(os.sep, '/')
+                if key.startswith(prefix):
+                    yield key, datetime.utcfromtimestamp(os.path.getmtime(path))
+
+    def serve(self, filename):
+        """View serving stored files at `base_url`."""
+        return send_from_directory(self.root, filename, max_age=365 * 24 * 3600)
+
+    def stats(self):
+        return {'backend': self.name, 'puts': self.puts, 'deletes': self.deletes, 'bytes_stored': self.bytes_stored}
+
+
+def create_media_storage(config, instance_path):
+    """
+    Build the storage backend selected by the MEDIA_STORAGE config value.
+
+    Args:
+        config: Flask config mapping
+        instance_path: App instance folder, the default root of local storage
+
+    Returns:
+        CloudinaryStorage or LocalStorage instance
+    """
+    backend = (config.get('MEDIA_STORAGE') or 'cloudinary').lower()
+    if backend == 'cloudinary':
+        return CloudinaryStorage(
+            cloud_name=config.get('CLOUDINARY_CLOUD_NAME'),
+            api_key=config.get('CLOUDINARY_API_KEY'),
+            api_secret=config.get('CLOUDINARY_API_SECRET')
+        )
+    if backend == 'local':
+        return LocalStorage(
+            root=config.get('MEDIA_LOCAL_ROOT') or os.path.join(instance_path, 'media'),
+            base_url=config.get('MEDIA_LOCAL_URL') or '/media'
+        )
+    raise ValueError(f"Unknown MEDIA_STORAGE: {backend}")
+
+
+def init_media_storage(app):
+    """Create the process-wide media storage and attach it to the app (local storage also gets a serving route)."""
+    storage = create_media_storage(app.config, app.instance_path)
+    app.extensions['media_storage'] = storage
+    if isinstance(storage, LocalStorage) and storage.base_url.startswith('/'):
+        app.add_url_rule(f"{storage.base_url}/<path:filename>", 'media_file', storage.serve)
+
+
+def get_media_storage():
+    """Return the media storage for the current application."""
+    return current_app.extensions['media_storage']
\ No newline at end of file
@@ -0,0 +1,67 @@
+# app/utils/pagination.py
+import base64
+import json
+from datetime import date
+from sqlalchemy import tuple_
+
+def encode_cursor(log_date, log_id, sort_order):
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    Args:
+        log_date: Date of the last row on the page
+        log_id: ID of the last row on the page
+        sort_order: 'asc' or 'desc' (cursors are only valid for the order they were built for)
+
+    Returns:
+        str: Base64url-encoded cursor
+    """
+    payload = json.dumps({'d': log_date.isoformat(), 'i': log_id, 's': sort_order}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_order):
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: Cursor string from the client (an empty string means the first page)
+        sort_order: Sort order of the current request
+
+    Returns:
+        tuple: (date, id), or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed or was built for another sort order
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        position = (date.fromisoformat(payload['d']), int(payload['i']))
+        cursor_sort = payload['s']
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort_order:
+        raise ValueError("Cursor does not match the requested sort order")
+    return position
+
+
+def keyset_filter(date_column, id_column, position, sort_order):
+    """
+    Build the WHERE clause selecting rows strictly after a (date, id) position.
+
+    Args:
+        date_column: Date column the listing is ordered by
+        id_column: ID column used as a tie-breaker
+        position: (date, id) tuple returned by `decode_cursor`
+        sort_order: 'asc' or 'desc'
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    columns = tuple_(date_column, id_column)
+    if sort_order == 'asc':
+        return columns > tuple_(*position)
+    return columns < tuple_(*position)
\ No newline at end of file
@@ -0,0 +1,67 @@
+# app/utils/password_hashing.py
+import threading
+import time
+from collections import deque
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.process_pool import BoundedProcessPool, PoolBusyError, latency_stats
+
+class PasswordHasher:
+    """
+    Runs PBKDF2 hashing and verification in a dedicated, bounded process pool,
+    so login/register storms cannot starve request workers of CPU. Over-capacity
+    calls raise PoolBusyError, which routes turn into a 503.
+
+    The hash method (and so its cost) comes from PASSWORD_HASH_METHOD; hashes made
+    with another method are reported by `needs_rehash` and upgraded on next login.
+    """
+
+    def __init__(self):
+        self.pool = BoundedProcessPool('password-hashing', preload=['werkzeug.security'])
+        self.method = 'pbkdf2:sha256:600000'
+        self.timeout = 10.0
+        self._lock = threading.Lock()
+        self._latencies = {'hash': deque(maxlen=500), 'verify': deque(maxlen=500)}
+        self._counts = {'hash': 0, 'verify': 0}
+
+    def init_app(self, app):
+        """Read the hash method and pool limits from the app config."""
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.timeout = float(app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout))
+        self.pool.configure(
+            max_workers=int(app.config.get('PASSWORD_HASH_WORKERS', self.pool.max_workers)),
+            max_queue=int(app.config.get('PASSWORD_HASH_MAX_QUEUE', self.pool.max_queue))
+        )
+        app.extensions['password_hasher'] = self
+
+    def _timed(self, operation, fn, *args):
+        started = time.perf_counter()
+        result = self.pool.run(fn, *args, timeout=self.timeout)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._latencies[operation].append(elapsed)
+            self._counts[operation] += 1
+        return result
+
+    def hash(self, password):
+        """Hash a password with the configured method."""
+        return self._timed('hash', generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash."""
+        return self._timed('verify', check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Return True if the hash was made with a different method or cost than configured."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def stats(self):
+        """Return per-operation latency metrics (milliseconds) and pool limits."""
+        with self._lock:
+            operations = {
+                operation: dict(count=self._counts[operation], **latency_stats(samples))
+                for operation, samples in self._latencies.items()
+            }
+        return {'method': self.method, 'pool': self.pool.stats(), 'operations': operations}
+
+
+password_hasher = PasswordHasher()
\ No newline at end of file
@@ -0,0 +1,123 @@
+# app/utils/process_pool.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import jsonify
+
+class PoolBusyError(Exception):
+    """Raised when a bounded pool already has its maximum number of pending tasks."""
+
+
+class PoolTimeoutError(PoolBusyError):
+    """Raised when a pool task does not finish in time (the pool is overloaded, so it is a PoolBusyError)."""
+
+
+class BoundedProcessPool:
+    """
+    Process pool with a cap on in-flight work.
+
+    At most `max_workers` tasks run at once and at most `max_queue` more wait;
+    further submissions fail fast with PoolBusyError instead of piling up. The
+    executor is created lazily in each process (so it is safe with pre-fork
+    servers) and uses the 'forkserver' start method, since forking a multi-threaded
+    web worker is unsafe: pool workers are forked from a small single-threaded
+    server process with `preload` modules already imported. As with 'spawn', the
+    main script must guard its entry point with `if __name__ == '__main__'`.
+    With `max_workers` set to 0, tasks run inline.
+    """
+
+    def __init__(self, name, max_workers=None, max_queue=64, preload=()):
+        self.name = name
+        self.preload = list(preload)
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, self.max_workers) + max_queue)
+        self.rejected = 0
+        self.timed_out = 0
+
+    def configure(self, max_workers, max_queue):
+        """Resize the pool; takes effect for executors created afterwards."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max(1, max_workers) + max_queue)
+
+    def _get_executor(self):
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(self.preload)
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                self._pid = os.getpid()
+            return self._executor
+
+    def run(self, fn, *args, timeout=None):
+        """
+        Run `fn(*args)` in the pool and wait for its result.
+
+        Raises:
+            PoolBusyError: If the pool and its queue are full
+            PoolTimeoutError: If the result is not ready within `timeout` (a
+                PoolBusyError, so callers answer both with the same 503)
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PoolBusyError(f"{self.name} pool is busy")
+
+        if self.max_workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # Free the slot when the task really finishes, even if the caller timed out
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()  # drops the task if it has not started yet
+            self.timed_out += 1
+            raise PoolTimeoutError(f"{self.name} pool did not finish the task within {timeout}s")
+
+    def stats(self):
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out
+        }
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._pid = None
+
+
+def latency_stats(samples):
+    """Summarize latency samples (milliseconds) as average, 95th percentile and maximum."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {'avg_ms': None, 'p95_ms': None, 'max_ms': None}
+    return {
+        'avg_ms': round(sum(ordered) / len(ordered), 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        'max_ms': round(ordered[-1], 2)
+    }
+
+
+def pool_busy_response():
+    """Standard 503 response for when a process pool is saturated (PoolBusyError)."""
+    response = jsonify({"error": "Server is busy, please try again shortly"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
\ No newline at end of file
@@ -0,0 +1,83 @@
+# app/utils/providers.py
+import importlib
+import threading
+import time
+
+class ProviderRegistry:
+    """
+    Lazily-imported third-party SDKs (Gemini, OpenAI, Cloudinary, Pillow).
+
+    Importing these SDKs takes up to a second, so modules and routes ask the
+    registry for them at the point of use instead of importing them at the top of
+    the file. Each provider is imported on its first `get` (once per process, guarded
+    by a lock), or up front during `warm_up`. With the PROVIDER_WARMUP config value
+    set, `init_app` warms the listed providers in `create_app`, so under a preloading
+    server they are imported once in the master and shared by all workers.
+    """
+
+    def __init__(self):
+        self._modules = {}
+        self._loaded = {}
+        self._load_ms = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, module, *extra_modules):
+        """
+        Register a provider.
+
+        Args:
+            name: Provider name used with `get`
+            module: Module returned by `get`
+            extra_modules: Submodules that must be imported alongside it
+        """
+        self._modules[name] = (module,) + extra_modules
+
+    def get(self, name):
+        """
+        Return the provider's module, importing it on first use.
+
+        Raises:
+            KeyError: If no provider is registered under `name`
+            ImportError: If the SDK is not installed
+        """
+        module = self._loaded.get(name)
+        if module is not None:
+            return module
+        with self._lock:
+            if name not in self._loaded:
+                started = time.perf_counter()
+                modules = [importlib.import_module(m) for m in self._modules[name]]
+                self._load_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+                self._loaded[name] = modules[0]
+            return self._loaded[name]
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def warm_up(self, names=None):
+        """Import the given providers (all registered ones by default) ahead of first use."""
+        for name in (self._modules if names is None else names):
+            self.get(name)
+
+    def init_app(self, app):
+        """Warm up the providers listed in PROVIDER_WARMUP ('all', or comma-separated names)."""
+        warmup = (app.config.get('PROVIDER_WARMUP') or '').strip()
+        if warmup == 'all':
+            self.warm_up()
+        elif warmup:
+            self.warm_up([name.strip() for name in warmup.split(',') if name.strip()])
+        app.extensions['providers'] = self
+
+    def stats(self):
+        """Return which providers are loaded and how long each import took."""
+        return {
+            name: {'loaded': name in self._loaded, 'load_ms': self._load_ms.get(name)}
+            for name in self._modules
+        }
+
+
+providers = ProviderRegistry()
+providers.register('gemini', 'google.generativeai')
+providers.register('openai', 'openai')
+providers.register('cloudinary', 'cloudinary', 'cloudinary.uploader', 'cloudinary.api')
+providers.register('pil', 'PIL.Image')
\ No newline at end of file
@@ -0,0 +1,80 @@
+# app/utils/rate_limit.py
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added continuously at `rate` per second up to `capacity`, so short
+    bursts of up to `capacity` calls go through at once while the long-run average
+    stays at `rate`. Each call takes one token (or more, for weighted calls).
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.throttled = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take `tokens` if they are available now. Returns False (and takes nothing) otherwise."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.granted += 1
+                return True
+            self.throttled += 1
+            return False
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Take `tokens`, waiting for them to accumulate if needed.
+
+        Args:
+            tokens: Number of tokens to take (at most `capacity`)
+            timeout: Maximum seconds to wait, or None to wait as long as needed
+
+        Returns:
+            bool: True once the tokens were taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.granted += 1
+                    return True
+                if not waited:
+                    self.throttled += 1
+                    waited = True
+                delay = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                if now >= deadline:
+                    return False
+                delay = min(delay, deadline - now)
+            time.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'tokens': round(self._tokens, 2),
+                'granted': self.granted,
+                'throttled': self.throttled
+            }
\ No newline at end of file
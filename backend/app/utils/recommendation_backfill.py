@@ -0,0 +1,239 @@
+# app/utils/recommendation_backfill.py
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.symptom_log import SymptomLog
+from app.models.user import User
+from app.utils.pagination import keyset_filter
+from app.utils.rate_limit import TokenBucket
+
+def backfill_candidates(include_fallback=False, user_id=None):
+    """
+    Query (user_id, log_id) of the logs that need a recommendation, in (user_id, id) order.
+
+    Args:
+        include_fallback: Also select logs whose recommendation is rule-based fallback content
+        user_id: Only this user's logs
+    """
+    query = db.session.query(SymptomLog.user_id, SymptomLog.id).outerjoin(
+        AIRecommendation, AIRecommendation.log_id == SymptomLog.id
+    )
+    missing = AIRecommendation.id.is_(None)
+    query = query.filter(or_(missing, AIRecommendation.source == 'fallback') if include_fallback else missing)
+    if user_id:
+        query = query.filter(SymptomLog.user_id == user_id)
+    return query.order_by(SymptomLog.user_id.asc(), SymptomLog.id.asc())
+
+
+class BackfillCheckpoint:
+    """
+    Resume position of a backfill, kept in a small JSON file.
+
+    The position is the last (user_id, log_id) up to which every log has been
+    handled. The file is replaced atomically, so an interrupted write never leaves
+    a corrupt checkpoint.
+    """
+
+    def __init__(self, path, include_fallback):
+        self.path = path
+        self.include_fallback = include_fallback
+
+    def load(self):
+        """Return the saved (user_id, log_id) position, or None to start from the beginning."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get('include_fallback') != self.include_fallback:
+            return None
+        return data['user_id'], data['log_id']
+
+    def save(self, position, processed):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({
+                'user_id': position[0],
+                'log_id': position[1],
+                'include_fallback': self.include_fallback,
+                'processed': processed,
+                'updated_at': datetime.utcnow().isoformat()
+            }, f)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RecommendationBackfill:
+    """
+    Generates recommendations for logs that have none (or only fallback content).
+
+    Candidate logs are read in keyset pages of `chunk_size` rows, so memory stays
+    flat and no long-lived read transaction is held while workers write. Logs are
+    grouped per user (up to `batch_size` logs, one batched prompt per group) and
+    handed to a pool of `workers` threads; model calls are throttled by a token
+    bucket of `rate` prompts per second. The checkpoint only advances past a group
+    once it and every group before it are done, so a restarted run repeats at most
+    the groups that were in flight.
+    """
+
+    def __init__(self, app, workers=4, rate=1.0, burst=None, batch_size=5, include_fallback=False,
+                 checkpoint_path=None, chunk_size=500, report_interval=10.0, echo=print):
+        self.app = app
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate, burst if burst is not None else self.workers)
+        self.batch_size = max(1, batch_size)
+        self.include_fallback = include_fallback
+        self.checkpoint = BackfillCheckpoint(
+            checkpoint_path or os.path.join(app.instance_path, 'recommendation_backfill.json'), include_fallback
+        )
+        self.chunk_size = chunk_size
+        self.report_interval = report_interval
+        self.echo = echo
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def run(self, user_id=None, limit=None, restart=False):
+        """
+        Run the backfill to completion (or until `limit` logs were submitted).
+
+        Returns:
+            Counter: Logs per outcome ('ai', 'cache', 'fallback', 'skipped', 'error')
+        """
+        if restart:
+            self.checkpoint.clear()
+        position = self.checkpoint.load()
+        if position:
+            self.echo(f"Resuming after user {position[0]}, log {position[1]} ({self.checkpoint.path})")
+
+        with self.app.app_context():
+            query = backfill_candidates(self.include_fallback, user_id)
+            if position:
+                query = query.filter(keyset_filter(SymptomLog.user_id, SymptomLog.id, position, 'asc'))
+            total = query.order_by(None).count()
+        if limit is not None:
+            total = min(total, limit)
+        self.echo(f"{total} logs to backfill with {self.workers} workers, "
+                  f"{self.bucket.rate:g} prompts/s, up to {self.batch_size} logs per prompt")
+
+        self._started = time.monotonic()
+        self._last_report = self._started
+        submitted = deque()
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        finished = True
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as executor:
+            try:
+                for group_user_id, log_ids in self._groups(user_id, position, limit):
+                    slots.acquire()
+                    future = executor.submit(self._run_group, group_user_id, log_ids)
+                    future.add_done_callback(lambda _: slots.release())
+                    submitted.append(((group_user_id, log_ids[-1]), len(log_ids), future))
+                    self._advance(submitted, total)
+            except KeyboardInterrupt:
+                finished = False
+                self.echo("Interrupted, waiting for in-flight groups...")
+                for _, _, future in submitted:
+                    future.cancel()
+        # Leaving the executor waits for the groups in flight; checkpoint past those that finished
+        self._advance(submitted, total)
+
+        if finished and limit is None:
+            self.checkpoint.clear()
+        self._report(total, final=True)
+        return self.counts
+
+    def _groups(self, user_id, position, limit):
+        """Yield (user_id, [log_id, ...]) groups of one user, reading candidates page by page."""
+        group_user_id, group = None, []
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+            with self.app.app_context():
+                query = backfill_candidates(self.include_fallback, user_id)
+                if position:
+                    query = query.filter(keyset_filter(SymptomLog.user_id, SymptomLog.id, position, 'asc'))
+                rows = query.limit(page_size).all()
+            if not rows:
+                break
+            if remaining is not None:
+                remaining -= len(rows)
+            position = (rows[-1][0], rows[-1][1])
+
+            for row_user_id, log_id in rows:
+                if group and (row_user_id != group_user_id or len(group) == self.batch_size):
+                    yield group_user_id, group
+                    group = []
+                group_user_id = row_user_id
+                group.append(log_id)
+            if len(rows) < page_size:
+                break
+        if group:
+            yield group_user_id, group
+
+    def _run_group(self, user_id, log_ids):
+        from app.routes.symptoms import generate_ai_recommendations_for_logs
+
+        with self.app.app_context():
+            logs = SymptomLog.query.options(joinedload(SymptomLog.recommendation)).filter(
+                SymptomLog.id.in_(log_ids)
+            ).order_by(SymptomLog.id.asc()).all()
+            # Skip logs that got a recommendation since they were listed (e.g. from the job queue)
+            logs = [
+                log for log in logs
+                if log.recommendation is None or (self.include_fallback and log.recommendation.source == 'fallback')
+            ]
+            user = db.session.get(User, user_id)
+            if not logs or user is None:
+                return {}
+            # Throttled by the backfill's own bucket instead of the users' plan limits
+            self.bucket.acquire()
+            return generate_ai_recommendations_for_logs(
+                logs, user, replace_fallback=self.include_fallback, rate_limit=False
+            )
+
+    def _advance(self, submitted, total):
+        """Collect finished groups from the front of the queue and move the checkpoint past them."""
+        position = None
+        while submitted and submitted[0][2].done() and not submitted[0][2].cancelled():
+            end, size, future = submitted.popleft()
+            error = future.exception()
+            with self._lock:
+                if error is not None:
+                    self.counts['error'] += size
+                    self.app.logger.error(f"Backfill group ending at log {end[1]} failed: {error}")
+                else:
+                    sources = future.result()
+                    self.counts.update(sources.values())
+                    self.counts['skipped'] += size - len(sources)
+            position = end
+        if position is not None:
+            self.checkpoint.save(position, sum(self.counts.values()))
+        if time.monotonic() - self._last_report >= self.report_interval:
+            self._report(total)
+
+    def _report(self, total, final=False):
+        self._last_report = time.monotonic()
+        elapsed = self._last_report - self._started
+        processed = sum(self.counts.values())
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, total - processed)
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else 'unknown'
+        outcomes = ', '.join(f"{key} {self.counts[key]}" for key in ('ai', 'cache', 'fallback', 'skipped', 'error'))
+        prefix = 'Done' if final else 'Progress'
+        self.echo(f"{prefix}: {processed}/{total} logs in {elapsed:.1f}s ({rate:.2f} logs/s"
+                  f"{'' if final else f', ETA {eta}'}) - {outcomes}")
\ No newline at end of file
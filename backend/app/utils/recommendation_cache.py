@@ -0,0 +1,79 @@
+# app/utils/recommendation_cache.py
+import hashlib
+from app.utils.ttl_cache import TTLCache
+
+def cycle_phase(cycle_day):
+    """Map a cycle day to its menstrual cycle phase (None if unknown)."""
+    if not cycle_day or cycle_day < 1:
+        return None
+    if cycle_day <= 5:
+        return 'menstrual'
+    if cycle_day <= 13:
+        return 'follicular'
+    if cycle_day <= 16:
+        return 'ovulatory'
+    return 'luteal'
+
+
+def age_band(age):
+    """Map an age to the bands build_personalized_prompt distinguishes."""
+    if not age:
+        return None
+    if age < 20:
+        return 'teen'
+    if age >= 40:
+        return '40+'
+    return 'adult'
+
+
+def _normalize_text(value):
+    return ' '.join(str(value).lower().split()) if value else ''
+
+
+def recommendation_fingerprint(log, user):
+    """
+    Build a cache key from the symptom log and profile inputs of the prompt.
+
+    Free-text fields are lowercased and whitespace-collapsed, symptoms are split on
+    ',' and ';' and sorted, the cycle day is reduced to its phase and the age to
+    its band, so logs that differ only in formatting share a key.
+
+    Args:
+        log: SymptomLog instance
+        user: User instance
+
+    Returns:
+        str: Hex digest identifying the recommendation inputs
+    """
+    symptoms = sorted({
+        s.strip() for s in _normalize_text(log.symptoms).replace(',', ';').split(';') if s.strip()
+    })
+    parts = [
+        _normalize_text(log.condition),
+        ';'.join(symptoms),
+        str(log.pain_level),
+        _normalize_text(log.mood),
+        str(cycle_phase(log.cycle_day)),
+        _normalize_text(log.notes),
+        str(user.has_pcos),
+        str(user.has_endometriosis),
+        str(age_band(user.age)),
+        str(user.subscription_plan),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class RecommendationCache(TTLCache):
+    """
+    LRU+TTL cache for parsed AI recommendations, keyed by recommendation_fingerprint.
+    A max size of 0 disables caching.
+    """
+
+    def init_app(self, app):
+        """Read the cache size and TTL from the app config."""
+        self.max_size = int(app.config.get('RECOMMENDATION_CACHE_SIZE', self.max_size))
+        self.ttl = float(app.config.get('RECOMMENDATION_CACHE_TTL', self.ttl))
+        app.extensions['recommendation_cache'] = self
+
+
+recommendation_cache = RecommendationCache()
\ No newline at end of file
@@ -0,0 +1,414 @@
+# app/utils/recommendation_queue.py
+import itertools
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, exists
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.recommendation_job import RecommendationJob
+from app.models.user import User
+from app.utils.ai_rate_limit import PLAN_PRIORITIES, LOWEST_PRIORITY
+
+class RecommendationQueue:
+    """
+    Bounded worker pool that generates AI recommendations in the background.
+
+    Jobs are persisted in the `recommendation_jobs` table, so the in-memory queue
+    only carries job IDs. Jobs that do not fit in the queue, or that were left
+    behind by a restarted process, are picked up again by idle workers sweeping
+    the table. A job is claimed with a conditional UPDATE, so the same job is
+    never run twice even when several processes share the database. Jobs created
+    together by a batch upload share a batch_id: the worker that claims one of
+    them works through the rest of the batch as well, claiming up to `batch_size`
+    jobs at a time and generating their recommendations with one batched prompt.
+
+    Jobs are dispatched by the subscription plan of their user (PLAN_PRIORITIES),
+    paid users first, and in arrival order within a plan. The sweep re-queues in
+    the same order, and a worker running a large batch hands the rest of it back
+    to the queue when higher-priority jobs are waiting.
+
+    Workers are started by each server process once it is running (Gunicorn's
+    post_fork hook, run.py), so jobs left behind by a restart are picked up without
+    waiting for a request; other processes start them on their first request or
+    enqueue. The Gunicorn master and CLI commands stay free of stray threads. A job
+    whose worker stalls or dies is re-queued by the sweep after job_timeout, and
+    failed once it has used up max_attempts.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._queue = None
+        self._sequence = itertools.count()  # tie-break: FIFO within a priority
+        self._threads = []
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read queue settings from the app config and register the start hook."""
+        self.app = app
+        self.num_workers = int(app.config.get('RECOMMENDATION_WORKERS', 2))
+        self.max_queue_size = int(app.config.get('RECOMMENDATION_QUEUE_SIZE', 100))
+        self.max_attempts = int(app.config.get('RECOMMENDATION_MAX_ATTEMPTS', 3))
+        self.poll_interval = float(app.config.get('RECOMMENDATION_POLL_INTERVAL', 5))
+        self.job_timeout = int(app.config.get('RECOMMENDATION_JOB_TIMEOUT', 300))
+        self.batch_size = max(1, int(app.config.get('RECOMMENDATION_BATCH_SIZE', 5)))
+        app.extensions['recommendation_queue'] = self
+        app.before_request(self.ensure_started)
+
+    def ensure_started(self):
+        """Start the worker threads for this process if they are not running yet."""
+        if self.num_workers <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._queue = queue.PriorityQueue(maxsize=self.max_queue_size)
+            self._threads = []
+            for i in range(self.num_workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"recommendation-worker-{i}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._pid = os.getpid()
+
+    def shutdown(self, timeout=None):
+        """Ask the worker threads to stop and wait for them to exit."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._pid = None
+
+    def create_job(self, log):
+        """
+        Add a queued job for a symptom log to the current session.
+        The caller commits it together with the log and then calls `enqueue`.
+
+        Args:
+            log: SymptomLog instance (already flushed so it has an ID)
+
+        Returns:
+            RecommendationJob: The new job
+        """
+        job = RecommendationJob(log_id=log.id, user_id=log.user_id, status='queued')
+        db.session.add(job)
+        return job
+
+    def create_batch_jobs(self, logs, batch_id):
+        """
+        Add queued jobs for several symptom logs, coalesced under one batch_id.
+        The caller commits and then enqueues any one of them (see `enqueue`).
+
+        Args:
+            logs: SymptomLog instances (already flushed so they have IDs)
+            batch_id: Identifier shared by the jobs
+
+        Returns:
+            list: The new RecommendationJob instances, in the order of `logs`
+        """
+        jobs = [
+            RecommendationJob(log_id=log.id, user_id=log.user_id, batch_id=batch_id, status='queued')
+            for log in logs
+        ]
+        db.session.add_all(jobs)
+        return jobs
+
+    def enqueue(self, job_id, priority=LOWEST_PRIORITY):
+        """
+        Hand a committed job to the worker pool.
+        With RECOMMENDATION_WORKERS set to 0 the job runs inline instead.
+
+        Args:
+            job_id: ID of a queued RecommendationJob
+            priority: Dispatch priority, lower goes first (see plan_priority)
+        """
+        if self.num_workers <= 0:
+            self._run_job(job_id, priority)
+            return
+
+        self.ensure_started()
+        try:
+            self._queue.put_nowait((priority, next(self._sequence), job_id))
+        except queue.Full:
+            # The job stays queued in the database and is picked up by a sweep
+            current_app.logger.warning(f"Recommendation queue full, deferring job {job_id}")
+
+    def claim_log_job(self, log_id):
+        """
+        Claim the queued job of a symptom log for a caller that generates the
+        recommendation itself (the streaming endpoint), so no worker runs it as well.
+        If the caller never finishes the job, the sweep re-queues it after job_timeout.
+
+        Returns:
+            RecommendationJob or None if the log has no queued job
+        """
+        job = RecommendationJob.query.filter_by(log_id=log_id, status='queued').first()
+        if job is None or not self._claim(job.id):
+            return None
+        return db.session.get(RecommendationJob, job.id)
+
+    def release_log_job(self, job, priority=LOWEST_PRIORITY):
+        """
+        Hand a job claimed with `claim_log_job` back to the queue, for a caller that
+        stopped before saving the recommendation (e.g. its client disconnected). The
+        attempt it used is given back.
+        """
+        db.session.rollback()
+        released = RecommendationJob.query.filter_by(id=job.id, status='running').update({
+            'status': 'queued',
+            'started_at': None,
+            'attempts': RecommendationJob.attempts - 1
+        }, synchronize_session=False)
+        db.session.commit()
+        if released:
+            self.enqueue(job.id, priority)
+
+    def complete_job(self, job, used_fallback):
+        """Mark a job claimed with `claim_log_job` as completed."""
+        job.status = 'completed'
+        job.used_fallback = used_fallback
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    def stats(self):
+        """Return worker and queue depth information (in total and per plan) for monitoring."""
+        queued = {plan: 0 for plan in PLAN_PRIORITIES}
+        queued['other'] = 0  # users of unknown plans (LOWEST_PRIORITY)
+        if self._queue:
+            plans = {priority: plan for plan, priority in PLAN_PRIORITIES.items()}
+            with self._queue.mutex:
+                for priority, _, _ in self._queue.queue:
+                    queued[plans.get(priority, 'other')] += 1
+        return {
+            'workers': len(self._threads),
+            'queue_size': sum(queued.values()),
+            'queue_size_by_plan': queued,
+            'max_queue_size': self.max_queue_size
+        }
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                priority, _, job_id = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                self._sweep()
+                continue
+
+            try:
+                self._run_job(job_id, priority)
+            except Exception as e:
+                self.app.logger.error(f"Recommendation worker crashed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _sweep(self):
+        """
+        Re-queue jobs that are waiting in the table, including stale running jobs.
+        Stale jobs that have used up their attempts (e.g. because they crash their
+        worker every time) are failed instead. Batches with a running job are
+        skipped: the worker running them claims the rest itself.
+        """
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            with self.app.app_context():
+                now = datetime.utcnow()
+                stale = RecommendationJob.query.filter(
+                    RecommendationJob.status == 'running',
+                    RecommendationJob.started_at < now - timedelta(seconds=self.job_timeout)
+                )
+                failed = stale.filter(RecommendationJob.attempts >= self.max_attempts).update({
+                    'status': 'failed',
+                    'error': f"Timed out after {self.max_attempts} attempts",
+                    'finished_at': now
+                }, synchronize_session=False)
+                stale.update({'status': 'queued'}, synchronize_session=False)
+                db.session.commit()
+                if failed:
+                    self.app.logger.error(f"Failed {failed} recommendation jobs that timed out on every attempt")
+
+                free_slots = self.max_queue_size - self._queue.qsize()
+                if free_slots <= 0:
+                    return
+                priority = case(PLAN_PRIORITIES, value=User.subscription_plan, else_=LOWEST_PRIORITY)
+                # Batches a worker is already working through are left to it
+                running = aliased(RecommendationJob)
+                batch_running = exists().where(
+                    running.batch_id == RecommendationJob.batch_id, running.status == 'running'
+                )
+                jobs = []
+                batches = set()
+                for job_id, batch_id, job_priority in (
+                    db.session.query(RecommendationJob.id, RecommendationJob.batch_id, priority)
+                    .join(User, User.id == RecommendationJob.user_id)
+                    .filter(RecommendationJob.status == 'queued', ~batch_running)
+                    .order_by(priority.asc(), RecommendationJob.id.asc())
+                    .limit(free_slots)
+                ):
+                    # One job per batch is enough: its worker runs the rest of the batch
+                    if batch_id is None or batch_id not in batches:
+                        jobs.append((job_priority, job_id))
+                        batches.add(batch_id)
+            for job_priority, job_id in jobs:
+                try:
+                    self._queue.put_nowait((job_priority, next(self._sequence), job_id))
+                except queue.Full:
+                    break
+        except Exception as e:
+            self.app.logger.error(f"Recommendation queue sweep failed: {e}")
+        finally:
+            self._sweep_lock.release()
+
+    def _claim(self, job_id):
+        """Atomically move a job from queued to running. Returns False if another worker has it."""
+        return bool(self._claim_many([job_id]))
+
+    def _claim_many(self, job_ids):
+        """
+        Move queued jobs to running in one transaction, one conditional UPDATE each.
+
+        Returns:
+            list: IDs of the jobs this caller claimed (others were taken by another worker)
+        """
+        started_at = datetime.utcnow()
+        claimed = [
+            job_id for job_id in job_ids
+            if RecommendationJob.query.filter_by(id=job_id, status='queued').update({
+                'status': 'running',
+                'started_at': started_at,
+                'attempts': RecommendationJob.attempts + 1
+            }, synchronize_session=False) == 1
+        ]
+        db.session.commit()
+        return claimed
+
+    def _claim_batch(self, batch_id, limit):
+        """Claim up to `limit` still-queued jobs of a batch, oldest first."""
+        job_ids = [
+            job_id for (job_id,) in db.session.query(RecommendationJob.id)
+            .filter_by(batch_id=batch_id, status='queued')
+            .order_by(RecommendationJob.id.asc())
+            .limit(limit)
+        ]
+        return self._claim_many(job_ids)
+
+    def _higher_priority_waiting(self, priority):
+        """True if the in-memory queue holds a job that should run before `priority`."""
+        if not self._queue:
+            return False
+        with self._queue.mutex:
+            # The heap keeps the smallest (priority, sequence, job_id) entry first
+            return bool(self._queue.queue) and self._queue.queue[0][0] < priority
+
+    def _run_job(self, job_id, priority=LOWEST_PRIORITY):
+        with self.app.app_context():
+            if not self._claim(job_id):
+                return
+
+            batch_id = db.session.query(RecommendationJob.batch_id).filter_by(id=job_id).scalar()
+            if not batch_id:
+                self._process_job(job_id)
+                return
+
+            # Work through the batch in this worker, one prompt per group, claiming as we
+            # go so each job's started_at stays meaningful for the stale-job sweep
+            group = [job_id] + self._claim_batch(batch_id, limit=self.batch_size - 1)
+            while group:
+                self._process_job_group(group)
+                if self._higher_priority_waiting(priority):
+                    self._requeue_batch(batch_id, priority)
+                    return
+                group = self._claim_batch(batch_id, limit=self.batch_size)
+
+    def _requeue_batch(self, batch_id, priority):
+        """Hand the rest of a batch back to the queue, behind the jobs that preempted it."""
+        job_id = db.session.query(RecommendationJob.id).filter_by(
+            batch_id=batch_id, status='queued'
+        ).order_by(RecommendationJob.id.asc()).limit(1).scalar()
+        if job_id is None:
+            return
+        try:
+            self._queue.put_nowait((priority, next(self._sequence), job_id))
+        except queue.Full:
+            pass  # still queued in the table; a sweep picks it up
+
+    def _process_job_group(self, job_ids):
+        """Generate the recommendations of claimed jobs of one user together and record the outcomes."""
+        from app.models.symptom_log import SymptomLog
+        from app.models.user import User
+        from app.routes.symptoms import generate_ai_recommendations_for_logs
+
+        if len(job_ids) == 1:
+            self._process_job(job_ids[0])
+            return
+
+        jobs = RecommendationJob.query.filter(RecommendationJob.id.in_(job_ids)).all()
+        try:
+            logs = {log.id: log for log in SymptomLog.query.filter(SymptomLog.id.in_([job.log_id for job in jobs]))}
+            user = db.session.get(User, jobs[0].user_id)
+            pending = [
+                logs[job.log_id] for job in jobs
+                if job.log_id in logs and logs[job.log_id].recommendation is None
+            ]
+            sources = generate_ai_recommendations_for_logs(pending, user) if pending else {}
+
+            jobs = RecommendationJob.query.filter(RecommendationJob.id.in_(job_ids)).all()
+            finished_at = datetime.utcnow()
+            for job in jobs:
+                if job.log_id not in logs:
+                    job.status = 'failed'
+                    job.error = "Symptom log no longer exists"
+                else:
+                    job.status = 'completed'
+                    job.error = None
+                    if job.log_id in sources:
+                        job.used_fallback = sources[job.log_id] == 'fallback'
+                job.finished_at = finished_at
+            db.session.commit()
+        except Exception as e:
+            # The jobs are still claimed: run them one by one, with the usual retry handling
+            db.session.rollback()
+            self.app.logger.error(f"Recommendation job group {job_ids} failed, running the jobs individually: {e}")
+            for job_id in job_ids:
+                self._process_job(job_id)
+
+    def _process_job(self, job_id):
+        """Generate the recommendation for a claimed job and record the outcome."""
+        from app.models.symptom_log import SymptomLog
+        from app.routes.symptoms import generate_ai_recommendation_for_log
+
+        job = db.session.get(RecommendationJob, job_id)
+        try:
+            log = db.session.get(SymptomLog, job.log_id)
+            if log is None:
+                raise Exception("Symptom log no longer exists")
+
+            if log.recommendation is None:
+                success, _ = generate_ai_recommendation_for_log(log)
+                job.used_fallback = not success
+
+            job.status = 'completed'
+            job.error = None
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(RecommendationJob, job_id)
+            job.error = str(e)
+            job.status = 'queued' if job.attempts < self.max_attempts else 'failed'
+            self.app.logger.error(f"Recommendation job {job_id} failed (attempt {job.attempts}): {e}")
+
+        job.finished_at = datetime.utcnow() if job.status != 'queued' else None
+        db.session.commit()
+
+recommendation_queue = RecommendationQueue()
\ No newline at end of file
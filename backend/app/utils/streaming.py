@@ -0,0 +1,68 @@
+# app/utils/streaming.py
+import json
+import re
+
+SECTION_HEADER = re.compile(r'\s*##\s*(diet|exercise|wellness\s*tips?)\b', re.IGNORECASE)
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class SectionSplitter:
+    """
+    Splits streamed AI text into recommendation sections as it arrives.
+
+    `feed` takes raw chunks and returns events:
+        ('section', name)        a "## Diet" / "## Exercise" / "## Wellness Tips" header was seen
+        ('delta', name, text)    text belonging to the current section
+
+    Text is released as soon as it cannot be the start of a header (anything not
+    beginning with '#'), so clients see partial lines without waiting for a newline.
+    Text before the first header is dropped. The final, formatted sections still come
+    from parsing the complete response.
+    """
+
+    def __init__(self):
+        self.section = None
+        self._line = ''
+        self._released = 0
+
+    def feed(self, chunk):
+        events = []
+        self._line += chunk
+        while '\n' in self._line:
+            line, self._line = self._line.split('\n', 1)
+            events.extend(self._finish_line(line + '\n'))
+            self._released = 0
+        if self._line and not self._line.lstrip().startswith('#') and self._line.strip():
+            events.extend(self._release(self._line))
+        return events
+
+    def close(self):
+        """Flush any buffered text at the end of the stream."""
+        events = self._finish_line(self._line) if self._line else []
+        self._line = ''
+        self._released = 0
+        return events
+
+    def _finish_line(self, line):
+        if not self._released:
+            match = SECTION_HEADER.match(line)
+            if match:
+                name = match.group(1).lower()
+                self.section = 'wellness' if name.startswith('wellness') else name
+                rest = line[match.end():].strip()
+                events = [('section', self.section)]
+                if rest:
+                    events.append(('delta', self.section, rest + '\n'))
+                return events
+        return self._release(line)
+
+    def _release(self, line):
+        text = line[self._released:]
+        self._released = len(line)
+        if self.section is None or not text:
+            return []
+        return [('delta', self.section, text)]
\ No newline at end of file
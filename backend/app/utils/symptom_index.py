@@ -0,0 +1,67 @@
+# app/utils/symptom_index.py
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.symptom import Symptom, SymptomLogSymptom
+
+def normalize_symptoms(text):
+    """
+    Split free-text symptoms on ',' and ';' into unique, lowercased names.
+
+    Args:
+        text: SymptomLog.symptoms value (may be None)
+
+    Returns:
+        list: Normalized symptom names in order of first appearance
+    """
+    if not text:
+        return []
+    names = []
+    for part in text.replace(',', ';').split(';'):
+        name = ' '.join(part.split()).lower()[:200]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def get_symptom_ids(names):
+    """
+    Return {name: id} for the given normalized names, creating missing dictionary entries.
+    """
+    if not names:
+        return {}
+
+    ids = dict(db.session.query(Symptom.name, Symptom.id).filter(Symptom.name.in_(names)))
+    for name in names:
+        if name in ids:
+            continue
+        try:
+            # Savepoint, so losing a creation race does not roll back the caller's transaction
+            with db.session.begin_nested():
+                symptom = Symptom(name=name)
+                db.session.add(symptom)
+            ids[name] = symptom.id
+        except IntegrityError:
+            ids[name] = db.session.query(Symptom.id).filter_by(name=name).scalar()
+    return ids
+
+
+def index_log_symptoms(logs):
+    """
+    Write the symptom links of new symptom logs.
+
+    Must be called in the same transaction that inserts the logs (after a flush,
+    so they have IDs). Logs are never edited through the API; code that changes a
+    log's symptoms must delete its links and index it again. The caller commits.
+
+    Args:
+        logs: Iterable of SymptomLog instances
+    """
+    logs = list(logs)
+    names_by_log = {log.id: normalize_symptoms(log.symptoms) for log in logs}
+    ids = get_symptom_ids(sorted({name for names in names_by_log.values() for name in names}))
+
+    db.session.add_all([
+        SymptomLogSymptom(log_id=log.id, symptom_id=ids[name], user_id=log.user_id, date=log.date)
+        for log in logs
+        for name in names_by_log[log.id]
+    ])
\ No newline at end of file
@@ -0,0 +1,109 @@
+# app/utils/symptom_rollups.py
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.symptom_log import SymptomLog
+from app.models.symptom_daily_rollup import SymptomDailyRollup
+from app.utils.data_version import bump_data_version
+
+def _get_or_create_rollup(user_id, day):
+    """Return the locked rollup row for a user and day, creating it if needed."""
+    rollup = SymptomDailyRollup.query.filter_by(user_id=user_id, date=day).with_for_update().first()
+    if rollup:
+        return rollup
+
+    rollup = SymptomDailyRollup(
+        user_id=user_id, date=day, log_count=0, pain_sum=0, pain_count=0,
+        pain_max=None, mood_counts={}, condition_counts={}
+    )
+    try:
+        # Savepoint, so losing a creation race does not roll back the caller's transaction
+        with db.session.begin_nested():
+            db.session.add(rollup)
+    except IntegrityError:
+        rollup = SymptomDailyRollup.query.filter_by(user_id=user_id, date=day).with_for_update().one()
+    return rollup
+
+
+def add_logs_to_rollups(logs):
+    """
+    Fold new symptom logs into their daily rollups.
+
+    Must be called in the same transaction that inserts the logs, so the rollups
+    never drift from the raw data. Logs are never updated or deleted through the
+    API; code that does so must rebuild the user's rollups (rebuild_rollups). The
+    caller commits.
+
+    Args:
+        logs: Iterable of SymptomLog instances (user_id and date set)
+    """
+    groups = defaultdict(list)
+    for log in logs:
+        groups[(log.user_id, log.date)].append(log)
+
+    # Lock the existing rollups of all affected days with one query per user (batch uploads span many days)
+    days_by_user = defaultdict(set)
+    for user_id, day in groups:
+        days_by_user[user_id].add(day)
+    existing = {}
+    for user_id, days in days_by_user.items():
+        for rollup in SymptomDailyRollup.query.filter(
+            SymptomDailyRollup.user_id == user_id, SymptomDailyRollup.date.in_(days)
+        ).with_for_update():
+            existing[(rollup.user_id, rollup.date)] = rollup
+
+    for (user_id, day), day_logs in groups.items():
+        rollup = existing.get((user_id, day)) or _get_or_create_rollup(user_id, day)
+        mood_counts = dict(rollup.mood_counts or {})
+        condition_counts = dict(rollup.condition_counts or {})
+
+        for log in day_logs:
+            rollup.log_count += 1
+            if log.pain_level is not None:
+                rollup.pain_sum += log.pain_level
+                rollup.pain_count += 1
+                rollup.pain_max = log.pain_level if rollup.pain_max is None else max(rollup.pain_max, log.pain_level)
+            if log.mood:
+                mood_counts[log.mood] = mood_counts.get(log.mood, 0) + 1
+            if log.condition:
+                condition_counts[log.condition] = condition_counts.get(log.condition, 0) + 1
+
+        # Reassign so SQLAlchemy sees the JSON columns as changed
+        rollup.mood_counts = mood_counts
+        rollup.condition_counts = condition_counts
+
+
+def rebuild_rollups(user_id):
+    """
+    Drop and rebuild all rollups of a user from the raw logs with SQL aggregates.
+    Used for backfills; the caller commits.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    SymptomDailyRollup.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    base = db.session.query(SymptomLog.date).filter(SymptomLog.user_id == user_id, SymptomLog.date.isnot(None))
+    rollups = {}
+    for day, log_count, pain_sum, pain_count, pain_max in base.add_columns(
+        func.count(SymptomLog.id),
+        func.coalesce(func.sum(SymptomLog.pain_level), 0),
+        func.count(SymptomLog.pain_level),
+        func.max(SymptomLog.pain_level)
+    ).group_by(SymptomLog.date):
+        rollups[day] = SymptomDailyRollup(
+            user_id=user_id, date=day, log_count=log_count, pain_sum=pain_sum,
+            pain_count=pain_count, pain_max=pain_max, mood_counts={}, condition_counts={}
+        )
+
+    for column, attribute in ((SymptomLog.mood, 'mood_counts'), (SymptomLog.condition, 'condition_counts')):
+        for day, value, count in base.add_columns(column, func.count(SymptomLog.id)).filter(
+            column.isnot(None), column != ''
+        ).group_by(SymptomLog.date, column):
+            getattr(rollups[day], attribute)[value] = count
+
+    db.session.add_all(rollups.values())
+    # The bulk delete bypasses the flush hook, and analytics may change
+    bump_data_version([user_id])
+    return len(rollups)
\ No newline at end of file
@@ -0,0 +1,85 @@
+# app/utils/ttl_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters.
+    Dict values are copied on the way in and out, so callers cannot mutate
+    cached entries. A max size of 0 disables caching.
+    """
+
+    def __init__(self, max_size=1024, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return a copy of the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value) if isinstance(value, dict) else value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a copy of the value, evicting the least recently used entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional lifetime in seconds overriding the cache default
+        """
+        if self.max_size <= 0:
+            return
+        if isinstance(value, dict):
+            value = dict(value)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss/eviction counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
\ No newline at end of file
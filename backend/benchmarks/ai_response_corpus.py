@@ -0,0 +1,182 @@
+# benchmarks/ai_response_corpus.py
+"""
+Real-world-shaped AI responses for tests/test_ai_response_parser.py and the
+benchmarks: well-formed answers, the formatting variations models produce, and
+malformed responses that exercise the keyword fallback and the defaults.
+"""
+import random
+
+WELL_FORMED = """## Diet
+- Focus on low-glycemic foods like quinoa, oats, and sweet potatoes
+- Include lean proteins such as salmon, eggs, and lentils at every meal
+- Add anti-inflammatory foods: berries, leafy greens, turmeric
+- Limit refined sugar and highly processed snacks
+
+## Exercise
+- Take a 30-minute brisk walk most days of the week
+- Add two short strength sessions (bodyweight squats, glute bridges)
+- On high-pain days, switch to gentle yoga or stretching
+
+## Wellness Tips
+- Keep a consistent sleep schedule of 7-8 hours
+- Try 10 minutes of guided breathing before bed
+- Track symptoms alongside your cycle to spot patterns"""
+
+CORPUS = {
+    'well_formed': WELL_FORMED,
+
+    'preamble_and_closing': """Thanks for sharing your symptoms! Here are some personalized suggestions.
+
+""" + WELL_FORMED + """
+
+Remember to consult your healthcare provider before making major changes.""",
+
+    'numbered_lists': """## Diet
+1. Eat more fiber-rich vegetables
+2. Choose whole grains over refined carbs
+3.   Drink at least 2 liters of water
+## Exercise
+1. Walk for 20 minutes after meals
+2. Practice pelvic floor exercises
+## Wellness Tips
+1. Use a heating pad for cramps
+2.
+3. Journal your mood daily""",
+
+    'plain_lines_no_bullets': """## Diet
+Eat leafy greens daily
+Avoid sugary drinks
+
+## Exercise
+Gentle swimming twice a week
+
+## Wellness Tips
+Meditate for ten minutes""",
+
+    'asterisk_bullets_crlf': "## Diet\r\n* Oily fish twice a week\r\n* Flaxseed in breakfast\r\n\r\n"
+                             "## Exercise\r\n* Restorative yoga\r\n\r\n## Wellness Tips\r\n* Warm baths\r\n",
+
+    'h3_headers_and_bold': """### Diet
+- **Breakfast:** oats with berries
+- **Lunch:** salmon salad
+
+### Exercise
+- **Cardio:** 20 minutes cycling
+
+### Wellness Tips
+- **Sleep:** no screens after 10pm""",
+
+    'header_variants': """##Diet
+- Ginger tea for nausea
+##   EXERCISE
+- Light stretching
+## wellness tip
+- Rest when needed
+## Wellness
+- Stay hydrated""",
+
+    'headers_with_trailing_text': """## Diet recommendations for PCOS
+- Low-GI carbohydrates
+## Exercise plan
+- Strength training
+## Wellness Tips and self-care
+- Mindfulness""",
+
+    'dietary_header': """## Dietary Changes
+- Cut back on caffeine
+## Exercise
+- Pilates
+## Wellness Tips
+- Sleep hygiene""",
+
+    'inline_headers': "Overview. ## Diet - kale - lentils ## Exercise - walking ## Wellness Tips - rest",
+
+    'wellness_tips_on_next_line': """## Diet
+- Beans and legumes
+## Wellness
+Tips for better sleep
+- Dim the lights at night""",
+
+    'repeated_section': """## Diet
+- First diet suggestion
+## Exercise
+- Swim
+## Diet
+- Revised diet suggestion
+## Wellness Tips
+- Breathe""",
+
+    'empty_sections': """## Diet
+
+## Exercise
+- Only exercise advice here
+## Wellness Tips
+""",
+
+    'bare_section_name_as_text': """## Diet
+Exercise
+- Squats
+## Wellness Tips
+- Journaling""",
+
+    'fallback_numbered': """1. Diet: focus on whole foods
+Eat plenty of vegetables
+- Reduce sugar
+2. Exercise: move daily
+Walk for 30 minutes
+3. Wellness: manage stress
+Try meditation""",
+
+    'fallback_colons': """Here is my advice.
+Diet:
+Lean protein with each meal
+Physical activity: stay active
+Exercise: light jogging
+Wellbeing is important
+Wellness: rest well
+- Sleep 8 hours""",
+
+    'no_structure': "I'm sorry, I can't provide medical advice. Please consult a doctor.",
+
+    'empty': "",
+
+    'whitespace_only': "   \n\n  \t ",
+
+    'unicode_and_emoji': """## Diet 🥗
+- Añade espinacas y garbanzos
+- 豆腐 (tofu) for protein
+## Exercise 🏃
+- Caminar 30 minutos
+## Wellness Tips 🧘
+- Respiración profunda""",
+}
+
+LINE_POOL = [
+    '- Eat leafy greens', '* Drink water', '1. Walk daily', '2) Stretch', 'Plain advice line',
+    '', '   ', '## Diet', '## Exercise', '## Wellness Tips', '##Wellness', '### Diet', 'Diet',
+    'exercise', 'Wellness tips', '1. Diet: eat well', '2. Exercise: move', '3. Wellness: rest',
+    'Nutrition matters', 'physical activity: 10 min', '# Heading', '##', '#', 'Tips', '12.',
+    '- **Bold:** text', 'Well-being: sleep', 'Diet: fiber', 'wellness: calm', 'random text ## Exercise inline',
+]
+
+
+def random_response(rng):
+    """A randomly assembled (often malformed) response for fuzzing."""
+    lines = [rng.choice(LINE_POOL) for _ in range(rng.randint(0, 25))]
+    separator = rng.choice(['\n', '\n', '\r\n', '\n\n'])
+    return separator.join(lines)
+
+
+def random_chunks(text, rng):
+    """Split text into random-sized chunks, as a streaming model would deliver it."""
+    chunks, position = [], 0
+    while position < len(text):
+        size = rng.choice([1, 2, 3, 5, 8, 16, 40])
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+
+def fuzz_corpus(count, seed=0):
+    rng = random.Random(seed)
+    return [random_response(rng) for _ in range(count)]
\ No newline at end of file
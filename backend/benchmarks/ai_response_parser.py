@@ -0,0 +1,53 @@
+# benchmarks/ai_response_parser.py
+"""
+Micro-benchmark for app/utils/ai_response_parser.py: median time per parse for the
+legacy multi-pass parser (benchmarks/legacy_ai_parser.py) and the current one, per
+corpus entry (benchmarks/ai_response_corpus.py) and over random malformed responses.
+That both parsers produce identical output is checked by tests/test_ai_response_parser.py.
+
+Usage (from the backend directory):
+    python -m benchmarks.ai_response_parser --fuzz 500 --repeat 2000
+"""
+import argparse
+import statistics
+import time
+
+from app.utils.ai_response_parser import parse_ai_response
+from benchmarks.ai_response_corpus import CORPUS, fuzz_corpus
+from benchmarks.legacy_ai_parser import parse_ai_response_to_markdown as legacy_parse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fuzz', type=int, default=500, help='random malformed responses to time')
+    parser.add_argument('--repeat', type=int, default=1000, help='parses per timing sample')
+    return parser.parse_args()
+
+
+def time_parser(parse, texts, repeat):
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                parse(text)
+        samples.append((time.perf_counter() - started) / (repeat * len(texts)) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    args = parse_args()
+
+    print(f"{'corpus entry':<28} {'legacy us':>10} {'new us':>8} {'speedup':>8}")
+    rows = [(name, [text], args.repeat) for name, text in CORPUS.items()]
+    rows.append(('all (mean per response)', list(CORPUS.values()), args.repeat // 10 or 1))
+    if args.fuzz:
+        rows.append((f'{args.fuzz} malformed (mean)', fuzz_corpus(args.fuzz), max(1, args.repeat // 1000)))
+    for name, texts, repeat in rows:
+        legacy = time_parser(legacy_parse, texts, repeat)
+        new = time_parser(parse_ai_response, texts, repeat)
+        print(f"{name:<28} {legacy:>10.1f} {new:>8.1f} {legacy / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+# benchmarks/legacy_ai_parser.py
+"""
+Verbatim copy of the multi-pass AI response parser that app/routes/symptoms.py used
+before app/utils/ai_response_parser.py replaced it. Kept only as the golden reference
+for tests/test_ai_response_parser.py and the baseline of benchmarks/ai_response_parser.py.
+"""
+import re
+
+
+def parse_ai_response_to_markdown(content):
+    """Parse the AI response and format it as clean markdown."""
+    parsed = {"diet": "", "exercise": "", "wellness": ""}
+    
+    # Clean up the content
+    content = content.strip()
+    
+    # Split content by markdown headers
+    sections = re.split(r'##\s*(Diet|Exercise|Wellness\s*Tips?)', content, flags=re.IGNORECASE)
+    
+    current_section = None
+    for i, section in enumerate(sections):
+        section = section.strip()
+        if not section:
+            continue
+            
+        # Check if this is a header
+        if re.match(r'^(diet|exercise|wellness\s*tips?)$', section, re.IGNORECASE):
+            current_section = section.lower().replace(' tips', '').replace('tips', '').strip()
+            if current_section == 'wellness':
+                current_section = 'wellness'
+            continue
+        
+        # This is content for the current section
+        if current_section and section:
+            formatted_content = format_section_content(section)
+            parsed[current_section] = formatted_content
+    
+    # Fallback parsing if markdown headers aren't found
+    if not any(parsed.values()):
+        parsed = fallback_parse_ai_response(content)
+    
+    # Ensure all sections have content and are properly formatted
+    for key in parsed:
+        if not parsed[key]:
+            parsed[key] = get_default_recommendation_markdown(key)
+        else:
+            # Ensure content is properly formatted as markdown
+            parsed[key] = ensure_markdown_formatting(parsed[key])
+    
+    return parsed
+
+
+def format_section_content(content):
+    """Format section content as clean markdown."""
+    lines = content.split('\n')
+    formatted_lines = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Convert numbered lists to bullet points
+        line = re.sub(r'^\d+\.\s*', '- ', line)
+        
+        # Ensure bullet points are properly formatted
+        if not line.startswith('-') and not line.startswith('*') and line:
+            line = f"- {line}"
+        
+        formatted_lines.append(line)
+    
+    return '\n'.join(formatted_lines)
+
+
+def fallback_parse_ai_response(content):
+    """Fallback parsing method if markdown headers aren't detected."""
+    parsed = {"diet": "", "exercise": "", "wellness": ""}
+    
+    lines = content.split('\n')
+    current_section = None
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        line_lower = line.lower()
+        
+        # Identify sections
+        if any(keyword in line_lower for keyword in ['diet', 'dietary', 'nutrition']):
+            if any(starter in line_lower for starter in ['1.', '##', 'diet:']):
+                current_section = 'diet'
+                continue
+        elif any(keyword in line_lower for keyword in ['exercise', 'physical', 'activity']):
+            if any(starter in line_lower for starter in ['2.', '##', 'exercise:']):
+                current_section = 'exercise'
+                continue
+        elif any(keyword in line_lower for keyword in ['wellness', 'well-being', 'wellbeing']):
+            if any(starter in line_lower for starter in ['3.', '##', 'wellness:']):
+                current_section = 'wellness'
+                continue
+        
+        # Add content to current section
+        if current_section and line:
+            formatted_line = line
+            if not formatted_line.startswith('-') and not formatted_line.startswith('*'):
+                formatted_line = f"- {formatted_line}"
+            
+            if parsed[current_section]:
+                parsed[current_section] += f"\n{formatted_line}"
+            else:
+                parsed[current_section] = formatted_line
+    
+    return parsed
+
+
+def ensure_markdown_formatting(content):
+    """Ensure content is properly formatted as markdown."""
+    if not content:
+        return content
+    
+    lines = content.split('\n')
+    formatted_lines = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        # Ensure bullet points
+        if not line.startswith('-') and not line.startswith('*') and not line.startswith('#'):
+            line = f"- {line}"
+        
+        formatted_lines.append(line)
+    
+    return '\n'.join(formatted_lines)
+
+
+def get_default_recommendation_markdown(category):
+    """Provide default recommendations in markdown format based on category."""
+    defaults = {
+        'diet': """- Focus on anti-inflammatory foods like leafy greens, fatty fish, and nuts
+- Limit processed foods and added sugars
+- Include complex carbohydrates and lean proteins
+- Stay hydrated with plenty of water""",
+        
+        'exercise': """- Engage in gentle activities like walking, yoga, or swimming
+- Aim for 20-30 minutes of daily movement
+- Listen to your body and adjust intensity as needed
+- Include both cardio and strength training when possible""",
+        
+        'wellness': """- Maintain a regular sleep schedule (7-8 hours nightly)
+- Practice stress management techniques like meditation
+- Consider mindfulness and relaxation exercises
+- Keep a symptom diary to track patterns"""
+    }
+    return defaults.get(category, '- Consult with your healthcare provider for personalized advice')
\ No newline at end of file
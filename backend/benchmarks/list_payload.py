@@ -0,0 +1,127 @@
+# benchmarks/list_payload.py
+"""
+Payload size and latency of a symptom log list page under each response option.
+
+Seeds a throwaway database with one user whose logs all have recommendations,
+then requests a full page (limit=100) of `GET /api/symptoms/` in-process with:
+
+    stdlib_json  Flask's default JSON provider, sorted keys, no compression (the old path)
+    orjson       the app's JSON provider (orjson when installed, unsorted keys)
+    projection   + fields=-recommendation.markdown (drops the duplicate markdown copy)
+    gzip / br    + negotiated compression (br only if the Brotli package is installed)
+
+and reports bytes on the wire, median request latency and median time spent
+JSON-encoding the page (before compression).
+
+Usage (from the backend directory):
+    python -m benchmarks.list_payload --logs 100 --samples 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logs', type=int, default=100, help='symptom logs (with recommendations) to seed')
+    parser.add_argument('--samples', type=int, default=200, help='requests per variant')
+    return parser.parse_args()
+
+
+def seed(app, db, user_id, logs):
+    from app.models.symptom_log import SymptomLog
+    from app.models.ai_recommendation import AIRecommendation
+    from app.utils.ai_response_parser import parse_ai_response
+    from benchmarks.ai_response_corpus import WELL_FORMED
+
+    sections = parse_ai_response(WELL_FORMED)
+    with app.app_context():
+        today = date.today()
+        entries = [
+            SymptomLog(user_id=user_id, date=today - timedelta(days=i), condition='PCOS',
+                       symptoms='cramps, bloating, fatigue', pain_level=i % 10, mood='tired', cycle_day=i % 28 + 1,
+                       notes='Worse in the evening after a long day at work.')
+            for i in range(logs)
+        ]
+        db.session.add_all(entries)
+        db.session.flush()
+        db.session.add_all([AIRecommendation(log_id=log.id, **sections) for log in entries])
+        db.session.commit()
+
+
+def measure(client, url, headers, samples):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+    assert response.status_code == 200, response.status_code
+    return len(response.data), statistics.median(latencies)
+
+
+def encode_time(provider, payload, samples):
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        provider.response(payload)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    args = parse_args()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ.setdefault('RECOMMENDATION_WORKERS', '0')
+    os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+    sys.path.insert(0, BACKEND_DIR)
+
+    from flask.json.provider import DefaultJSONProvider
+    from flask_migrate import upgrade
+    from app import create_app, db
+    from app.utils.compression import brotli
+    from app.utils.json_provider import FastJSONProvider
+
+    app = create_app()
+    with app.app_context():
+        upgrade()
+    client = app.test_client()
+    registered = client.post('/api/auth/register', json={
+        'email': 'bench@example.com', 'password': 'bench-password', 'full_name': 'Bench User'
+    }).json
+    seed(app, db, registered['user']['id'], args.logs)
+    auth = {'Authorization': f"Bearer {registered['token']}"}
+    page = f'/api/symptoms/?limit={args.logs}'
+    projected = page + '&fields=-recommendation.markdown'
+
+    stdlib_provider = DefaultJSONProvider(app)
+    fast_provider = app.json
+    variants = [
+        ('stdlib_json', stdlib_provider, page, {}),
+        ('orjson' if FastJSONProvider.backend() == 'orjson' else 'json_unsorted', fast_provider, page, {}),
+        ('projection', fast_provider, projected, {}),
+        ('gzip', fast_provider, projected, {'Accept-Encoding': 'gzip'}),
+    ]
+    if brotli is not None:
+        variants.append(('br', fast_provider, projected, {'Accept-Encoding': 'br'}))
+
+    print(f"{'variant':<14} {'bytes':>9} {'vs old':>7} {'request ms':>11} {'encode ms':>10}")
+    baseline = None
+    for name, provider, url, headers in variants:
+        app.json = provider
+        size, latency = measure(client, url, {**auth, **headers}, args.samples)
+        payload = client.get(url, headers=auth).json
+        with app.app_context():
+            encoding = encode_time(provider, payload, args.samples)
+        baseline = baseline or size
+        print(f"{name:<14} {size:>9} {size / baseline:>6.0%} {latency:>11.2f} {encoding:>10.3f}")
+    app.json = fast_provider
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+# benchmarks/serving_throughput.py
+"""
+Throughput comparison of the development server (`python run.py`) and the
+production pre-fork server (`gunicorn -c gunicorn.conf.py wsgi:app`).
+
+Migrates a throwaway database, starts each server in turn on a free port, seeds a
+user with a few symptom logs (stub AI backend), then drives the profile, list and
+analytics endpoints from concurrent keep-alive clients and reports requests per
+second and latency percentiles.
+
+Usage (from the backend directory):
+    python -m benchmarks.serving_throughput --concurrency 32 --duration 15
+    python -m benchmarks.serving_throughput --servers gunicorn --workers 4 --threads 8
+"""
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    '/api/profile/',
+    '/api/symptoms/?limit=20',
+    '/api/symptoms/recent',
+    '/api/symptoms/analytics',
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', default=['dev', 'gunicorn'], choices=['dev', 'gunicorn'])
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load per server')
+    parser.add_argument('--logs', type=int, default=30, help='symptom logs to seed for the user')
+    parser.add_argument('--workers', type=int, help='gunicorn workers (default: gunicorn.conf.py sizing)')
+    parser.add_argument('--threads', type=int, help='gunicorn threads per worker')
+    parser.add_argument('--database', help='database URL (default: a temporary SQLite file)')
+    return parser.parse_args()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(name):
+    if name == 'dev':
+        return [sys.executable, 'run.py']
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+
+
+def start_server(name, env):
+    process = subprocess.Popen(
+        server_command(name), cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{env['PORT']}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} server exited with code {process.returncode}")
+        try:
+            requests.get(base_url + '/api/metrics/', timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{name} server did not start within 30s")
+
+
+def seed(base_url, logs):
+    """Register (or log in) the benchmark user and give them some symptom logs."""
+    credentials = {'email': 'bench@example.com', 'password': 'bench-password', 'full_name': 'Bench User'}
+    response = requests.post(base_url + '/api/auth/register', json=credentials)
+    if response.status_code == 409:
+        response = requests.post(base_url + '/api/auth/login', json=credentials)
+        return response.json()['token']
+
+    token = response.json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    rng = random.Random(42)
+    for i in range(logs):
+        requests.post(base_url + '/api/symptoms/', headers=headers, json={
+            'date': time.strftime('%Y-%m-%d', time.gmtime(time.time() - i * 86400)),
+            'condition': rng.choice(['PCOS', 'Endometriosis', 'General']),
+            'symptoms': 'cramps, bloating',
+            'pain_level': rng.randint(0, 10),
+            'mood': rng.choice(['happy', 'tired', 'anxious']),
+            'cycle_day': rng.randint(1, 28),
+        })
+    return token
+
+
+def run_load(base_url, token, concurrency, duration):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        session = requests.Session()
+        session.headers['Authorization'] = f'Bearer {token}'
+        local, failed = [], 0
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                ok = session.get(base_url + rng.choice(ENDPOINTS), timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                local.append((time.perf_counter() - started) * 1000)
+            else:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) if latencies else 0,
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+    }
+
+
+def main():
+    args = parse_args()
+    database = args.database or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    env = dict(
+        os.environ,
+        DATABASE_URL=database,
+        FLASK_APP='app',
+        AI_BACKEND='stub',
+        RECOMMENDATION_WORKERS='0',
+        PASSWORD_HASH_WORKERS='0',
+    )
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    if args.threads:
+        env['GUNICORN_THREADS'] = str(args.threads)
+
+    subprocess.run(['flask', 'db', 'upgrade'], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+
+    results = {}
+    for name in args.servers:
+        server_env = dict(env, PORT=str(free_port()))
+        process, base_url = start_server(name, server_env)
+        try:
+            token = seed(base_url, args.logs)
+            run_load(base_url, token, args.concurrency, min(2, args.duration))  # warm-up
+            print(f"Measuring {name} server ({args.concurrency} clients, {args.duration:.0f}s)...")
+            results[name] = run_load(base_url, token, args.concurrency, args.duration)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(f"\n{'server':<10} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['rps']:>9.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}")
+    if 'dev' in results and 'gunicorn' in results and results['dev']['rps']:
+        print(f"\ngunicorn / dev throughput: {results['gunicorn']['rps'] / results['dev']['rps']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
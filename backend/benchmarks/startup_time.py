@@ -0,0 +1,109 @@
+# benchmarks/startup_time.py
+"""
+Cold-start benchmark: app import time and time to first request.
+
+Each sample runs in a fresh interpreter. "import" is the time to import `wsgi`
+(which builds the app), "first request" is the time from process start until
+the dev server answers GET /api/metrics/. Both are measured with lazy providers
+(the default) and with PROVIDER_WARMUP=all, which imports every SDK at startup
+like the old top-level imports did.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup_time --samples 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import wsgi
+elapsed = (time.perf_counter() - started) * 1000
+heavy = ['google.generativeai', 'openai', 'cloudinary', 'PIL.Image']
+print(json.dumps({'ms': elapsed, 'loaded': [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5, help='fresh processes per measurement')
+    return parser.parse_args()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env):
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SCRIPT], cwd=BACKEND_DIR, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_request(env):
+    env = dict(env, PORT=str(free_port()))
+    url = f"http://127.0.0.1:{env['PORT']}/api/metrics/"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'run.py'], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < 60:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode}")
+            try:
+                request = urllib.request.Request(url, headers={'Authorization': f"Bearer {env['METRICS_TOKEN']}"})
+                urllib.request.urlopen(request, timeout=1).read()
+                return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer within 60s")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    args = parse_args()
+    base_env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+        FLASK_APP='app',
+        RECOMMENDATION_WORKERS='0',
+        METRICS_TOKEN='benchmark',
+    )
+    subprocess.run(['flask', 'db', 'upgrade'], cwd=BACKEND_DIR, env=base_env, check=True, capture_output=True)
+
+    results = {}
+    for label, warmup in (('lazy', ''), ('warmup=all', 'all')):
+        env = dict(base_env, PROVIDER_WARMUP=warmup)
+        imports = [measure_import(env) for _ in range(args.samples)]
+        first_requests = [measure_first_request(env) for _ in range(args.samples)]
+        results[label] = (
+            statistics.median(sample['ms'] for sample in imports),
+            statistics.median(first_requests),
+            imports[-1]['loaded']
+        )
+
+    print(f"{'mode':<12} {'import ms':>10} {'first request ms':>17}  SDKs loaded at startup")
+    for label, (import_ms, first_ms, loaded) in results.items():
+        print(f"{label:<12} {import_ms:>10.0f} {first_ms:>17.0f}  {', '.join(loaded) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
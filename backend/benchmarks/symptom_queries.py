@@ -0,0 +1,154 @@
+# benchmarks/symptom_queries.py
+"""
+Before/after benchmark for the symptom_logs indexes (migration 0002).
+
+Seeds a throwaway database at revision 0001 (no indexes), measures the list,
+deep-page, recent and analytics queries used by app/routes/symptoms.py, then
+upgrades to head and measures again. Query plans are printed for both runs.
+
+Usage (from the backend directory):
+    python -m benchmarks.symptom_queries --rows 2000000 --users 2000
+    python -m benchmarks.symptom_queries --database postgresql://.../avyna_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+QUERIES = {
+    'list_first_page': """
+        SELECT id, date FROM symptom_logs
+        WHERE user_id = :user_id
+        ORDER BY date DESC, id DESC LIMIT 50""",
+    'list_deep_page': """
+        SELECT id, date FROM symptom_logs
+        WHERE user_id = :user_id
+        ORDER BY date DESC, id DESC LIMIT 50 OFFSET 500""",
+    'recent_7_days': """
+        SELECT id, date FROM symptom_logs
+        WHERE user_id = :user_id AND date >= :cutoff_7
+        ORDER BY date DESC""",
+    'analytics_90_days': """
+        SELECT pain_level, mood, condition FROM symptom_logs
+        WHERE user_id = :user_id AND date >= :cutoff_90""",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000, help='symptom logs to seed')
+    parser.add_argument('--users', type=int, default=2000, help='users to spread the logs over')
+    parser.add_argument('--samples', type=int, default=50, help='queries per measurement')
+    parser.add_argument('--database', help='database URL (default: a temporary SQLite file)')
+    return parser.parse_args()
+
+
+def seed(db, rows, users):
+    """Insert users and logs in large batches, spreading logs over the last ~3 years."""
+    from sqlalchemy import text
+
+    print(f"Seeding {users} users and {rows} symptom logs...")
+    started = time.perf_counter()
+    rng = random.Random(42)
+    today = date.today()
+    moods = ['happy', 'tired', 'anxious', 'calm', 'irritable']
+    conditions = ['PCOS', 'Endometriosis', 'General']
+
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, full_name, subscription_plan) "
+            "VALUES (:id, :email, 'x', 'Bench User', 'free')"
+        ), [{'id': i, 'email': f'bench{i}@example.com'} for i in range(1, users + 1)])
+
+        insert_log = text(
+            "INSERT INTO symptom_logs (user_id, date, condition, symptoms, pain_level, mood, cycle_day) "
+            "VALUES (:user_id, :date, :condition, 'cramps, bloating', :pain_level, :mood, :cycle_day)"
+        )
+        batch = []
+        for _ in range(rows):
+            batch.append({
+                'user_id': rng.randint(1, users),
+                'date': today - timedelta(days=rng.randint(0, 1095)),
+                'condition': rng.choice(conditions),
+                'pain_level': rng.randint(0, 10),
+                'mood': rng.choice(moods),
+                'cycle_day': rng.randint(1, 28),
+            })
+            if len(batch) == 50_000:
+                conn.execute(insert_log, batch)
+                batch = []
+        if batch:
+            conn.execute(insert_log, batch)
+
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+
+def explain(conn, sql, params):
+    from sqlalchemy import text
+
+    if conn.dialect.name == 'postgresql':
+        rows = conn.execute(text('EXPLAIN ANALYZE ' + sql), params)
+        return '\n'.join(row[0] for row in rows)
+    rows = conn.execute(text('EXPLAIN QUERY PLAN ' + sql), params)
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def measure(db, users, samples, label):
+    from sqlalchemy import text
+
+    rng = random.Random(7)
+    today = date.today()
+    results = {}
+    with db.engine.connect() as conn:
+        conn.execute(text('ANALYZE'))
+        for name, sql in QUERIES.items():
+            timings = []
+            for _ in range(samples):
+                params = {
+                    'user_id': rng.randint(1, users),
+                    'cutoff_7': today - timedelta(days=7),
+                    'cutoff_90': today - timedelta(days=90),
+                }
+                started = time.perf_counter()
+                conn.execute(text(sql), params).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+
+            print(f"\n[{label}] {name}: median {results[name]:.2f} ms")
+            print('  ' + explain(conn, sql, params).replace('\n', '\n  '))
+    return results
+
+
+def main():
+    args = parse_args()
+    database = args.database or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['DATABASE_URL'] = database
+    os.environ.setdefault('RECOMMENDATION_WORKERS', '0')
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from flask_migrate import upgrade
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        upgrade(revision='0001')
+        seed(db, args.rows, args.users)
+        before = measure(db, args.users, args.samples, 'before')
+
+        started = time.perf_counter()
+        upgrade(revision='head')
+        print(f"\nMigrated to head in {time.perf_counter() - started:.1f}s")
+        after = measure(db, args.users, args.samples, 'after')
+
+    print(f"\n{'query':<20} {'before ms':>10} {'after ms':>10} {'speedup':>9}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<20} {before[name]:>10.2f} {after[name]:>10.2f} {speedup:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,136 @@
+# benchmarks/upload_memory.py
+"""
+Peak memory of one profile picture upload, before and after the single-decode path.
+
+Builds a noisy JPEG of about --size-mb megabytes and runs each upload pipeline
+under tracemalloc, from the raw request body to the bytes the Cloudinary SDK
+would put on the wire:
+
+    base64 (old)  JSON body -> validate_base64_image decodes -> the upload decodes
+                  again and re-encodes into a data: URI
+    base64 (new)  JSON body -> decoded once by validate_base64_image -> the same
+                  bytes are stored
+    multipart     werkzeug form parsing -> validate_image_file -> the spooled file
+                  is read once and stored
+
+The SDK's HTTP call is replaced by what it does with the file before sending it
+(cloudinary.utils.handle_file_parameter and urllib3's multipart encoding), so
+no network or Cloudinary account is needed. Peak memory is reported in MB
+above the request body, which every variant starts from.
+
+Usage (from the backend directory):
+    python -m benchmarks.upload_memory --size-mb 3.5 --runs 3
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import tracemalloc
+
+import cloudinary.uploader
+from cloudinary.utils import handle_file_parameter
+from PIL import Image
+from urllib3 import encode_multipart_formdata
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from app.utils import image_validation
+from app.utils.media_storage import CloudinaryStorage
+
+storage = CloudinaryStorage(cloud_name='benchmark', api_key=None, api_secret=None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=3.5, help='approximate JPEG size')
+    parser.add_argument('--runs', type=int, default=3, help='runs per variant (the lowest peak is reported)')
+    return parser.parse_args()
+
+
+def make_jpeg(size_mb):
+    """Random noise compresses badly, so a noise JPEG at quality 95 is ~1.5 bytes per pixel."""
+    side = int((size_mb * 1024 * 1024 / 1.5) ** 0.5)
+    image = Image.frombytes('RGB', (side, side), os.urandom(side * side * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+def fake_upload(file, **options):
+    """Build the multipart body the SDK would send, then drop it."""
+    body, _ = encode_multipart_formdata([('file', handle_file_parameter(file, None))])
+    return {'secure_url': 'https://example.invalid/image.jpg', 'public_id': options['public_id'], 'bytes': len(body)}
+
+
+def legacy_base64_upload(body):
+    """The old base64 path: the string is decoded twice and re-encoded into a data: URI."""
+    data = json.loads(body)
+    image = data['image']
+    if image.startswith('data:image'):
+        image = image.split(',')[1]
+    image_data = base64.b64decode(image)
+    Image.open(io.BytesIO(image_data)).verify()
+
+    file_data = data['image']
+    if file_data.startswith('data:image'):
+        file_data = file_data.split(',')[1]
+    image_data = base64.b64decode(file_data)
+    return fake_upload(f"data:image/jpg;base64,{base64.b64encode(image_data).decode()}", public_id='legacy')
+
+
+def base64_upload(body):
+    data = json.loads(body)
+    validation = image_validation.validate_base64_image(data.pop('image'))
+    assert validation['valid'], validation
+    return storage.put('benchmark/picture', validation['image_data'])
+
+
+def multipart_upload(environ):
+    file = Request(environ).files['profile_picture']
+    validation = image_validation.validate_image_file(file)
+    assert validation['valid'], validation
+    return storage.put('benchmark/picture', file.stream.read())
+
+
+def peak_mb(func, payload, runs):
+    peaks = []
+    for _ in range(runs):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        result = func(payload)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / (1024 * 1024))
+    return min(peaks)
+
+
+def main():
+    args = parse_args()
+    cloudinary.uploader.upload = fake_upload
+
+    jpeg = make_jpeg(args.size_mb)
+    body = json.dumps({'image': 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode()}).encode()
+    environ = EnvironBuilder(
+        method='POST', data={'profile_picture': (io.BytesIO(jpeg), 'picture.jpg', 'image/jpeg')}
+    ).get_environ()
+    multipart_body = environ['wsgi.input'].read()
+
+    def multipart(payload):
+        environ['wsgi.input'] = io.BytesIO(payload)
+        return multipart_upload(environ)
+
+    print(f"image {len(jpeg) / (1024 * 1024):.2f} MB, JSON body {len(body) / (1024 * 1024):.2f} MB, "
+          f"multipart body {len(multipart_body) / (1024 * 1024):.2f} MB")
+    print(f"{'variant':<16}{'peak MB':>10}{'x image':>10}")
+    for name, func, payload in (
+        ('base64 (old)', legacy_base64_upload, body),
+        ('base64 (new)', base64_upload, body),
+        ('multipart', multipart, multipart_body),
+    ):
+        peak = peak_mb(func, payload, args.runs)
+        print(f"{name:<16}{peak:>10.2f}{peak / (len(jpeg) / (1024 * 1024)):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
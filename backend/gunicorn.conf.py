@@ -0,0 +1,72 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for production: `gunicorn -c gunicorn.conf.py wsgi:app`.
+
+Every value can be overridden through the environment (or on the command line):
+
+- PORT: port to bind (default 5000)
+- WEB_CONCURRENCY: worker processes (default 2 x CPU count + 1)
+- GUNICORN_THREADS: threads per worker (default 4), so requests waiting on the
+  database or the AI backend do not block their worker
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: recycle a worker after
+  about this many requests to bound memory growth (jitter keeps workers from
+  restarting all at once)
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT / GUNICORN_KEEPALIVE: seconds
+
+The app is imported once in the master (`preload_app`), so workers share its memory
+copy-on-write and start instantly. Because of that, code changes need a binary upgrade
+rather than HUP: send USR2 to the master, then WINCH and TERM to the old master once
+the new workers are serving. HUP gracefully replaces the workers (config reload and
+memory reset) without dropping requests.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+preload_app = True
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """
+    Drop database connections inherited from the master, so a worker never shares a
+    socket with another process. `close=False` leaves the master's connections alone.
+    Then start the worker's background recommendation workers, so jobs left queued by
+    a restart are picked up without waiting for a request.
+    """
+    from wsgi import app
+    from app import db
+    from app.utils.recommendation_queue import recommendation_queue
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    recommendation_queue.ensure_started()
+
+
+def worker_exit(server, worker):
+    """
+    Let in-flight recommendation jobs, profile picture uploads and password hashing
+    finish before a worker exits, then stop the process pools' forkserver children.
+    The media workers stop before the image pool they render with.
+    """
+    from app.utils.recommendation_queue import recommendation_queue
+    from app.utils.media_pipeline import media_pipeline
+    from app.utils.password_hashing import password_hasher
+    from app.utils.image_processing import image_processor
+
+    recommendation_queue.shutdown(timeout=graceful_timeout)
+    media_pipeline.shutdown(timeout=graceful_timeout)
+    password_hasher.pool.shutdown()
+    image_processor.pool.shutdown()
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""symptom log indexes
+
+Adds the composite (user_id, date, id) index used by every per-user listing,
+recent and analytics query, and the missing index on recommendation_jobs.user_id.
+ai_recommendations.log_id is already indexed by its unique constraint.
+
+On PostgreSQL the indexes are built CONCURRENTLY so large tables stay writable.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 19:02:29.500653
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_symptom_logs_user_id_date_id', 'symptom_logs', ['user_id', 'date', 'id']),
+    ('ix_recommendation_jobs_user_id', 'recommendation_jobs', ['user_id']),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""symptom daily rollups
+
+Creates the per-user daily rollup table and backfills it from the existing
+symptom logs. `flask rollups rebuild` performs the same rebuild on demand.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 19:04:32.623785
+
+"""
+from collections import defaultdict
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+USER_CHUNK = 1000
+
+symptom_logs = sa.table(
+    'symptom_logs',
+    sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('date', sa.Date),
+    sa.column('pain_level', sa.Integer), sa.column('mood', sa.String), sa.column('condition', sa.Text)
+)
+
+
+def _backfill(conn, rollups_table):
+    """Aggregate existing logs into rollups, a chunk of users at a time."""
+    max_user_id = conn.execute(sa.select(sa.func.max(symptom_logs.c.user_id))).scalar() or 0
+    for low in range(0, max_user_id + 1, USER_CHUNK):
+        in_chunk = sa.and_(
+            symptom_logs.c.user_id >= low,
+            symptom_logs.c.user_id < low + USER_CHUNK,
+            symptom_logs.c.date.isnot(None)
+        )
+        rows = {}
+        for user_id, day, log_count, pain_sum, pain_count, pain_max in conn.execute(
+            sa.select(
+                symptom_logs.c.user_id, symptom_logs.c.date, sa.func.count(symptom_logs.c.id),
+                sa.func.coalesce(sa.func.sum(symptom_logs.c.pain_level), 0),
+                sa.func.count(symptom_logs.c.pain_level), sa.func.max(symptom_logs.c.pain_level)
+            ).where(in_chunk).group_by(symptom_logs.c.user_id, symptom_logs.c.date)
+        ):
+            rows[(user_id, day)] = {
+                'user_id': user_id, 'date': day, 'log_count': log_count, 'pain_sum': pain_sum,
+                'pain_count': pain_count, 'pain_max': pain_max,
+                'mood_counts': {}, 'condition_counts': {}
+            }
+
+        for column, key in ((symptom_logs.c.mood, 'mood_counts'), (symptom_logs.c.condition, 'condition_counts')):
+            for user_id, day, value, count in conn.execute(
+                sa.select(symptom_logs.c.user_id, symptom_logs.c.date, column, sa.func.count(symptom_logs.c.id))
+                .where(in_chunk, column.isnot(None), column != '')
+                .group_by(symptom_logs.c.user_id, symptom_logs.c.date, column)
+            ):
+                rows[(user_id, day)][key][value] = count
+
+        if rows:
+            op.bulk_insert(rollups_table, list(rows.values()))
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    rollups_table = op.create_table('symptom_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('log_count', sa.Integer(), nullable=False),
+    sa.Column('pain_sum', sa.Integer(), nullable=False),
+    sa.Column('pain_count', sa.Integer(), nullable=False),
+    sa.Column('pain_max', sa.Integer(), nullable=True),
+    sa.Column('mood_counts', sa.JSON(), nullable=False),
+    sa.Column('condition_counts', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'date', name='uq_symptom_daily_rollups_user_id_date')
+    )
+    # ### end Alembic commands ###
+
+    _backfill(op.get_bind(), rollups_table)
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('symptom_daily_rollups')
+    # ### end Alembic commands ###
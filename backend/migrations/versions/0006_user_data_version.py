@@ -0,0 +1,31 @@
+"""user data version
+
+Adds a per-user counter bumped on every write to the user's symptom logs or
+recommendations, used to validate ETags of list and analytics views without
+running their queries. Existing users start at 0.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 19:23:14.919081
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""recommendation job batches
+
+Adds recommendation_jobs.batch_id, shared by the jobs of one batch upload so a
+single worker runs them together. Existing jobs have no batch.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 19:28:10.872971
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('recommendation_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('batch_id', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_recommendation_jobs_batch_id'), ['batch_id'], unique=False)
+
+
+
+def downgrade():
+    with op.batch_alter_table('recommendation_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recommendation_jobs_batch_id'))
+        batch_op.drop_column('batch_id')
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""recommendation source
+
+Adds ai_recommendations.source ('ai', 'cache' or 'fallback') so rule-based
+fallback content can be found and regenerated later. Existing rows are marked
+as fallback when their job recorded a fallback or their diet section starts
+with one of the fallback templates.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 19:33:04.232673
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# First line of each fallback diet template (generate_*_recommendations in app/routes/symptoms.py)
+FALLBACK_DIET_OPENERS = (
+    "- Focus on low-glycemic foods like quinoa, sweet potatoes, and oats",
+    "- Emphasize omega-3 rich foods like salmon, walnuts, and flaxseeds",
+    "- Maintain a balanced diet rich in fruits and vegetables",
+)
+
+
+def upgrade():
+    with op.batch_alter_table('ai_recommendations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source', sa.String(length=16), server_default='ai', nullable=False))
+
+    recommendations = sa.table(
+        'ai_recommendations',
+        sa.column('log_id', sa.Integer),
+        sa.column('diet', sa.Text),
+        sa.column('source', sa.String)
+    )
+    jobs = sa.table('recommendation_jobs', sa.column('log_id', sa.Integer), sa.column('used_fallback', sa.Boolean))
+    op.execute(
+        recommendations.update()
+        .where(sa.or_(
+            recommendations.c.log_id.in_(sa.select(jobs.c.log_id).where(jobs.c.used_fallback == sa.true())),
+            *[recommendations.c.diet.like(f"{opener}%") for opener in FALLBACK_DIET_OPENERS]
+        ))
+        .values(source='fallback')
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('ai_recommendations', schema=None) as batch_op:
+        batch_op.drop_column('source')
\ No newline at end of file
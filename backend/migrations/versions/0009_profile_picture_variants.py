@@ -0,0 +1,30 @@
+"""profile picture variants
+
+Adds users.profile_picture_variants, the URLs and Cloudinary public_ids of the
+locally rendered square variants of a profile picture. Pictures uploaded
+before this have none.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 19:37:00.716307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile_picture_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('profile_picture_variants')
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""media pipeline
+
+Adds profile_picture_uploads (uploads accepted and processed in the background)
+and media_deletions (stored images to delete, retried with backoff).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 19:39:39.108794
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('public_id', sa.String(length=200), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('public_id')
+    )
+    with op.batch_alter_table('media_deletions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_media_deletions_next_attempt_at'), ['next_attempt_at'], unique=False)
+
+    op.create_table('profile_picture_uploads',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('profile_picture_uploads', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_profile_picture_uploads_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_profile_picture_uploads_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('profile_picture_uploads', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_profile_picture_uploads_user_id'))
+        batch_op.drop_index(batch_op.f('ix_profile_picture_uploads_status'))
+
+    op.drop_table('profile_picture_uploads')
+    with op.batch_alter_table('media_deletions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_media_deletions_next_attempt_at'))
+
+    op.drop_table('media_deletions')
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""media objects
+
+Adds media_objects (content-addressed, reference-counted profile picture
+variants) and users.profile_picture_media_id. Pictures stored before this
+have no media object and keep being deleted per user.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 19:42:41.974874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_objects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('variants', sa.JSON(), nullable=False),
+    sa.Column('refcount', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('digest')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile_picture_media_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_profile_picture_media_id'), ['profile_picture_media_id'], unique=False)
+        batch_op.create_foreign_key('fk_users_profile_picture_media_id_media_objects', 'media_objects', ['profile_picture_media_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_users_profile_picture_media_id_media_objects', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_users_profile_picture_media_id'))
+        batch_op.drop_column('profile_picture_media_id')
+
+    op.drop_table('media_objects')
\ No newline at end of file
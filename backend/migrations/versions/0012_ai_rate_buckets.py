@@ -0,0 +1,33 @@
+"""ai rate buckets
+
+Adds ai_rate_buckets (per-user AI call token buckets shared by all processes).
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 21:08:13.502116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_rate_buckets',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plan', sa.String(length=20), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_ai_rate_buckets_user_id_users'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('ai_rate_buckets')
\ No newline at end of file
@@ -4,5 +4,8 @@ import os
 app = create_app()
 
 if __name__ == '__main__':
+    from app.utils.recommendation_queue import recommendation_queue
+    recommendation_queue.ensure_started()  # pick up jobs left queued by the last run
+
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -0,0 +1,50 @@
+# tests/conftest.py
+import pytest
+from flask_migrate import upgrade
+from app import create_app, db
+from app.utils.auth_cache import auth_cache
+from app.utils.recommendation_cache import recommendation_cache
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on a fresh, migrated SQLite database, with the stub AI backend and inline workers."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    monkeypatch.setenv("RECOMMENDATION_WORKERS", "0")
+    monkeypatch.setenv("MEDIA_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+    monkeypatch.setenv("IMAGE_PROCESSING_WORKERS", "0")
+    monkeypatch.setenv("MEDIA_STORAGE", "local")
+    monkeypatch.setenv("MEDIA_LOCAL_ROOT", str(tmp_path / 'media'))
+    monkeypatch.setenv("COMPRESS_ENABLED", "false")
+
+    app = create_app()
+    with app.app_context():
+        upgrade()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    # Process-wide caches outlive the app; IDs restart with every database
+    for cache in (auth_cache.tokens, recommendation_cache):
+        cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Register a user through the API and return (user_id, auth headers)."""
+    def register(email='user@example.com', password='secret-password', full_name='Test User'):
+        response = client.post('/api/auth/register', json={
+            'email': email, 'password': password, 'full_name': full_name
+        })
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        return body['user']['id'], {'Authorization': f"Bearer {body['token']}"}
+    return register
\ No newline at end of file
@@ -0,0 +1,68 @@
+# tests/test_ai_rate_limit.py
+from app import db
+from app.models.ai_rate_bucket import AIRateBucket
+from app.models.user import User
+from app.utils.ai_rate_limit import AIRateLimiter, PLAN_PRIORITIES, LOWEST_PRIORITY, plan_priority
+from app.utils.recommendation_queue import recommendation_queue
+
+
+def limiter(app):
+    """A limiter as another server process would set it up."""
+    other = AIRateLimiter()
+    other.init_app(app)
+    return other
+
+
+def test_budget_is_shared_by_all_processes(app, register):
+    app.config.update(AI_RATE_LIMIT_FREE=0.001, AI_RATE_BURST_FREE=4)
+    processes = [limiter(app), limiter(app)]
+    user_id, _ = register()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        granted = [processes[i % 2].try_acquire(user) for i in range(8)]
+        assert granted == [True] * 4 + [False] * 4
+        assert processes[0].stats()['plans']['free']['users'] == 1
+
+
+def test_tokens_refill_over_time(app, register):
+    app.config.update(AI_RATE_LIMIT_FREE=60, AI_RATE_BURST_FREE=1)
+    process = limiter(app)
+    user_id, _ = register()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert process.try_acquire(user)
+        assert not process.try_acquire(user)
+        AIRateBucket.query.filter_by(user_id=user_id).update({'updated_at': AIRateBucket.updated_at - 2})
+        db.session.commit()
+        assert process.try_acquire(user)
+
+
+def test_plan_change_starts_a_full_bucket(app, register):
+    app.config.update(AI_RATE_LIMIT_FREE=0.001, AI_RATE_BURST_FREE=1, AI_RATE_LIMIT_PAID=0.001, AI_RATE_BURST_PAID=2)
+    process = limiter(app)
+    user_id, _ = register()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert process.try_acquire(user)
+        assert not process.try_acquire(user)
+        user.subscription_plan = 'paid'
+        db.session.commit()
+        assert process.try_acquire(user)
+        assert process.try_acquire(user)
+        assert not process.try_acquire(user)
+
+
+def test_unknown_plans_rank_after_every_plan(app):
+    assert LOWEST_PRIORITY > max(PLAN_PRIORITIES.values())
+    assert plan_priority('enterprise-trial') == LOWEST_PRIORITY
+    assert plan_priority('free') < LOWEST_PRIORITY
+    with app.app_context():
+        assert recommendation_queue.stats()['queue_size_by_plan']['other'] == 0
+
+def test_stats_without_the_buckets_table(app):
+    with app.app_context():
+        db.session.execute(db.text('DROP TABLE ai_rate_buckets'))
+        db.session.commit()
+        plans = limiter(app).stats()['plans']
+        assert plans['free']['users'] is None
+        assert plans['free']['granted'] == 0
\ No newline at end of file
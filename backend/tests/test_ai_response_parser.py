@@ -0,0 +1,51 @@
+# tests/test_ai_response_parser.py
+import random
+import pytest
+from app.utils.ai_response_parser import parse_ai_response, parse_batch_response, DEFAULT_RECOMMENDATIONS
+from app.utils.streaming import SectionSplitter
+from benchmarks.ai_response_corpus import CORPUS, fuzz_corpus, random_chunks
+from benchmarks.legacy_ai_parser import parse_ai_response_to_markdown as legacy_parse
+
+
+@pytest.mark.parametrize('name', CORPUS)
+def test_corpus_matches_legacy_parser(name):
+    assert parse_ai_response(CORPUS[name]) == legacy_parse(CORPUS[name])
+
+
+def test_malformed_responses_match_legacy_parser():
+    for text in fuzz_corpus(2000):
+        assert parse_ai_response(text) == legacy_parse(text), repr(text)
+
+
+def test_batch_response_is_split_per_log():
+    content = "=== LOG 1 ===\n" + CORPUS['well_formed'] + "\n\n=== LOG 3 ===\n## Diet\n- Eat oats\n"
+    first, second, third = parse_batch_response(content, 3)
+
+    assert first == (parse_ai_response(CORPUS['well_formed']), [])
+    assert second is None
+    sections, missing = third
+    assert sections['diet'] == '- Eat oats'
+    assert missing == ['exercise', 'wellness']
+    assert sections['exercise'] == DEFAULT_RECOMMENDATIONS['exercise']
+
+
+def splitter_events(chunks):
+    splitter = SectionSplitter()
+    events = [event for chunk in chunks for event in splitter.feed(chunk)] + splitter.close()
+    sections, text = [], {}
+    for event in events:
+        if event[0] == 'section':
+            sections.append(event[1])
+        else:
+            text[event[1]] = text.get(event[1], '') + event[2]
+    return sections, text
+
+
+@pytest.mark.parametrize('name', ['well_formed', 'preamble_and_closing', 'numbered_lists', 'asterisk_bullets_crlf'])
+def test_section_splitter_is_independent_of_chunking(name):
+    rng = random.Random(1)
+    text = CORPUS[name]
+    expected = splitter_events([text])
+    assert expected[0] == ['diet', 'exercise', 'wellness']
+    for _ in range(20):
+        assert splitter_events(random_chunks(text, rng)) == expected
\ No newline at end of file
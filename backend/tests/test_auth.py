@@ -0,0 +1,45 @@
+# tests/test_auth.py
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+from app import db
+
+
+def run_sql(app, statement, **params):
+    """Change the database behind the ORM's back, as another server process would."""
+    with app.app_context():
+        db.session.execute(text(statement), params)
+        db.session.commit()
+
+
+def test_deleted_user_is_rejected_at_once(app, client, register):
+    user_id, headers = register()
+    assert client.get('/api/profile/', headers=headers).status_code == 200
+
+    run_sql(app, "DELETE FROM users WHERE id = :id", id=user_id)
+
+    assert client.get('/api/profile/', headers=headers).status_code == 401
+
+
+def test_password_changed_elsewhere_is_seen_at_once(app, client, register):
+    user_id, headers = register(password='old-password')
+    assert client.get('/api/profile/', headers=headers).status_code == 200
+
+    run_sql(app, "UPDATE users SET password_hash = :hash WHERE id = :id",
+            hash=generate_password_hash('new-password', method='pbkdf2:sha256:1000'), id=user_id)
+
+    response = client.put('/api/profile/change-password', headers=headers,
+                          json={'current_password': 'old-password', 'new_password': 'another-password'})
+    assert response.status_code == 400
+
+    response = client.put('/api/profile/change-password', headers=headers,
+                          json={'current_password': 'new-password', 'new_password': 'another-password'})
+    assert response.status_code == 200
+
+
+def test_profile_changed_elsewhere_is_seen_at_once(app, client, register):
+    user_id, headers = register()
+    assert client.get('/api/profile/', headers=headers).get_json()['user']['subscription_plan'] == 'free'
+
+    run_sql(app, "UPDATE users SET subscription_plan = 'paid' WHERE id = :id", id=user_id)
+
+    assert client.get('/api/profile/', headers=headers).get_json()['user']['subscription_plan'] == 'paid'
\ No newline at end of file
@@ -0,0 +1,107 @@
+# tests/test_media_pipeline.py
+import base64
+import io
+from PIL import Image
+from app import db
+from app.models.media_object import MediaObject
+from app.models.user import User
+from app.utils.media_pipeline import media_pipeline
+from app.utils.media_storage import get_media_storage
+
+
+def png_base64(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def upload(client, headers, image):
+    response = client.post('/api/profile/upload-picture', json={'image': image}, headers=headers)
+    assert response.status_code == 202, response.get_json()
+    return response.get_json()['upload']
+
+
+def stored_keys(app):
+    with app.app_context():
+        return {key for key, _ in get_media_storage().list('')}
+
+
+def test_shared_picture_is_kept_until_its_last_user_leaves(app, client, register):
+    image = png_base64()
+    _, alice = register('alice@example.com')
+    _, bob = register('bob@example.com')
+    upload(client, alice, image)
+    upload(client, bob, image)
+    with app.app_context():
+        media = MediaObject.query.one()
+        assert media.refcount == 2
+        keys = set(media.public_ids())
+    assert keys <= stored_keys(app)
+
+    assert client.delete('/api/profile/delete-picture', headers=alice).status_code == 200
+    assert keys <= stored_keys(app)
+    assert client.delete('/api/profile/delete-picture', headers=bob).status_code == 200
+    assert not keys & stored_keys(app)
+    with app.app_context():
+        assert MediaObject.query.count() == 0
+
+
+def test_picture_removed_between_lookup_and_reference_is_stored_again(app, client, register, monkeypatch):
+    image = png_base64()
+    alice_id, alice = register('alice@example.com')
+    bob_id, _ = register('bob@example.com')
+    upload(client, alice, image)
+    with app.app_context():
+        old_keys = set(MediaObject.query.one().public_ids())
+
+    # Alice leaves the picture while Bob's upload has just looked it up: its deletion runs first
+    add_reference = media_pipeline._add_reference
+    def add_reference_after_deletion(media_id):
+        monkeypatch.setattr(media_pipeline, '_add_reference', add_reference)
+        media_pipeline.clear_profile_picture(db.session.get(User, alice_id))
+        db.session.commit()
+        media_pipeline.process_deletions()
+        return add_reference(media_id)
+    monkeypatch.setattr(media_pipeline, '_add_reference', add_reference_after_deletion)
+
+    with app.app_context():
+        bob = db.session.get(User, bob_id)
+        result = media_pipeline.submit_upload(bob, base64.b64decode(image))
+        assert result.status == 'completed'
+        media = MediaObject.query.one()
+        assert media.refcount == 1
+        new_keys = set(media.public_ids())
+        assert bob.profile_picture_media_id == media.id
+
+    assert not new_keys & old_keys
+    assert new_keys <= stored_keys(app)
+    assert not old_keys & stored_keys(app)
+
+
+def test_pending_deletion_does_not_remove_a_picture_used_again(app, client, register):
+    image = png_base64()
+    alice_id, alice = register('alice@example.com')
+    _, bob = register('bob@example.com')
+    upload(client, alice, image)
+    with app.app_context():
+        keys = set(MediaObject.query.one().public_ids())
+        # Alice leaves the picture, but its deletion has not run yet when Bob uploads it
+        media_pipeline.clear_profile_picture(db.session.get(User, alice_id))
+        db.session.commit()
+
+    upload(client, bob, image)  # processes the pending deletions afterwards
+    with app.app_context():
+        assert MediaObject.query.one().refcount == 1
+    assert keys <= stored_keys(app)
+
+
+def test_clearing_a_picture_whose_object_is_gone(app, client, register):
+    alice_id, alice = register('alice@example.com')
+    upload(client, alice, png_base64())
+    with app.app_context():
+        MediaObject.query.delete()
+        db.session.commit()
+        user = db.session.get(User, alice_id)
+        media_pipeline.clear_profile_picture(user)
+        db.session.commit()
+        assert user.profile_picture_media_id is None
\ No newline at end of file
@@ -0,0 +1,41 @@
+# tests/test_process_pool.py
+import time
+import pytest
+from app.utils.password_hashing import password_hasher
+from app.utils.process_pool import BoundedProcessPool, PoolBusyError, PoolTimeoutError, latency_stats
+
+
+def test_slow_task_raises_pool_timeout():
+    pool = BoundedProcessPool('test', max_workers=1, max_queue=1)
+    try:
+        with pytest.raises(PoolTimeoutError):
+            pool.run(time.sleep, 2, timeout=0.1)
+        assert pool.stats()['timed_out'] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_is_a_busy_error():
+    assert issubclass(PoolTimeoutError, PoolBusyError)
+
+
+def test_latency_stats():
+    assert latency_stats([]) == {'avg_ms': None, 'p95_ms': None, 'max_ms': None}
+    assert latency_stats(range(1, 101)) == {'avg_ms': 50.5, 'p95_ms': 96, 'max_ms': 100}
+
+
+@pytest.mark.parametrize('path, payload', [
+    ('/api/auth/login', {'email': 'user@example.com', 'password': 'secret-password'}),
+    ('/api/profile/change-password', {'current_password': 'secret-password', 'new_password': 'new-password'}),
+])
+def test_hashing_timeout_returns_503(client, register, monkeypatch, path, payload):
+    _, headers = register()
+
+    def timed_out(fn, *args, timeout=None):
+        raise PoolTimeoutError("password-hashing pool did not finish the task in time")
+    monkeypatch.setattr(password_hasher.pool, 'run', timed_out)
+
+    method = client.put if path.endswith('change-password') else client.post
+    response = method(path, headers=headers, json=payload)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
\ No newline at end of file
@@ -0,0 +1,36 @@
+# tests/test_recommendation_queue.py
+import queue
+from datetime import date, datetime, timedelta
+from app import db
+from app.models.recommendation_job import RecommendationJob
+from app.models.symptom_log import SymptomLog
+from app.utils.recommendation_queue import recommendation_queue
+
+
+def add_jobs(user_id, statuses, batch_id=None):
+    """Add one log and job per status, returning the job IDs."""
+    logs = [SymptomLog(user_id=user_id, date=date(2024, 1, 1) + timedelta(days=i)) for i in range(len(statuses))]
+    db.session.add_all(logs)
+    db.session.flush()
+    jobs = [
+        RecommendationJob(log_id=log.id, user_id=user_id, batch_id=batch_id, status=status,
+                          started_at=datetime.utcnow() if status == 'running' else None)
+        for log, status in zip(logs, statuses)
+    ]
+    db.session.add_all(jobs)
+    db.session.commit()
+    return [job.id for job in jobs]
+
+
+def test_sweep_leaves_batches_being_run_to_their_worker(app, register, monkeypatch):
+    user_id, _ = register()
+    monkeypatch.setattr(recommendation_queue, '_queue', queue.PriorityQueue(maxsize=10))
+    with app.app_context():
+        add_jobs(user_id, ['completed', 'running', 'queued', 'queued'], batch_id='busy')
+        waiting = add_jobs(user_id, ['queued', 'queued'], batch_id='waiting')
+        single = add_jobs(user_id, ['queued'])
+
+    recommendation_queue._sweep()
+
+    swept = sorted(job_id for _, _, job_id in recommendation_queue._queue.queue)
+    assert swept == [waiting[0], single[0]]
\ No newline at end of file
@@ -0,0 +1,46 @@
+# tests/test_recommendation_stream.py
+from datetime import date
+import pytest
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.recommendation_job import RecommendationJob
+from app.models.symptom_log import SymptomLog
+from app.utils.recommendation_queue import recommendation_queue
+
+
+@pytest.fixture
+def queued_log(app, register):
+    """(log_id, job_id, auth headers) of a log whose recommendation job is still queued."""
+    user_id, headers = register()
+    with app.app_context():
+        log = SymptomLog(user_id=user_id, date=date(2024, 1, 1), condition='PCOS', symptoms='cramps', pain_level=4)
+        db.session.add(log)
+        db.session.flush()
+        job = RecommendationJob(log_id=log.id, user_id=user_id, status='queued')
+        db.session.add(job)
+        db.session.commit()
+        return log.id, job.id, headers
+
+
+def test_stream_completes_the_claimed_job(app, client, queued_log):
+    log_id, job_id, headers = queued_log
+    body = client.get(f'/api/recommendations/{log_id}/stream', headers=headers).get_data(as_text=True)
+    assert 'event: done' in body
+    with app.app_context():
+        assert db.session.get(RecommendationJob, job_id).status == 'completed'
+
+
+def test_disconnect_before_saving_requeues_the_job(app, client, queued_log, monkeypatch):
+    log_id, job_id, headers = queued_log
+    enqueued = []
+    monkeypatch.setattr(recommendation_queue, 'enqueue', lambda job_id, priority: enqueued.append(job_id))
+
+    response = client.get(f'/api/recommendations/{log_id}/stream', headers=headers, buffered=False)
+    next(iter(response.response))  # the first event, then the client goes away
+    response.close()
+
+    with app.app_context():
+        job = db.session.get(RecommendationJob, job_id)
+        assert (job.status, job.attempts, job.started_at) == ('queued', 0, None)
+        assert AIRecommendation.query.filter_by(log_id=log_id).count() == 0
+    assert enqueued == [job_id]
\ No newline at end of file
@@ -0,0 +1,55 @@
+# tests/test_symptom_log_fields.py
+from datetime import date, datetime
+import pytest
+from flask import g
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.symptom_log import SymptomLog
+from app.models.user import User
+from app.routes.symptoms import user_data_etag
+
+
+@pytest.fixture
+def headers(app, register):
+    """A user with one symptom log that has a recommendation."""
+    user_id, headers = register()
+    with app.app_context():
+        log = SymptomLog(user_id=user_id, date=date(2024, 1, 1), condition='PCOS', pain_level=3)
+        db.session.add(log)
+        db.session.flush()
+        db.session.add(AIRecommendation(log_id=log.id, diet='- diet', exercise='- walk', wellness='- rest',
+                                        source='cache', generated_at=datetime.utcnow()))
+        db.session.commit()
+    return headers
+
+
+def list_recommendation(client, headers, fields):
+    response = client.get('/api/symptoms/', headers=headers, query_string={'fields': fields})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['logs'][0]['recommendation']
+
+
+def test_exclusion_keeps_source(client, headers):
+    recommendation = list_recommendation(client, headers, '-recommendation.markdown')
+    assert 'markdown' not in recommendation
+    assert recommendation['source'] == 'cache'
+
+
+def test_source_can_be_selected(client, headers):
+    assert list_recommendation(client, headers, 'id,recommendation.source') == {'source': 'cache'}
+
+
+def test_unknown_recommendation_field_is_rejected(client, headers):
+    response = client.get('/api/symptoms/', headers=headers, query_string={'fields': 'recommendation.model'})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('params', [
+    {'start_date': '2024-13-01'}, {'end_date': 'yesterday'}, {'cursor': 'not-a-cursor'}, {'fields': 'password'}
+])
+def test_invalid_parameters_are_rejected_even_when_not_modified(app, client, headers, params):
+    # The ETag a client would hold for this query string (it covers the parameters)
+    with app.test_request_context(query_string=params):
+        g.current_user = User.query.one()
+        etag = user_data_etag('symptom_logs')
+    response = client.get('/api/symptoms/', headers=dict(headers, **{'If-None-Match': etag}), query_string=params)
+    assert response.status_code == 400
\ No newline at end of file
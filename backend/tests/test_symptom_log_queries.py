@@ -0,0 +1,69 @@
+# tests/test_symptom_log_queries.py
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models.ai_recommendation import AIRecommendation
+from app.models.symptom_log import SymptomLog
+
+PAGE_SIZES = (1, 10, 50)
+
+
+@contextmanager
+def count_statements(app):
+    """Count the SQL statements executed on the app's engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def user_with_logs(app, register):
+    """A user with 60 symptom logs, every other one with a recommendation."""
+    user_id, headers = register()
+    with app.app_context():
+        logs = [
+            SymptomLog(user_id=user_id, date=date(2024, 1, 1) + timedelta(days=i),
+                       condition='PCOS', symptoms='cramps; fatigue', pain_level=i % 10)
+            for i in range(60)
+        ]
+        db.session.add_all(logs)
+        db.session.flush()
+        db.session.add_all([
+            AIRecommendation(log_id=log.id, diet='- diet', exercise='- walk', wellness='- rest',
+                             source='ai', generated_at=datetime.utcnow())
+            for log in logs[::2]
+        ])
+        db.session.commit()
+    return headers
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'cursor': ''},
+    {'fields': '-recommendation'},
+], ids=['offset', 'cursor', 'without-recommendation'])
+def test_list_query_count_does_not_grow_with_page_size(app, client, user_with_logs, params):
+    # Warm up, so per-process caches (e.g. the auth cache) are in the same state for every size
+    assert client.get('/api/symptoms/', headers=user_with_logs).status_code == 200
+
+    counts = {}
+    for limit in PAGE_SIZES:
+        with count_statements(app) as statements:
+            response = client.get('/api/symptoms/', headers=user_with_logs,
+                                  query_string=dict(params, limit=limit))
+        assert response.status_code == 200
+        assert len(response.get_json()['logs']) == limit
+        counts[limit] = len(statements)
+
+    assert len(set(counts.values())) == 1, counts
\ No newline at end of file
@@ -0,0 +1,9 @@
+# wsgi.py
+"""
+WSGI entry point for production servers (`gunicorn -c gunicorn.conf.py wsgi:app`).
+
+`run.py` starts Flask's single-process development server and is meant for local use only.
+"""
+from app import create_app
+
+app = create_app()
\ No newline at end of file